@@ -1,12 +1,18 @@
+import os
+
 from flask import Flask, request, redirect
 from werkzeug.middleware.proxy_fix import ProxyFix
 from .config import Config
-from .extensions import db, migrate
+from .dbpool import init_engine_profile
+from .replica import remember_writes
+from .extensions import db, init_migrate
 from .public.routes import public_bp
 from .admin.routes import admin_bp
+from .api.routes import api_bp
+from .commands import register_commands
 from dotenv import load_dotenv
 load_dotenv()  # ✅ încarcă .env înainte să importăm Config
-from .extensions import db, migrate
+from .extensions import db, init_migrate
 from .public.routes import public_bp
 from .admin.routes import admin_bp
 
@@ -19,10 +25,19 @@ def create_app():
     app.wsgi_app = ProxyFix(app.wsgi_app, x_proto=1, x_host=1)
 
     db.init_app(app)
-    migrate.init_app(app, db)
+    with app.app_context():
+        init_engine_profile(app, db.engines.values())
+    # read-your-writes pentru citirile din replică (app/replica.py)
+    app.after_request(remember_writes)
+    # `flask ...` setează FLASK_RUN_FROM_CLI; gunicorn nu are nevoie de migrări
+    if os.environ.get("FLASK_RUN_FROM_CLI") == "true":
+        init_migrate(app)
 
     app.register_blueprint(public_bp)
     app.register_blueprint(admin_bp, url_prefix="/control-9f3a7")
+    app.register_blueprint(api_bp, url_prefix="/api/v1")
+
+    register_commands(app)
 
     return app
 
@@ -49,7 +64,7 @@ def create_app():
 
     # extensions
     db.init_app(app)
-    migrate.init_app(app, db)
+    init_migrate(app)
 
     # blueprints
     app.register_blueprint(public_bp)
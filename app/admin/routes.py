@@ -1,12 +1,22 @@
 from functools import wraps
 from flask import Blueprint, render_template, request, redirect, url_for, session, flash
-import cloudinary
-import cloudinary.uploader
-from sqlalchemy import func
+from sqlalchemy import or_
 import os
+import re
+from .. import moderation, stats
 from ..extensions import db
+from ..cache import nav_cache
+from ..cities import city_resolver
+from ..dbpool import pool_stats
+from ..dedup import check_submission
+from ..page_cache import page_cache
+from ..images import image_pipeline, mark_pending, spool_upload
+from ..loading import admin_rows, with_profile
+from ..pagination import ADMIN_ORDER, keyset_paginate
+from ..search import get_backend
+from ..slugs import add_with_unique_slug
 from ..models import Category, City, Listing, Submission
-from ..utils import slugify, languages_to_str, languages_from_str
+from ..utils import phone_key, languages_to_str, languages_from_str
 
 admin_bp = Blueprint("admin", __name__)
 basedir = os.path.abspath(os.path.dirname(__file__))
@@ -22,24 +32,6 @@ def admin_required(fn):
     return wrapper
 
 
-# --------------------
-# CLOUDINARY SETUP
-# --------------------
-@admin_bp.before_app_request
-def setup_cloudinary():
-    from flask import current_app
-    cfg = current_app.config
-    if cfg.get("CLOUDINARY_URL"):
-        cloudinary.config(cloudinary_url=cfg["CLOUDINARY_URL"])
-    elif cfg.get("CLOUDINARY_CLOUD_NAME") and cfg.get("CLOUDINARY_API_KEY") and cfg.get("CLOUDINARY_API_SECRET"):
-        cloudinary.config(
-            cloud_name=cfg["CLOUDINARY_CLOUD_NAME"],
-            api_key=cfg["CLOUDINARY_API_KEY"],
-            api_secret=cfg["CLOUDINARY_API_SECRET"],
-            secure=True
-        )
-
-
 # --------------------
 # LOGIN / LOGOUT
 # --------------------
@@ -76,83 +68,129 @@ def logout():
 @admin_bp.get("/")
 @admin_required
 def dashboard():
-    pending = Submission.query.filter_by(status="PENDING").count()
-    listings = Listing.query.count()
-    featured = Listing.query.filter_by(featured=True).count()
+    # contoare din stat_counter (app/stats.py), nu COUNT(*) la fiecare încărcare
+    counts = stats.counts()
+    all_categories, all_cities = nav_cache.get()
+    category_names = {c.id: c.name for c in all_categories}
+    city_names = {c.id: c.name for c in all_cities}
+    by_category = sorted(
+        ((category_names.get(cid, f"#{cid}"), n) for cid, n in stats.breakdown(counts, "category:").items()),
+        key=lambda row: -row[1],
+    )
+    by_city = [(city_names.get(cid, f"#{cid}"), n) for cid, n in stats.top_cities()]
     return render_template(
         "admin/dashboard.html",
-        pending=pending,
-        listings=listings,
-        featured=featured
+        pending=counts[stats.submission_key("PENDING")],
+        listings=counts[stats.LISTINGS],
+        featured=counts[stats.FEATURED],
+        verified=counts[stats.VERIFIED],
+        by_category=by_category,
+        by_city=by_city,
+        nav_cache_stats=nav_cache.stats(),
+        page_cache_stats=page_cache.stats(),
+        pool_stats=pool_stats.stats(db.engine)
     )
 
 
 # --------------------
 # LISTINGS
 # --------------------
+_PHONE_QUERY = re.compile(r"^\+?[\d\s/().-]+$")
+
+
+def _phone_filter(q: str):
+    """
+    Căutare după telefon pe phone_key / whatsapp_key (indexate): prefix ca
+    interval [key, key + ":") – ":" vine imediat după "9", deci indexul B-tree
+    e folosit și pe SQLite și pe Postgres. "030…" caută și "4930…" (și invers).
+    """
+    key = phone_key(q)
+    if not key:
+        return None
+    keys = {key}
+    if key.startswith("0"):
+        keys.add("49" + key[1:])
+    elif key.startswith("49"):
+        keys.add("0" + key[2:])
+    return or_(*[
+        (col >= k) & (col < k + ":")
+        for k in keys
+        for col in (Listing.phone_key, Listing.whatsapp_key)
+    ])
+
+
 @admin_bp.get("/listings")
 @admin_required
 def listings():
     q = request.args.get("q", "").strip()
-    query = Listing.query
+    category_slug = request.args.get("category", "").strip()
+    city_slug = request.args.get("city", "").strip()
+
+    query = admin_rows()
+
+    # categoria / orașul din cache-ul de meniuri (fără SELECT în plus); filtrul
+    # pe id + ordinea (updated_at, id) folosesc ix_listing_{category,city}_updated
+    all_categories, all_cities = nav_cache.get()
+    category = next((c for c in all_categories if c.slug == category_slug), None)
+    city = next((c for c in all_cities if c.slug == city_slug), None)
+    if category:
+        query = query.filter(Listing.category_id == category.id)
+    if city:
+        query = query.filter(Listing.city_id == city.id)
+
     if q:
-        query = query.filter(Listing.name.ilike(f"%{q}%"))
-    items = query.order_by(Listing.updated_at.desc()).all()
+        phone = _phone_filter(q) if _PHONE_QUERY.match(q) else None
+        if phone is not None:
+            query = query.filter(phone)
+        else:
+            # textul prin indexul full-text (nume, descriere, categorie, oraș), nu ilike '%q%'
+            matches, _ = get_backend().apply(db.session.query(Listing.id), q)
+            query = query.filter(Listing.id.in_(matches.subquery().select()))
+
+    page = keyset_paginate(
+        query,
+        columns=ADMIN_ORDER,
+        after=request.args.get("after", ""),
+        before=request.args.get("before", ""),
+    )
     return render_template(
         "admin/listings.html",
-        items=items,
+        items=page.items,
+        page=page,
         q=q,
-        languages_from_str=languages_from_str
+        category_slug=category_slug,
+        city_slug=city_slug,
     )
 
 
 # --------------------
 # HELPERS
 # --------------------
-def _upload_image_to_cloudinary(file_storage):
-    if not file_storage or not file_storage.filename:
+def _queue_image_upload(listing_id: int, token: str | None, path: str | None):
+    """Apelat DUPĂ commit: upload-ul rulează în fundal și completează image_url."""
+    if path and token:
+        image_pipeline.submit(listing_id, token, path)
+
+
+def _phone_owner(item: Listing) -> Listing | None:
+    """Altă listare care are deja telefonul / WhatsApp-ul lui item (chei UNIQUE)."""
+    conditions = [col == getattr(item, col.key) for col in (Listing.phone_key, Listing.whatsapp_key) if getattr(item, col.key)]
+    if not conditions:
         return None
-    result = cloudinary.uploader.upload(
-        file_storage,
-        folder="romani-servicii-de",
-        resource_type="image",
-        transformation=[
-            {"width": 600, "height": 600, "crop": "limit"},
-            {"quality": "auto", "fetch_format": "auto"},
-        ]
-    )
-    return result.get("secure_url")
+    with db.session.no_autoflush:
+        query = Listing.query.filter(or_(*conditions))
+        if item.id is not None:
+            query = query.filter(Listing.id != item.id)
+        return query.first()
 
 
 def get_or_create_city(city_input: str) -> City:
-    city_input = (city_input or "").strip()
-    if not city_input:
-        raise ValueError("City is required")
-
-    # scoatem PLZ-ul dacă există (ex: "31655 Stadthagen")
-    parts = city_input.split()
-    if parts and parts[0].isdigit():
-        city_name = " ".join(parts[1:]).strip()
-    else:
-        city_name = city_input
-
-    if not city_name:
-        raise ValueError("City is required")
-
-    existing = City.query.filter(func.lower(City.name) == city_name.lower()).first()
-    if existing:
-        return existing
-
-    new_city = City(
-        name=city_name,
-        slug=slugify(city_name),
-        state=None,
-        lat=None,
-        lng=None
-    )
-    db.session.add(new_city)
-    db.session.flush()  # obținem ID fără commit
-    return new_city
+    # "31655 Stadthagen", "Berlin.", "Muenchen" -> orașul existent (cheie normalizată + alias-uri);
+    # orașele noi primesc coordonate din gazetteer-ul local (PLZ are prioritate)
+    city_id, created = city_resolver.get_or_create(city_input)
+    if created:
+        nav_cache.invalidate_on_commit(db.session)
+    return db.session.get(City, city_id)
 
 
 # --------------------
@@ -189,18 +227,8 @@ def listings_new():
         verified = request.form.get("verified") == "on"
         featured = request.form.get("featured") == "on"
 
-        base_slug = slugify(name)
-        slug = base_slug
-        i = 2
-        while Listing.query.filter_by(slug=slug).first():
-            slug = f"{base_slug}-{i}"
-            i += 1
-
-        image_url = _upload_image_to_cloudinary(request.files.get("image"))
-
         item = Listing(
             name=name,
-            slug=slug,
             description=description,
             category_id=category_id,
             city_id=city.id,
@@ -210,11 +238,23 @@ def listings_new():
             address=address,
             languages=languages_to_str(langs),
             verified=verified,
-            featured=featured,
-            image_url=image_url
+            featured=featured
         )
-        db.session.add(item)
+        owner = _phone_owner(item)
+        if owner:
+            flash(f"Telefonul există deja la „{owner.name}”.", "error")
+            return render_template(
+                "admin/listing_form.html",
+                categories=categories,
+                item=None,
+                languages_from_str=languages_from_str
+            )
+
+        image_path = spool_upload(request.files.get("image"))
+        token = mark_pending(item, image_path) if image_path else None
+        add_with_unique_slug(item, name)
         db.session.commit()
+        _queue_image_upload(item.id, token, image_path)
         flash("Listing created.", "success")
         return redirect(url_for("admin.listings"))
 
@@ -232,7 +272,7 @@ def listings_new():
 @admin_bp.route("/listings/<int:listing_id>/edit", methods=["GET", "POST"])
 @admin_required
 def listings_edit(listing_id: int):
-    item = Listing.query.get_or_404(listing_id)
+    item = with_profile(Listing.query, "detail").filter_by(id=listing_id).first_or_404()
     categories = Category.query.order_by(Category.name.asc()).all()
 
     if request.method == "POST":
@@ -261,11 +301,21 @@ def listings_edit(listing_id: int):
         item.verified = request.form.get("verified") == "on"
         item.featured = request.form.get("featured") == "on"
 
-        new_image = request.files.get("image")
-        if new_image and new_image.filename:
-            item.image_url = _upload_image_to_cloudinary(new_image)
+        owner = _phone_owner(item)
+        if owner:
+            flash(f"Telefonul există deja la „{owner.name}”.", "error")
+            return render_template(
+                "admin/listing_form.html",
+                categories=categories,
+                item=item,
+                languages_from_str=languages_from_str
+            )
+
+        image_path = spool_upload(request.files.get("image"))
+        token = mark_pending(item, image_path) if image_path else None
 
         db.session.commit()
+        _queue_image_upload(listing_id, token, image_path)
         flash("Listing updated.", "success")
         return redirect(url_for("admin.listings"))
 
@@ -293,11 +343,60 @@ def listings_delete(listing_id: int):
 # --------------------
 # SUBMISSIONS
 # --------------------
+BULK_OUTCOMES_KEY = "bulk_outcomes"
+BULK_OUTCOMES_MAX = 100
+
+
+def _submissions_page(outcomes=None):
+    # paginat (keyset pe id, cele mai noi primele): verificarea de duplicate
+    # rulează doar pentru submission-urile PENDING de pe pagina afișată
+    page = keyset_paginate(
+        Submission.query,
+        columns=(Submission.id,),
+        after=request.args.get("after", ""),
+        before=request.args.get("before", ""),
+    )
+    duplicates = {s.id: check_submission(s) for s in page.items if s.status == "PENDING"}
+    return render_template(
+        "admin/submissions.html",
+        items=page.items,
+        page=page,
+        duplicates=duplicates,
+        outcomes=outcomes or {},
+    )
+
+
 @admin_bp.get("/submissions")
 @admin_required
 def submissions():
-    items = Submission.query.order_by(Submission.created_at.desc()).all()
-    return render_template("admin/submissions.html", items=items)
+    outcomes = session.pop(BULK_OUTCOMES_KEY, None) or []
+    return _submissions_page({row[0]: moderation.Outcome(*row) for row in outcomes})
+
+
+@admin_bp.post("/submissions/bulk")
+@admin_required
+def submissions_bulk():
+    action = request.form.get("action", "")
+    ids = [i for i in request.form.getlist("ids") if i.isdigit()]
+    if not ids or action not in (moderation.APPROVE, moderation.REJECT):
+        flash("Selectează cel puțin un submission.", "error")
+        return redirect(url_for("admin.submissions"))
+
+    results, created_cities = moderation.moderate(ids, action)
+    db.session.commit()
+    if created_cities:
+        nav_cache.invalidate()
+
+    done = sum(r.status in ("approved", "rejected") for r in results)
+    flash(f"{done} din {len(results)} procesate.", "success" if done == len(results) else "error")
+    # rezultatele per rând le afișează GET-ul (POST/redirect/GET: refresh-ul nu re-trimite acțiunea);
+    # compacte, ca să încapă în cookie-ul de sesiune (o pagină = cel mult PER_PAGE rânduri)
+    session[BULK_OUTCOMES_KEY] = [
+        [r.sub_id, r.status, (r.message or "")[:120], r.listing_id, r.slug] for r in results[:BULK_OUTCOMES_MAX]
+    ]
+    return redirect(url_for(
+        "admin.submissions", after=request.args.get("after") or None, before=request.args.get("before") or None,
+    ))
 
 
 @admin_bp.post("/submissions/<int:sub_id>/reject")
@@ -322,23 +421,20 @@ def submissions_approve(sub_id: int):
 
     city = get_or_create_city(sub.city_name)
 
-    base_slug = slugify(sub.business_name)
-    slug = base_slug
-    i = 2
-    while Listing.query.filter_by(slug=slug).first():
-        slug = f"{base_slug}-{i}"
-        i += 1
-
     new_listing = Listing(
         name=sub.business_name,
-        slug=slug,
         description=sub.message,
         category_id=category.id,
         city_id=city.id,
         website=sub.website,
         phone=sub.contact
     )
-    db.session.add(new_listing)
+    owner = _phone_owner(new_listing)
+    if owner:
+        db.session.rollback()
+        flash(f"Telefonul există deja la „{owner.name}” – probabil duplicat.", "error")
+        return redirect(url_for("admin.submissions"))
+    add_with_unique_slug(new_listing, sub.business_name)
     db.session.commit()
     flash("Submission approved and listing created.", "success")
     return redirect(url_for("admin.listings_edit", listing_id=new_listing.id))
@@ -0,0 +1,244 @@
+"""
+API JSON v1 (/api/v1) pentru front-end-ul Next.js și alți clienți.
+
+- /listings: aceleași filtre ca home() / category_page() (q, category, city,
+  location + radius, verified, featured), ordinea publică, cursor keyset
+  (`after` / `before`, ca în paginile HTML), `fields=` pentru câmpuri rare
+- /categories, /cities: din nav_cache + contoarele din stat_counter
+- proiecții pe coloane (tupluri, nu obiecte ORM) serializate cu orjson
+  (opțional, altfel json din stdlib); ETag / Last-Modified + 304 ca la HTML
+"""
+import json
+
+from flask import Blueprint, Response, request
+
+from .. import stats
+from ..cache import nav_cache
+from ..extensions import db
+from ..geo import cities_within_radius
+from ..http_cache import cacheable, list_validators, make_etag, not_modified
+from ..models import Category, City, Listing
+from ..pagination import PUBLIC_ORDER, decode_cursor, keyset_paginate
+from ..replica import route_reads
+from ..search import get_backend
+from ..utils import geocode_location, languages_from_str
+
+try:
+    import orjson
+except ImportError:  # fără orjson: stdlib, mai lent dar același răspuns
+    orjson = None
+
+api_bp = Blueprint("api", __name__)
+# doar citiri -> replică, dacă e configurată (app/replica.py)
+api_bp.before_request(route_reads)
+
+RADIUS_ALLOWED = (5, 10, 20, 50)
+DEFAULT_LIMIT = 30
+MAX_LIMIT = 100
+
+# câmp public -> coloană; ordinea de aici e ordinea din răspuns
+LISTING_FIELDS = {
+    "id": Listing.id,
+    "name": Listing.name,
+    "slug": Listing.slug,
+    "description": Listing.description,
+    "category": Category.slug,
+    "category_name": Category.name,
+    "city": City.slug,
+    "city_name": City.name,
+    "address": Listing.address,
+    "phone": Listing.phone,
+    "whatsapp": Listing.whatsapp,
+    "website": Listing.website,
+    "languages": Listing.languages,
+    "verified": Listing.verified,
+    "featured": Listing.featured,
+    "image_url": Listing.image_url,
+    "updated_at": Listing.updated_at,
+}
+# descrierea e lungă: doar la cerere (?fields=...,description)
+DEFAULT_LISTING_FIELDS = tuple(f for f in LISTING_FIELDS if f != "description")
+CATEGORY_FIELDS = ("id", "name", "slug", "listings")
+CITY_FIELDS = ("id", "name", "slug", "state", "lat", "lng", "listings")
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+@api_bp.errorhandler(ApiError)
+def _api_error(e):
+    return _json({"error": e.message}, status=e.status)
+
+
+def _dumps(payload) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+def _default(value):
+    # datetime -> ISO 8601, ca orjson
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    raise TypeError(f"nu pot serializa {type(value).__name__}")
+
+
+def _json(payload, status: int = 200) -> Response:
+    return Response(_dumps(payload), status=status, mimetype="application/json")
+
+
+def _cacheable_json(payload, etag: str, last_modified) -> Response:
+    resp = cacheable(_dumps(payload), etag, last_modified)
+    resp.mimetype = "application/json"
+    return resp
+
+
+def _fields(allowed, default=None) -> tuple:
+    raw = request.args.get("fields", "").strip()
+    if not raw:
+        return tuple(default or allowed)
+    wanted = tuple(dict.fromkeys(f.strip() for f in raw.split(",") if f.strip()))
+    unknown = [f for f in wanted if f not in allowed]
+    if unknown:
+        raise ApiError(400, f"câmpuri necunoscute: {', '.join(unknown)} (disponibile: {', '.join(allowed)})")
+    return wanted
+
+
+def _limit() -> int:
+    raw = request.args.get("limit", "").strip()
+    if not raw:
+        return DEFAULT_LIMIT
+    if not raw.isdigit() or not 1 <= int(raw) <= MAX_LIMIT:
+        raise ApiError(400, f"limit trebuie să fie între 1 și {MAX_LIMIT}")
+    return int(raw)
+
+
+def _cursor(name: str) -> str:
+    # HTML: cursor invalid -> prima pagină; în API un client cu bug primește eroarea
+    token = request.args.get(name, "").strip()
+    if token and decode_cursor(token, PUBLIC_ORDER) is None:
+        raise ApiError(400, f"cursor invalid: {name}")
+    return token
+
+
+def _by_slug(rows, slug: str, message: str):
+    for row in rows:
+        if row.slug == slug:
+            return row
+    raise ApiError(404, f"{message}: {slug}")
+
+
+# --------------------
+# LISTINGS
+# --------------------
+@api_bp.get("/listings")
+def listings():
+    fields = _fields(LISTING_FIELDS, DEFAULT_LISTING_FIELDS)
+    limit = _limit()
+    after, before = _cursor("after"), _cursor("before")
+    all_categories, all_cities = nav_cache.get()
+
+    # coloanele de ordonare intră mereu în SELECT (cursorul), dar în răspuns doar cele cerute
+    order_keys = {c.key for c in PUBLIC_ORDER}
+    columns = [LISTING_FIELDS[f].label(f) for f in fields if f not in order_keys]
+    columns += list(PUBLIC_ORDER)
+    q = (
+        db.session.query(*columns)
+        .select_from(Listing)
+        .join(Category, Listing.category_id == Category.id)
+        .join(City, Listing.city_id == City.id)
+    )
+
+    category_slug = request.args.get("category", "").strip()
+    if category_slug:
+        q = q.filter(Listing.category_id == _by_slug(all_categories, category_slug, "categorie necunoscută").id)
+
+    city = None
+    city_slug = request.args.get("city", "").strip()
+    if city_slug:
+        city = _by_slug(all_cities, city_slug, "oraș necunoscut")
+        q = q.filter(Listing.city_id == city.id)
+
+    q_text = request.args.get("q", "").strip()
+    if q_text:
+        # ca în admin: potrivirile ca subquery pe id, deci filtrul rămâne pe `listing`
+        # (merge și list_validators); ordinea rămâne cea publică – cursorul nu poate conține rangul
+        matches, _ = get_backend().apply(db.session.query(Listing.id), q_text)
+        q = q.filter(Listing.id.in_(matches.subquery().select()))
+
+    radius_km = request.args.get("radius", "").strip()
+    if radius_km:
+        if not radius_km.isdigit() or int(radius_km) not in RADIUS_ALLOWED:
+            raise ApiError(400, f"radius trebuie să fie unul din {RADIUS_ALLOWED}")
+        location = request.args.get("location", "").strip()
+        # ca home(): locație geocodată; ca category_page(): centrul orașului
+        lat, lng = geocode_location(location) if location else (city.lat, city.lng) if city else (None, None)
+        if lat is None or lng is None:
+            raise ApiError(400, "radius cere location= sau city= cu coordonate")
+        q = q.filter(Listing.city_id.in_(cities_within_radius(lat, lng, int(radius_km))))
+
+    if request.args.get("verified", "").strip() == "1":
+        q = q.filter(Listing.verified == True)  # noqa: E712
+    if request.args.get("featured", "").strip() == "1":
+        q = q.filter(Listing.featured == True)  # noqa: E712
+
+    last_modified, count = list_validators(q)
+    etag = make_etag(last_modified, count)  # + path / query string / meniuri
+    cached = not_modified(etag, last_modified)
+    if cached:
+        return cached
+
+    page = keyset_paginate(q, after=after, before=before, per_page=limit)
+    items = []
+    for row in page.items:
+        item = {f: getattr(row, f) for f in fields}
+        if "languages" in item:
+            item["languages"] = languages_from_str(item["languages"])
+        items.append(item)
+
+    return _cacheable_json({
+        "data": items,
+        "total": count,
+        "next_cursor": page.next_cursor,
+        "prev_cursor": page.prev_cursor,
+    }, etag, last_modified)
+
+
+# --------------------
+# CATEGORIES / CITIES (nav_cache + stat_counter, fără SELECT pe listing)
+# --------------------
+def _nav_response(rows, allowed, counts: dict):
+    fields = _fields(allowed)
+    etag = make_etag(sorted(counts.items()))
+    cached = not_modified(etag, None)
+    if cached:
+        return cached
+    data = []
+    for row in rows:
+        values = row._asdict()
+        values["listings"] = counts.get(row.id, 0)
+        data.append({f: values[f] for f in fields})
+    return _cacheable_json({"data": data}, etag, None)
+
+
+@api_bp.get("/categories")
+def categories():
+    all_categories, _ = nav_cache.get()
+    return _nav_response(all_categories, CATEGORY_FIELDS, stats.breakdown(stats.counts(), "category:"))
+
+
+@api_bp.get("/cities")
+def cities():
+    _, all_cities = nav_cache.get()
+    return _nav_response(all_cities, CITY_FIELDS, stats.prefix_counts("city:"))
+
+
+# ruta de 404 în JSON (nu pagina HTML) pentru /api/v1/<orice>
+@api_bp.route("/<path:_unknown>")
+def unknown(_unknown):
+    raise ApiError(404, "endpoint necunoscut")
+
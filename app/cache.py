@@ -0,0 +1,117 @@
+import hashlib
+import threading
+import time
+from collections import namedtuple
+
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from .models import Category, City
+from .replica import primary
+
+# Rânduri simple (nu obiecte ORM) ca să poată fi partajate între request-uri
+# fără DetachedInstanceError după commit / session.remove().
+CategoryRow = namedtuple("CategoryRow", "id name slug")
+CityRow = namedtuple("CityRow", "id name slug state lat lng")
+
+
+class NavCache:
+    """
+    Cache per proces pentru listele de categorii/orașe din meniuri.
+
+    - `invalidate()` crește versiunea -> următorul `get()` reîncarcă din DB
+    - TTL (NAV_CACHE_TTL) limitează cât de vechi pot fi datele în ceilalți
+      workeri gunicorn, care nu văd invalidarea locală
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = 0
+        self._loaded_version = -1
+        self._loaded_at = 0.0
+        self._categories = ()
+        self._cities = ()
+        self._fingerprint = ""
+        self.hits = 0
+        self.misses = 0
+
+    def _fresh(self, ttl: float) -> bool:
+        if self._loaded_version != self._version:
+            return False
+        return ttl <= 0 or (time.monotonic() - self._loaded_at) < ttl
+
+    def get(self):
+        ttl = current_app.config.get("NAV_CACHE_TTL", 60)
+        with self._lock:
+            if self._fresh(ttl):
+                self.hits += 1
+                return self._categories, self._cities
+            self.misses += 1
+            version = self._version
+
+        # din primary: după o invalidare locală nu reîncărcăm dintr-o replică rămasă în urmă
+        with primary():
+            categories = tuple(
+                CategoryRow(*row)
+                for row in Category.query
+                .with_entities(Category.id, Category.name, Category.slug)
+                .order_by(Category.name.asc())
+            )
+            cities = tuple(
+                CityRow(*row)
+                for row in City.query
+                .with_entities(City.id, City.name, City.slug, City.state, City.lat, City.lng)
+                .order_by(City.name.asc())
+            )
+
+        with self._lock:
+            # dacă între timp a venit o invalidare, nu suprascriem versiunea nouă
+            if version == self._version:
+                self._categories = categories
+                self._cities = cities
+                self._fingerprint = hashlib.sha1(repr((categories, cities)).encode()).hexdigest()[:16]
+                self._loaded_version = version
+                self._loaded_at = time.monotonic()
+        return categories, cities
+
+    def fingerprint(self) -> str:
+        """
+        Hash al conținutului (nu al versiunii locale) – identic în toți workerii,
+        deci poate intra în ETag-uri.
+        """
+        self.get()
+        return self._fingerprint
+
+    def invalidate(self):
+        with self._lock:
+            self._version += 1
+
+    def invalidate_on_commit(self, session):
+        """Invalidare amânată până după commit (oraș / categorie creat în mijlocul unei tranzacții)."""
+        session.info["nav_cache_stale"] = True
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "version": self._version,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": (self.hits / total) if total else 0.0,
+            }
+
+
+nav_cache = NavCache()
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    # înainte de commit un request concurent ar reîncărca lista veche și ar ține-o NAV_CACHE_TTL
+    if session.info.pop("nav_cache_stale", False):
+        nav_cache.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session):
+    session.info.pop("nav_cache_stale", None)
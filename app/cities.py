@@ -0,0 +1,318 @@
+"""
+Rezolvarea orașelor: text liber ("60311, Frankfurt", "Berlin.", "Berlin-Charlottenburg")
+-> city_id, fără duplicate.
+
+- `city_key(name)`: numele normalizat (fără PLZ, punctuație, țară, diacritice),
+  stocat în City.name_key (index UNIQUE)
+- CityAlias: variante întâlnite deja -> orașul canonic
+- prefixul ("Berlin" din "Berlin-Charlottenburg") e același oraș doar dacă restul e un
+  cartier / sufix cunoscut sau gazetteer-ul îl pune în același oraș; "Frankfurt (Oder)",
+  "Halle (Saale)", "Neustadt in Holstein" rămân orașe separate. Un prefix nu devine
+  alias în DB fără confirmare (`flask cities-merge --confirm`)
+- `city_resolver`: hartă în memorie cheie -> city_id (nume + alias-uri), încărcată
+  o dată per proces; o cheie lipsă mai costă un SELECT indexat, apoi e reținută
+  (doar după commit – un oraș creat într-o tranzacție anulată nu rămâne în hartă)
+"""
+import re
+import threading
+
+from sqlalchemy import event, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .extensions import db
+from .gazetteer import gazetteer
+from .geo import haversine_km
+from .models import City, CityAlias, Listing
+from .utils import slugify
+
+_PLZ = re.compile(r"^\d{5}[,\s]*|[,\s]*\b\d{5}$")
+_COUNTRY = re.compile(r"[\s,]+(deutschland|germany)$", re.IGNORECASE)
+_TRIM = " ,.;-–"
+PLZ_MATCH_KM = 15
+
+
+def clean_city_name(raw: str | None) -> str:
+    """"60311, Frankfurt" -> "Frankfurt"; "Offenbach am Main Deutschland" -> "Offenbach am Main"."""
+    name = _PLZ.sub("", (raw or "").strip()).strip(_TRIM)
+    name = _COUNTRY.sub("", name).strip(_TRIM)
+    return re.sub(r"\s+", " ", name)
+
+
+def city_key(raw: str | None) -> str:
+    # slugify scoate diacriticele: "München" -> "munchen", "Berlin." -> "berlin"
+    return slugify(clean_city_name(raw))
+
+
+def _german_key(name: str) -> str:
+    # "Muenchen" tastat de user -> aceeași cheie ca "München"
+    return slugify(re.sub(r"(?<=[a-z])(ae|oe|ue)", lambda m: m.group(0)[0], name.lower()))
+
+
+def variant_keys(raw: str | None) -> list[str]:
+    """
+    Cheile numelui întreg, în ordine: "Berlin." / "60311 Berlin" -> "berlin";
+    "Muenchen" -> și "munchen" (aceeași cheie ca "München").
+    """
+    name = clean_city_name(raw)
+    keys = []
+    for key in (slugify(name), _german_key(name)) if name else ():
+        if key and key not in keys:
+            keys.append(key)
+    return keys
+
+
+# resturi care nu schimbă orașul: "Stuttgart Mitte", "Frankfurt, Hessen"
+_SUFFIXES = {
+    slugify(s) for s in (
+        "Mitte", "Stadtmitte", "Innenstadt", "Zentrum", "City", "Nord", "Süd", "Ost", "West",
+        "Hbf", "Hauptbahnhof", "Baden-Württemberg", "Bayern", "Brandenburg", "Hessen",
+        "Mecklenburg-Vorpommern", "Niedersachsen", "Nordrhein-Westfalen", "NRW",
+        "Rheinland-Pfalz", "Saarland", "Sachsen", "Sachsen-Anhalt", "Schleswig-Holstein", "Thüringen",
+    )
+}
+
+
+def _splits(name: str, first_word: bool) -> list[tuple[str, str]]:
+    """"Berlin-Charlottenburg" -> [("Berlin", "Charlottenburg")]; "Stuttgart Wangen" -> [("Stuttgart", "Wangen")]."""
+    seps = (",", " (", " – ", "-") + ((" ",) if first_word else ())
+    splits = []
+    for sep in seps:
+        if sep in name:
+            prefix, rest = name.split(sep, 1)
+            prefix, rest = prefix.strip(_TRIM), rest.strip(_TRIM + "()")
+            if prefix and rest and (prefix, rest) not in splits:
+                splits.append((prefix, rest))
+    return splits
+
+
+def _same_city(prefix: str, rest: str, name: str, plz: str | None) -> bool:
+    if slugify(rest) in _SUFFIXES or gazetteer.is_district(prefix, rest) or gazetteer.same_place(name, prefix):
+        return True
+    # PLZ-ul dat e în orașul din prefix (centrul PLZ-ului la câțiva km de centrul orașului)
+    if plz and plz.isdigit():
+        lat, lng = gazetteer.by_name(prefix, exact=True)
+        plz_lat, plz_lng = gazetteer.by_plz(plz)
+        return lat is not None and plz_lat is not None and haversine_km(lat, lng, plz_lat, plz_lng) <= PLZ_MATCH_KM
+    return False
+
+
+def city_parts(raw: str | None, first_word: bool = True, plz: str | None = None) -> list[str]:
+    """
+    Orașele din care face sigur parte numele: "Berlin-Charlottenburg" -> ["Berlin"],
+    "Frankfurt, Hessen" -> ["Frankfurt"], "Frankfurt (Oder)" / "Neustadt in Holstein" -> [].
+    """
+    name = clean_city_name(raw)
+    if plz is None:
+        m = re.search(r"\b\d{5}\b", raw or "")
+        plz = m.group(0) if m else None
+    return [prefix for prefix, rest in _splits(name, first_word) if _same_city(prefix, rest, name, plz)]
+
+
+class CityResolver:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._keys = None  # cheie -> city_id
+
+    def _load(self) -> dict:
+        if self._keys is None:
+            keys = {}
+            for alias_key, city_id in db.session.execute(select(CityAlias.alias_key, CityAlias.city_id)):
+                keys[alias_key] = city_id
+            # numele au prioritate față de alias-uri
+            for name_key, city_id in db.session.execute(select(City.name_key, City.id).where(City.name_key.isnot(None))):
+                keys[name_key] = city_id
+            with self._lock:
+                if self._keys is None:
+                    self._keys = keys
+        return self._keys
+
+    def invalidate(self):
+        with self._lock:
+            self._keys = None
+
+    def remember(self, key: str, city_id: int):
+        # intră în harta procesului abia la commit (vezi _promote_keys)
+        if key:
+            db.session.info.setdefault("city_keys", {})[key] = city_id
+
+    def _known(self, key: str) -> int | None:
+        pending = db.session.info.get("city_keys")
+        if pending and key in pending:
+            return pending[key]
+        return self._load().get(key)
+
+    def _fetch(self, key: str) -> int | None:
+        """Cheie necunoscută în proces: poate a creat-o alt worker – SELECT pe indexuri."""
+        city_id = db.session.execute(select(City.id).where(City.name_key == key)).scalar()
+        if city_id is None:
+            city_id = db.session.execute(select(CityAlias.city_id).where(CityAlias.alias_key == key)).scalar()
+        return city_id
+
+    def _find(self, keys: list[str], learn: bool) -> int | None:
+        for key in keys:
+            city_id = self._known(key)
+            if city_id is None:
+                city_id = self._fetch(key)
+                if city_id is not None:
+                    self.remember(key, city_id)
+            if city_id is not None:
+                # "Muenchen" -> München: același nume, alias sigur
+                if learn and key != keys[0]:
+                    self.add_alias(keys[0], city_id)
+                return city_id
+        return None
+
+    def _find_place(self, name: str) -> int | None:
+        """Orașul existent cu alt nume pentru același loc din gazetteer ("Frankfurt" / "Frankfurt am Main")."""
+        for other in gazetteer.place_names(name):
+            if city_key(other) != city_key(name):
+                city_id = self._find(variant_keys(other), learn=False)
+                if city_id is not None:
+                    return city_id
+        return None
+
+    def lookup(self, raw: str | None, first_word: bool = True, learn: bool = True, plz: str | None = None) -> int | None:
+        """
+        city_id pentru un oraș existent sau None. "Berlin-Charlottenburg" găsește Berlin
+        (reținut doar în proces, nu ca alias); "Frankfurt" găsește "Frankfurt am Main"
+        (același loc în gazetteer -> alias); "Frankfurt (Oder)" nu găsește Frankfurt.
+        """
+        keys = variant_keys(raw)
+        if not keys:
+            return None
+        city_id = self._find(keys, learn)
+        if city_id is not None:
+            return city_id
+        # "60311, Frankfurt" -> "Frankfurt am Main": același loc în gazetteer, alias sigur
+        city_id = self._find_place(clean_city_name(raw))
+        if city_id is not None:
+            if learn:
+                self.add_alias(keys[0], city_id)
+            return city_id
+        for part in city_parts(raw, first_word=first_word, plz=plz):
+            city_id = self._find(variant_keys(part), learn) or self._find_place(part)
+            if city_id is not None:
+                if learn:
+                    self.remember(keys[0], city_id)
+                return city_id
+        return None
+
+    def add_alias(self, alias_key: str, city_id: int):
+        if not alias_key:
+            return
+        try:
+            with db.session.begin_nested():
+                db.session.add(CityAlias(alias_key=alias_key, city_id=city_id))
+        except IntegrityError:
+            pass  # adăugat între timp de alt request
+        self.remember(alias_key, city_id)
+
+    def get_or_create(self, raw: str | None) -> tuple[int, bool]:
+        """(city_id, creat). Orașele noi primesc coordonate din gazetteer (PLZ are prioritate)."""
+        name = clean_city_name(raw)
+        if not name:
+            raise ValueError("City is required")
+        city_id = self.lookup(raw)
+        if city_id is not None:
+            return city_id, False
+
+        lat, lng = gazetteer.resolve(raw, exact=True)
+        city = City(name=name, slug=slugify(name), state=None, lat=lat, lng=lng)
+        try:
+            with db.session.begin_nested():
+                db.session.add(city)
+        except IntegrityError:
+            # creat între timp de alt request (name_key / slug UNIQUE)
+            city_id = self._fetch(city_key(name)) or db.session.execute(
+                select(City.id).where(City.slug == slugify(name))
+            ).scalar()
+            if city_id is None:
+                raise
+            self.remember(city_key(name), city_id)
+            return city_id, False
+        self.remember(city.name_key, city.id)
+        return city.id, True
+
+
+city_resolver = CityResolver()
+
+
+@event.listens_for(Session, "after_commit")
+def _promote_keys(session):
+    keys = session.info.pop("city_keys", None)
+    if keys and city_resolver._keys is not None:
+        with city_resolver._lock:
+            if city_resolver._keys is not None:
+                city_resolver._keys.update(keys)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_keys(session):
+    session.info.pop("city_keys", None)
+
+
+# --------------------
+# CURĂȚARE: orașe duplicate deja existente
+# --------------------
+def merge_duplicates(dry_run: bool = False, confirm=()) -> tuple[list[tuple[str, str, int]], list[tuple[str, str]]]:
+    """
+    Unește orașele care sunt variante ale altuia ("Berlin.", "60311, Frankfurt",
+    "Berlin-Charlottenburg"): listările trec pe orașul canonic.
+    Un prefix neconfirmat ("Frankfurt (Oder)" -> "Frankfurt") nu e unit: apare în
+    `pending` până când adminul îl trece în `confirm`; abia atunci devine și alias.
+    Întoarce (merged [(variantă, canonic, listări mutate)], pending [(variantă, canonic)]).
+    Commit-ul rămâne la apelant.
+    """
+    confirm = {city_key(name) for name in confirm}
+    cities = db.session.execute(select(City.id, City.name, City.name_key, City.lat, City.lng).order_by(City.id)).all()
+    # canonic = orașul care își poartă cheia (name_key setat); la egalitate cel mai vechi
+    canonical = {}
+    for c in cities:
+        if c.name_key:
+            canonical.setdefault(c.name_key, c)
+
+    def find(names, city_id):
+        keys = (k for name in names for k in variant_keys(name))
+        return next((canonical[k] for k in keys if k in canonical and canonical[k].id != city_id), None)
+
+    merged, pending = [], []
+    for c in cities:
+        # același nume -> alias; cartier cunoscut -> fără alias (e rezolvat oricum)
+        target, alias = find([c.name], c.id), True
+        place = gazetteer.place_names(clean_city_name(c.name))
+        if target is None and place:
+            # același loc din gazetteer ("Frankfurt" / "Frankfurt am Main"): rămâne cel mai vechi;
+            # un loc cunoscut nu e cartierul altuia
+            target = find(place, c.id)
+            if target is None or target.id > c.id:
+                continue
+        if target is None:
+            target, alias = find(city_parts(c.name), c.id), False
+        if target is None:
+            target = find([prefix for prefix, _ in _splits(clean_city_name(c.name), first_word=True)], c.id)
+            if target is None:
+                continue
+            if city_key(c.name) not in confirm:
+                pending.append((c.name, target.name))
+                continue
+            alias = True
+        moved = db.session.query(Listing).filter(Listing.city_id == c.id).count()
+        merged.append((c.name, target.name, moved))
+        if canonical.get(c.name_key) is c:
+            canonical.pop(c.name_key)
+        if dry_run:
+            continue
+        db.session.query(Listing).filter(Listing.city_id == c.id).update(
+            {Listing.city_id: target.id}, synchronize_session=False
+        )
+        if target.lat is None and c.lat is not None:
+            db.session.query(City).filter(City.id == target.id).update({City.lat: c.lat, City.lng: c.lng})
+        db.session.query(CityAlias).filter(CityAlias.city_id == c.id).update({CityAlias.city_id: target.id})
+        db.session.query(City).filter(City.id == c.id).delete()
+        db.session.flush()
+        if alias and city_key(c.name) != target.name_key:
+            city_resolver.add_alias(city_key(c.name), target.id)
+    if merged and not dry_run:
+        city_resolver.invalidate()
+    return merged, pending
@@ -0,0 +1,267 @@
+import csv
+import os
+import time
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+from . import moderation, static_export, stats
+from .cache import nav_cache
+from .cities import merge_duplicates
+from .dedup import DEFAULT_THRESHOLD, find_duplicates, listing_records
+from .models import Listing, Submission
+from .extensions import db
+from .importer import DirectoryImporter
+from .images import directory_images, image_pipeline, mark_pending
+from .mailer import run_worker
+from .search import configured_backend, get_backend, reset_backend_cache
+
+
+@click.command("search-reindex")
+@with_appcontext
+def search_reindex():
+    """Recreează indexul full-text (FTS5 / tsvector) din tabela listing."""
+    backend = configured_backend()
+    with db.engine.begin() as conn:
+        count = backend.rebuild(conn)
+    reset_backend_cache()
+    click.echo(f"✅ {backend.name}: {count or 0} listări indexate (activ: {get_backend().name})")
+
+
+@click.command("export-static")
+@click.option("--out", "out_dir", default="static_export", show_default=True, help="Directorul de ieșire.")
+@click.option("--base-url", envvar="SITE_URL", required=True, help="URL-ul public (canonical / og:url), ex. https://exemplu.de")
+@click.option("--workers", type=int, default=os.cpu_count() or 1, show_default=True)
+@click.option("--incremental", is_flag=True, help="Doar paginile atinse de listări modificate de la ultimul export.")
+@with_appcontext
+def export_static(out_dir, base_url, workers, incremental):
+    """Randează paginile publice în HTML static (+ .gz / .br) pentru CDN."""
+    started = time.perf_counter()
+    os.makedirs(out_dir, exist_ok=True)
+
+    listings = static_export.listing_rows()
+    manifest = static_export.load_manifest(out_dir) if incremental else {}
+
+    # meniurile apar pe toate paginile -> dacă s-au schimbat, export complet
+    if manifest and manifest.get("nav") == nav_cache.fingerprint():
+        paths, removed = static_export.changed_paths(listings, manifest)
+    else:
+        if incremental:
+            click.echo("ℹ️ fără manifest compatibil (sau meniuri schimbate) – export complet")
+        paths, removed = static_export.all_paths(listings), []
+
+    for path in removed:
+        static_export.remove_page(out_dir, path)
+
+    written, unchanged, failed = static_export.render_pages(paths, out_dir, base_url.rstrip("/"), max(workers, 1))
+    static_export.save_manifest(out_dir, listings)
+
+    for line in failed:
+        click.echo(f"⚠️ {line}")
+    if static_export.brotli is None:
+        click.echo("ℹ️ modulul brotli nu e instalat – doar .gz")
+    elapsed = time.perf_counter() - started
+    click.echo(
+        f"✅ {len(paths)} pagini în {elapsed:.1f}s ({len(paths) / elapsed:.0f}/s): "
+        f"{written} scrise, {unchanged} neschimbate, {len(removed)} șterse, {len(failed)} erori"
+    )
+
+
+@click.command("mail-worker")
+@click.option("--batch", type=int, default=50, show_default=True)
+@click.option("--interval", type=float, default=5.0, show_default=True, help="Secunde între verificări când outbox-ul e gol.")
+@click.option("--once", is_flag=True, help="Trimite ce e scadent și iese (cron).")
+@with_appcontext
+def mail_worker(batch, interval, once):
+    """Trimite mesajele din outbox pe o conexiune SMTP persistentă."""
+    total = run_worker(batch=batch, interval=interval, once=once, echo=click.echo)
+    if once:
+        click.echo(f"✅ trimise {total['sent']}, reîncercări {total['retry']}, eșuate {total['failed']}")
+
+
+@click.command("images-upload")
+@click.argument("directory", required=False, type=click.Path(exists=True, file_okay=False))
+@click.option("--resume", is_flag=True, help="Reia listările rămase PENDING (worker oprit în timpul upload-ului).")
+@click.option("--older-than", type=int, default=None, help="Secunde; implicit IMAGE_PENDING_TIMEOUT.")
+@with_appcontext
+def images_upload(directory, resume, older_than):
+    """Re-urcă imaginile <slug>.<ext> dintr-un director, în paralel (IMAGE_UPLOAD_WORKERS)."""
+    if not directory and not resume:
+        raise click.UsageError("dă un DIRECTORY și / sau --resume")
+    started = time.perf_counter()
+    app = current_app._get_current_object()
+    app.config["IMAGE_RESUME_ON_START"] = False  # resume explicit, sincron, mai jos
+    if resume:
+        counts = image_pipeline.resume(app, older_than)
+        click.echo(
+            f"🔁 {counts['requeued']} re-programate, {counts['failed']} marcate FAILED, "
+            f"{counts['orphans']} fișiere orfane șterse din spool"
+        )
+    if not directory:
+        image_pipeline.shutdown()
+        click.echo(f"✅ gata în {time.perf_counter() - started:.1f}s")
+        return
+
+    files = directory_images(directory)
+    listings = Listing.query.filter(Listing.slug.in_(list(files))).all() if files else []
+
+    tokens = {item.id: (mark_pending(item), files[item.slug]) for item in listings}
+    db.session.commit()
+
+    futures = [
+        image_pipeline.submit(listing_id, token, path, remove_after=False)
+        for listing_id, (token, path) in tokens.items()
+    ]
+    results = [f.result() for f in futures]
+    image_pipeline.shutdown()
+
+    missing = len(files) - len(listings)
+    click.echo(
+        f"✅ {results.count('ok')} urcate, {results.count('failed')} eșuate, "
+        f"{missing} fără listare în {time.perf_counter() - started:.1f}s"
+    )
+
+
+@click.command("import-directory")
+@click.argument("csv_path", default="full_directory.csv", type=click.Path(exists=True, dir_okay=False))
+@click.option("--batch", type=int, default=2000, show_default=True, help="Rânduri per INSERT ... ON CONFLICT.")
+@click.option("--dry-run", is_flag=True, help="Afișează diferențele, fără să scrie în DB.")
+@with_appcontext
+def import_directory(csv_path, batch, dry_run):
+    """Importă / actualizează listările din CSV (dedup pe phone_key, apoi nume + oraș)."""
+    started = time.perf_counter()
+    with open(csv_path, newline="", encoding="utf-8-sig") as f:
+        report = DirectoryImporter(dry_run=dry_run, batch=batch).run(f)
+    elapsed = time.perf_counter() - started
+
+    for line in report.diff:
+        click.echo(line)
+    for lineno, reason in report.skipped:
+        click.echo(f"⚠️ linia {lineno}: {reason}")
+    if report.created_categories:
+        click.echo(f"ℹ️ categorii noi: {', '.join(report.created_categories)}")
+    if report.created_cities:
+        click.echo(f"ℹ️ orașe noi: {', '.join(report.created_cities)}")
+
+    if dry_run:
+        db.session.rollback()
+    else:
+        # upsert-urile prin Core nu trec prin evenimentele ORM ale contoarelor
+        stats.reconcile()
+        db.session.commit()
+        if report.created_categories or report.created_cities:
+            nav_cache.invalidate()
+
+    click.echo(
+        f"{'🔎 dry-run' if dry_run else '✅'} {report.rows} rânduri în {elapsed:.2f}s "
+        f"({report.rows / elapsed:.0f} rânduri/s): {report.inserted} noi, {report.updated} actualizate, "
+        f"{report.unchanged} neschimbate, {len(report.skipped)} sărite"
+    )
+
+
+@click.command("dedup-report")
+@click.option("--threshold", type=float, default=DEFAULT_THRESHOLD, show_default=True, help="Scor minim 0..1.")
+@click.option("--limit", type=int, default=100, show_default=True, help="Câte perechi afișăm (0 = toate).")
+@click.option("--csv", "csv_path", type=click.Path(dir_okay=False, writable=True), help="Scrie toate perechile într-un CSV.")
+@with_appcontext
+def dedup_report(threshold, limit, csv_path):
+    """Raport cu listările care par duplicate (nume / adresă / telefon apropiate)."""
+    started = time.perf_counter()
+    result = find_duplicates(listing_records(), threshold=threshold)
+    elapsed = time.perf_counter() - started
+
+    names = result.names
+    for s, a, b, reasons in result.pairs[:limit or None]:
+        click.echo(f"{s:.2f}  #{a} {names.get(a)!r}  ~  #{b} {names.get(b)!r}  ({', '.join(reasons)})")
+
+    if csv_path:
+        with open(csv_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["score", "id_a", "name_a", "id_b", "name_b", "reasons"])
+            for s, a, b, reasons in result.pairs:
+                writer.writerow([s, a, names.get(a), b, names.get(b), "; ".join(reasons)])
+
+    click.echo(
+        f"✅ {len(result.pairs)} perechi >= {threshold} în {elapsed:.2f}s "
+        f"({result.compared} comparații, {result.blocks} blocuri, {result.skipped_blocks} prea mari ignorate)"
+    )
+
+
+@click.command("stats-reconcile")
+@with_appcontext
+def stats_reconcile():
+    """Recalculează contoarele din dashboard (stat_counter) și afișează diferențele. Pentru cron."""
+    started = time.perf_counter()
+    drift = stats.reconcile()
+    db.session.commit()
+    for name, (old, new) in sorted(drift.items()):
+        click.echo(f"~ {name}: {old} -> {new}")
+    click.echo(f"✅ {len(drift)} contoare corectate în {time.perf_counter() - started:.2f}s")
+
+
+@click.command("submissions-moderate")
+@click.argument("action", type=click.Choice([moderation.APPROVE, moderation.REJECT]))
+@click.argument("ids", nargs=-1, type=int)
+@click.option("--all-pending", is_flag=True, help="Toate submission-urile PENDING.")
+@click.option("--dry-run", is_flag=True, help="Afișează rezultatul, apoi rollback.")
+@with_appcontext
+def submissions_moderate(action, ids, all_pending, dry_run):
+    """Aprobă / respinge submission-uri în lot, într-o singură tranzacție."""
+    if all_pending:
+        ids = db.session.execute(
+            db.select(Submission.id).where(Submission.status == "PENDING").order_by(Submission.id)
+        ).scalars().all()
+    if not ids:
+        raise click.UsageError("dă id-uri sau --all-pending")
+
+    started = time.perf_counter()
+    results, created_cities = moderation.moderate(ids, action)
+    if dry_run:
+        db.session.rollback()
+    else:
+        db.session.commit()
+        if created_cities:
+            nav_cache.invalidate()
+
+    for r in results:
+        extra = f" -> #{r.listing_id} {r.slug}" if r.listing_id else ""
+        click.echo(f"#{r.sub_id}: {r.status}{extra}{f' ({r.message})' if r.message else ''}")
+    if created_cities:
+        click.echo(f"ℹ️ orașe noi: {', '.join(created_cities)}")
+    done = sum(r.status in ("approved", "rejected") for r in results)
+    click.echo(f"{'🔎 dry-run' if dry_run else '✅'} {done}/{len(results)} în {time.perf_counter() - started:.2f}s")
+
+
+@click.command("cities-merge")
+@click.option("--dry-run", is_flag=True, help="Afișează ce s-ar uni, fără să scrie în DB.")
+@click.option("--confirm", multiple=True, metavar="ORAȘ",
+              help='Unește și o variantă care doar începe cu alt oraș (ex: "Stuttgart-Rot"); repetabil.')
+@with_appcontext
+def cities_merge(dry_run, confirm):
+    """Unește orașele duplicate ("Berlin.", "60311, Frankfurt") în cel canonic; varianta rămâne alias."""
+    merged, pending = merge_duplicates(dry_run=dry_run, confirm=confirm)
+    for variant, canonical, moved in merged:
+        click.echo(f"{variant!r} -> {canonical!r} ({moved} listări)")
+    for variant, canonical in pending:
+        click.echo(f"❔ {variant!r} -> {canonical!r}? neunit (poate fi alt oraș); confirmă cu --confirm {variant!r}")
+    if dry_run or not merged:
+        db.session.rollback()
+        click.echo(f"{'🔎 dry-run: ' if dry_run else ''}{len(merged)} orașe de unit")
+        return
+    stats.reconcile()  # contoarele city:<id> ale orașelor șterse
+    db.session.commit()
+    nav_cache.invalidate()
+    click.echo(f"✅ {len(merged)} orașe unite. Repornește workerii web (harta orașelor e încărcată o dată per proces).")
+
+
+def register_commands(app):
+    app.cli.add_command(search_reindex)
+    app.cli.add_command(export_static)
+    app.cli.add_command(mail_worker)
+    app.cli.add_command(images_upload)
+    app.cli.add_command(import_directory)
+    app.cli.add_command(dedup_report)
+    app.cli.add_command(stats_reconcile)
+    app.cli.add_command(submissions_moderate)
+    app.cli.add_command(cities_merge)
@@ -1,5 +1,7 @@
 import os
 
+from .dbpool import engine_options
+
 basedir = os.path.abspath(os.path.dirname(__file__))
 
 
@@ -25,11 +27,87 @@ class Config:
     SQLALCHEMY_DATABASE_URI = _normalize_database_url(DATABASE_URL)
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # 🏊 Engine / pool: dev | web | worker | pgbouncer (vezi app/dbpool.py)
+    # implicit: SQLite -> dev, comenzile `flask ...` -> worker, gunicorn -> web
+    DB_ENGINE_PROFILE = os.getenv("DB_ENGINE_PROFILE") or (
+        "dev" if SQLALCHEMY_DATABASE_URI.startswith("sqlite")
+        else "worker" if os.getenv("FLASK_RUN_FROM_CLI") == "true"
+        else "web"
+    )
+    GUNICORN_THREADS = int(os.getenv("GUNICORN_THREADS", "4"))  # același env ca gunicorn.conf.py
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "0")) or None          # 0 = după profil / threads
+    DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "0")) or None  # secunde întregi de așteptare la checkout
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS")) if os.getenv("DB_STATEMENT_TIMEOUT_MS") else None
+    DB_POOL_WAIT_WARN_MS = float(os.getenv("DB_POOL_WAIT_WARN_MS", "100"))  # checkout mai lent -> warning în log
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(
+        DB_ENGINE_PROFILE,
+        SQLALCHEMY_DATABASE_URI,
+        threads=GUNICORN_THREADS,
+        pool_size=DB_POOL_SIZE,
+        pool_timeout=DB_POOL_TIMEOUT,
+        statement_timeout_ms=DB_STATEMENT_TIMEOUT_MS,
+    )
+
+    # 🪞 Replică pentru citirile publice (app/replica.py); gol = totul pe primary
+    DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL", "")
+    SQLALCHEMY_BINDS = {"replica": _normalize_database_url(DATABASE_REPLICA_URL)} if DATABASE_REPLICA_URL else {}
+    # după o scriere vizitatorul citește din primary atât timp (> lag-ul maxim al replicii)
+    DB_REPLICA_STICKY_SECONDS = int(os.getenv("DB_REPLICA_STICKY_SECONDS", "10"))
+
     # 🔧 Flask
     DEBUG = os.getenv("FLASK_DEBUG", "0") == "1"
 
+    # 🧭 Cache meniuri (categorii/orașe) – secunde; 0 = doar invalidare explicită
+    NAV_CACHE_TTL = int(os.getenv("NAV_CACHE_TTL", "60"))
+
+    # 📍 Geocoding (Nominatim) – URL configurabil ca să putem testa cu un server local
+    NOMINATIM_URL = os.getenv("NOMINATIM_URL", "https://nominatim.openstreetmap.org/search")
+    GEOCODE_TIMEOUT = float(os.getenv("GEOCODE_TIMEOUT", "5"))
+    GEOCODE_LRU_SIZE = int(os.getenv("GEOCODE_LRU_SIZE", "1024"))
+    GEOCODE_NEGATIVE_TTL = int(os.getenv("GEOCODE_NEGATIVE_TTL", "86400"))  # 1 zi
+
+    # 🔎 Căutare text: auto (după DB) | like | sqlite | postgresql
+    SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "auto")
+
+    # 🗺️ Sitemap: URL-uri per fișier sitemap-*.xml.gz (maxim 50.000)
+    SITEMAP_CHUNK_SIZE = int(os.getenv("SITEMAP_CHUNK_SIZE", "50000"))
+
+    # 🌐 Cache HTTP pentru pagini publice (ETag / Last-Modified + CDN)
+    HTTP_CACHE_MAX_AGE = int(os.getenv("HTTP_CACHE_MAX_AGE", "60"))
+    HTTP_CACHE_STALE_WHILE_REVALIDATE = int(os.getenv("HTTP_CACHE_STALE_WHILE_REVALIDATE", "600"))
+
+    # 🧱 Cache HTML randat (seo_landing / category_page), per proces
+    PAGE_CACHE_ENABLED = os.getenv("PAGE_CACHE_ENABLED", "1") == "1"
+    PAGE_CACHE_MAX_BYTES = int(os.getenv("PAGE_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+    PAGE_CACHE_TTL = int(os.getenv("PAGE_CACHE_TTL", "300"))
+
+    # ✉️ Email (contact) – mesajele intră în outbox, `flask mail-worker` le trimite
+    MAIL_SERVER = os.getenv("MAIL_SERVER", "smtp.gmail.com")
+    MAIL_PORT = int(os.getenv("MAIL_PORT", "465"))
+    MAIL_USE_SSL = os.getenv("MAIL_USE_SSL", "1") == "1"
+    MAIL_USE_TLS = os.getenv("MAIL_USE_TLS", "0") == "1"  # STARTTLS (port 587)
+    MAIL_USERNAME = os.getenv("MAIL_USERNAME", "")
+    MAIL_PASSWORD = os.getenv("MAIL_PASSWORD", "")
+    MAIL_FROM = os.getenv("MAIL_FROM", MAIL_USERNAME)
+    MAIL_TO = os.getenv("MAIL_TO", MAIL_USERNAME)
+    MAIL_TIMEOUT = float(os.getenv("MAIL_TIMEOUT", "10"))
+    MAIL_MAX_ATTEMPTS = int(os.getenv("MAIL_MAX_ATTEMPTS", "8"))
+    MAIL_RETRY_BASE = float(os.getenv("MAIL_RETRY_BASE", "30"))      # secunde
+    MAIL_RETRY_MAX = float(os.getenv("MAIL_RETRY_MAX", "3600"))
+
     # ☁️ Cloudinary (opțional – nu strică dacă lipsesc)
     CLOUDINARY_URL = os.getenv("CLOUDINARY_URL", "")
     CLOUDINARY_CLOUD_NAME = os.getenv("CLOUDINARY_CLOUD_NAME", "")
     CLOUDINARY_API_KEY = os.getenv("CLOUDINARY_API_KEY", "")
     CLOUDINARY_API_SECRET = os.getenv("CLOUDINARY_API_SECRET", "")
+
+    # 🖼️ Upload imagini în fundal: cloudinary | local (dev / teste, fără rețea)
+    IMAGE_UPLOADER = os.getenv("IMAGE_UPLOADER", "cloudinary")
+    IMAGE_UPLOAD_WORKERS = int(os.getenv("IMAGE_UPLOAD_WORKERS", "4"))
+    IMAGE_UPLOAD_RETRIES = int(os.getenv("IMAGE_UPLOAD_RETRIES", "3"))
+    IMAGE_UPLOAD_RETRY_DELAY = float(os.getenv("IMAGE_UPLOAD_RETRY_DELAY", "1"))
+    IMAGE_SPOOL_DIR = os.getenv("IMAGE_SPOOL_DIR", os.path.join(basedir, "..", "instance", "image_spool"))
+    IMAGE_LOCAL_DIR = os.getenv("IMAGE_LOCAL_DIR", os.path.join(basedir, "static", "uploads"))
+    # PENDING mai vechi de atât = worker oprit în timpul upload-ului (> reîncercări + gunicorn timeout)
+    IMAGE_PENDING_TIMEOUT = int(os.getenv("IMAGE_PENDING_TIMEOUT", "900"))
+    IMAGE_RESUME_ON_START = os.getenv("IMAGE_RESUME_ON_START", "1") == "1"
@@ -0,0 +1,167 @@
+"""
+Profiluri pentru engine-ul SQLAlchemy (DB_ENGINE_PROFILE) + monitorizarea pool-ului.
+
+- dev:       SQLite / Postgres local, setările implicite
+- web:       gunicorn (gunicorn.conf.py) – un pool per worker, dimensionat după
+             GUNICORN_THREADS; statement_timeout scurt, ca un query lent (ex. raza
+             cu acos) să nu țină conexiunea la nesfârșit; checkout cu timeout scurt
+- worker:    comenzile `flask ...` lungi (mail-worker, import, reindex): pool mic,
+             timeout-uri mari
+- pgbouncer: PgBouncer în transaction mode – fără pool local (NullPool), fără
+             parametri de sesiune la conectare; statement_timeout cu SET LOCAL
+             la începutul fiecărei tranzacții
+
+Așteptarea la checkout și epuizarea pool-ului (TimeoutError) sunt logate și
+numărate în `pool_stats` (afișate în dashboard-ul admin).
+"""
+import logging
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+from sqlalchemy.pool import NullPool, QueuePool
+
+log = logging.getLogger(__name__)
+
+PROFILES = ("dev", "web", "worker", "pgbouncer")
+
+# (pool_size, max_overflow, pool_timeout s, statement_timeout ms); None = după threads
+_DEFAULTS = {
+    "web": (None, 2, 5, 5000),
+    "worker": (2, 2, 30, 300000),
+}
+
+
+class PoolStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.profile = "dev"
+        self.wait_warn_ms = 100.0
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.slow_checkouts = 0
+            self.exhausted = 0
+            self.wait_total_ms = 0.0
+            self.wait_max_ms = 0.0
+
+    def record(self, wait_ms: float, exhausted: bool = False):
+        with self._lock:
+            if exhausted:
+                self.exhausted += 1
+                return
+            self.checkouts += 1
+            self.wait_total_ms += wait_ms
+            self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+            if wait_ms >= self.wait_warn_ms:
+                self.slow_checkouts += 1
+
+    def stats(self, engine=None) -> dict:
+        with self._lock:
+            out = {
+                "profile": self.profile,
+                "checkouts": self.checkouts,
+                "slow_checkouts": self.slow_checkouts,
+                "exhausted": self.exhausted,
+                "wait_avg_ms": self.wait_total_ms / self.checkouts if self.checkouts else 0.0,
+                "wait_max_ms": self.wait_max_ms,
+            }
+        pool = getattr(engine, "pool", None)
+        if isinstance(pool, QueuePool):
+            out.update(size=pool.size(), checked_out=pool.checkedout(), overflow=max(pool.overflow(), 0))
+        return out
+
+
+pool_stats = PoolStats()
+
+
+class MonitoredQueuePool(QueuePool):
+    """QueuePool care măsoară cât așteaptă un request după o conexiune."""
+
+    _local = threading.local()
+
+    def _do_get(self):
+        # QueuePool._do_get se apelează recursiv – măsurăm doar apelul exterior
+        if getattr(self._local, "busy", False):
+            return super()._do_get()
+        self._local.busy = True
+        started = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeout:
+            wait_ms = (time.perf_counter() - started) * 1000
+            pool_stats.record(wait_ms, exhausted=True)
+            log.error("pool DB epuizat după %.0f ms: %s", wait_ms, self.status())
+            raise
+        finally:
+            self._local.busy = False
+        wait_ms = (time.perf_counter() - started) * 1000
+        pool_stats.record(wait_ms)
+        if wait_ms >= pool_stats.wait_warn_ms:
+            log.warning("checkout lent din pool-ul DB: %.0f ms (%s)", wait_ms, self.status())
+        return conn
+
+
+def engine_options(
+    profile: str,
+    url: str,
+    threads: int = 1,
+    pool_size: int | None = None,
+    pool_timeout: int | None = None,
+    statement_timeout_ms: int | None = None,
+    application_name: str = "romani-servicii",
+) -> dict:
+    """SQLALCHEMY_ENGINE_OPTIONS pentru profilul cerut; None = valoarea profilului."""
+    if profile not in PROFILES:
+        raise ValueError(f"DB_ENGINE_PROFILE necunoscut: {profile!r} (din {', '.join(PROFILES)})")
+    postgres = url.startswith("postgresql")
+    if profile == "dev":
+        return {}
+
+    if profile == "pgbouncer":
+        # PgBouncer ține pool-ul; local doar deschidem / închidem conexiuni ieftine
+        options = {"poolclass": NullPool}
+        if postgres:
+            options["connect_args"] = {"connect_timeout": 5, "application_name": f"{application_name}-web"}
+        return options
+
+    default_size, max_overflow, default_timeout, default_statement_timeout = _DEFAULTS[profile]
+    options = {
+        "poolclass": MonitoredQueuePool,
+        # un thread gunicorn = cel mult o conexiune; overflow pentru thread-urile din fundal
+        "pool_size": pool_size or default_size or max(threads, 1),
+        "max_overflow": max_overflow,
+        "pool_timeout": pool_timeout or default_timeout,
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+    }
+    if postgres:
+        statement_timeout = statement_timeout_ms if statement_timeout_ms is not None else default_statement_timeout
+        options["connect_args"] = {
+            "connect_timeout": 5,
+            "application_name": f"{application_name}-{profile}",
+            "options": f"-c statement_timeout={statement_timeout} -c idle_in_transaction_session_timeout=60000",
+        }
+    return options
+
+
+def init_engine_profile(app, engines):
+    """Apelat o dată per app: statement_timeout pentru pgbouncer + setările pentru pool_stats."""
+    pool_stats.profile = app.config.get("DB_ENGINE_PROFILE", "dev")
+    pool_stats.wait_warn_ms = float(app.config.get("DB_POOL_WAIT_WARN_MS", 100))
+
+    timeout = app.config.get("DB_STATEMENT_TIMEOUT_MS")
+    timeout = _DEFAULTS["web"][3] if timeout is None else timeout
+    for engine in engines:
+        if pool_stats.profile == "pgbouncer" and engine.dialect.name == "postgresql":
+            event.listen(engine, "begin", _set_local_timeout(timeout))
+
+
+def _set_local_timeout(timeout: int):
+    def _statement_timeout(conn):
+        # în transaction mode un SET de sesiune ar ajunge la alți clienți
+        conn.exec_driver_sql(f"SET LOCAL statement_timeout = {int(timeout)}")
+    return _statement_timeout
@@ -0,0 +1,292 @@
+"""
+Detecție de duplicate „fuzzy” (nume / adresă ușor diferite).
+
+Blocking: fiecare înregistrare primește câteva chei (oraș + soundex al unui
+cuvânt din nume, PLZ + stradă + număr, telefon, domeniu) și comparăm
+doar perechile care au o cheie comună – nu n². Blocurile foarte mari (cuvinte
+prea comune) sunt ignorate, altfel redevin pătratice.
+
+Scor 0..1 = nume (trigrame) + adresă (PLZ + stradă) + contact (telefon / domeniu).
+"""
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+
+from sqlalchemy import func, or_, select
+
+from .cities import city_resolver
+from .extensions import db
+from .models import Listing
+from .utils import phone_key, website_domain
+
+# cuvinte care nu deosebesc firmele între ele
+STOPWORDS = {
+    "dr", "med", "medic", "stom", "dent", "praxis", "zahnarztpraxis", "zahnarzt", "kanzlei",
+    "rechtsanwalt", "rechtsanwaltin", "gmbh", "ug", "ek", "kg", "ag", "mbh", "und", "si", "and",
+    "de", "la", "din", "the", "fur", "im", "am", "der", "die", "das", "co", "kollegen", "team",
+    "firma", "cabinet",
+}
+
+MAX_BLOCK = 100          # blocuri mai mari = cheie prea generică
+DEFAULT_THRESHOLD = 0.62
+
+_WORD = re.compile(r"[a-z0-9]+")
+_PLZ = re.compile(r"\b(\d{5})\b")
+_HOUSE_NO = re.compile(r"\d+\s*[a-z]?(\s*[-/]\s*\d+\s*[a-z]?)?")
+
+
+def fold(text_: str | None) -> str:
+    text_ = unicodedata.normalize("NFKD", (text_ or "").lower().replace("ß", "ss"))
+    return "".join(c for c in text_ if not unicodedata.combining(c))
+
+
+def name_tokens(name: str) -> list[str]:
+    return [w for w in _WORD.findall(fold(name)) if w not in STOPWORDS and (len(w) > 1 or w.isdigit())]
+
+
+_SOUNDEX = {c: str(d) for d, letters in enumerate(("aeiouyhw", "bfpv", "cgjkqsxz", "dt", "l", "mn", "r")) for c in letters}
+
+
+def soundex(word: str) -> str:
+    codes = _SOUNDEX
+    word = "".join(c for c in word if c.isalpha())
+    if not word:
+        return ""
+    out, last = word[0], codes.get(word[0], "")
+    for c in word[1:]:
+        code = codes.get(c, "")
+        if code and code != "0" and code != last:
+            out += code
+        if c not in "hw":
+            last = code
+    return (out + "000")[:4]
+
+
+def trigrams(text_: str) -> frozenset:
+    text_ = f"  {text_} "
+    return frozenset(text_[i:i + 3] for i in range(len(text_) - 2))
+
+
+def jaccard(a: frozenset, b: frozenset) -> float:
+    if not a or not b:
+        return 0.0
+    inter = len(a & b)
+    return inter / (len(a) + len(b) - inter)
+
+
+def name_similarity(a: frozenset, b: frozenset) -> float:
+    """Media dintre Jaccard și overlap (|A∩B| / min): un cuvânt în plus
+    („Praxis”, „Cabinet”) nu mai scade scorul la jumătate."""
+    if not a or not b:
+        return 0.0
+    inter = len(a & b)
+    return 0.5 * (inter / (len(a) + len(b) - inter) + inter / min(len(a), len(b)))
+
+
+def split_address(address: str | None) -> tuple[str | None, str, str]:
+    """(PLZ, stradă, număr): "Werdener Straße 6, 40227" -> ("40227", "werdener str", "6")."""
+    text_ = fold(address)
+    m = _PLZ.search(text_)
+    plz = m.group(1) if m else None
+    street = _PLZ.sub(" ", text_).split(",")[0].replace("strasse", "str")
+    m = _HOUSE_NO.search(street)
+    number = re.sub(r"\s+", "", m.group(0)) if m else ""
+    return plz, " ".join(_WORD.findall(_HOUSE_NO.sub(" ", street))), number
+
+
+# --------------------
+# ÎNREGISTRĂRI + SCOR
+# --------------------
+@dataclass(slots=True)
+class Record:
+    id: int
+    name: str
+    city_id: int | None
+    plz: str | None = None
+    street: str = ""
+    number: str = ""
+    phones: frozenset = frozenset()
+    domain: str | None = None
+    tokens: list = field(default_factory=list)
+    name_grams: frozenset = frozenset()
+    street_grams: frozenset = frozenset()
+
+    @classmethod
+    def build(cls, id, name, city_id, address=None, phones=(), website=None):
+        tokens = name_tokens(name)
+        plz, street, number = split_address(address)
+        return cls(
+            id=id, name=name, city_id=city_id, plz=plz, street=street, number=number,
+            phones=frozenset(p for p in phones if p), domain=website_domain(website),
+            tokens=tokens,
+            # cuvinte sortate: "Popovici Gheorghe" == "Gheorghe Popovici"
+            name_grams=trigrams(" ".join(sorted(tokens))),
+            street_grams=trigrams(street) if street else frozenset(),
+        )
+
+    def blocking_keys(self):
+        if self.city_id is not None:
+            for t in self.tokens:
+                if len(t) >= 3:
+                    yield ("sx", self.city_id, soundex(t))
+        if self.plz and self.street:
+            yield ("addr", self.plz, self.street, self.number)
+        for p in self.phones:
+            yield ("tel", p)
+        if self.domain:
+            yield ("web", self.domain)
+
+
+def score(a: Record, b: Record) -> tuple[float, list[str]]:
+    """
+    Media ponderată doar peste ce au ambele înregistrări: un submission fără
+    adresă e judecat pe nume + contact, nu penalizat pentru adresa lipsă.
+    """
+    reasons = []
+    name = name_similarity(a.name_grams, b.name_grams)
+    if name >= 0.5:
+        reasons.append(f"nume {name:.2f}")
+    total, weights = 0.5 * name, 0.5
+
+    if a.plz and b.plz and a.street and b.street:
+        addr = jaccard(a.street_grams, b.street_grams) if a.plz == b.plz else 0.0
+        if a.number != b.number:
+            addr *= 0.5  # aceeași stradă, alt număr
+        if addr >= 0.5:
+            reasons.append(f"adresă {addr:.2f}")
+        total, weights = total + 0.35 * addr, weights + 0.35
+
+    contact = 0.0
+    if a.phones & b.phones:
+        contact = 1.0
+        reasons.append("telefon")
+    elif a.domain and a.domain == b.domain:
+        contact = 1.0
+        reasons.append(f"site {a.domain}")
+    if contact or ((a.phones or a.domain) and (b.phones or b.domain)):
+        total, weights = total + 0.15 * contact, weights + 0.15
+
+    total /= weights
+    if contact:
+        # același telefon / site: aproape sigur aceeași firmă, chiar cu alt nume
+        total = max(total, 0.5 + 0.5 * name)
+    return round(total, 3), reasons
+
+
+# --------------------
+# BATCH
+# --------------------
+@dataclass
+class DedupResult:
+    pairs: list            # [(scor, id_a, id_b, motive)], descrescător
+    compared: int
+    skipped_blocks: int
+    blocks: int
+    names: dict            # id -> nume, doar pentru id-urile din perechi
+
+
+def find_duplicates(records, threshold: float = DEFAULT_THRESHOLD, max_block: int = MAX_BLOCK,
+                    name_keys: int = 2) -> DedupResult:
+    """
+    Cheile de nume se aleg adaptiv: din fiecare înregistrare păstrăm doar
+    `name_keys` chei cu blocurile cele mai mici (de obicei numele de familie,
+    nu „Ion” / „Maria”), ceea ce taie majoritatea comparațiilor inutile.
+    """
+    records = list(records)
+    by_id = {r.id: r for r in records}
+    keys = {r.id: set(r.blocking_keys()) for r in records}
+    sizes = Counter(k for ks in keys.values() for k in ks)
+
+    blocks = defaultdict(list)
+    for r in records:
+        name, other = [], []
+        for k in keys[r.id]:
+            (name if k[0] == "sx" else other).append(k)
+        name.sort(key=sizes.__getitem__)
+        for key in name[:name_keys] + other:
+            blocks[key].append(r.id)
+    del keys, sizes
+
+    seen = set()
+    pairs = []
+    compared = skipped = 0
+    for ids in blocks.values():
+        if len(ids) < 2:
+            continue
+        if len(ids) > max_block:
+            skipped += 1
+            continue
+        for i, a_id in enumerate(ids):
+            for b_id in ids[i + 1:]:
+                pair = (a_id, b_id) if a_id < b_id else (b_id, a_id)
+                if pair in seen:
+                    continue
+                seen.add(pair)
+                compared += 1
+                s, reasons = score(by_id[pair[0]], by_id[pair[1]])
+                if s >= threshold:
+                    pairs.append((s, pair[0], pair[1], reasons))
+
+    pairs.sort(key=lambda p: (-p[0], p[1], p[2]))
+    names = {i: by_id[i].name for _, a, b, _ in pairs for i in (a, b)}
+    return DedupResult(pairs, compared, skipped, len(blocks), names)
+
+
+def listing_records(batch: int = 5000):
+    """Toate listările ca Record, citite în flux (doar coloanele necesare)."""
+    stmt = (
+        select(Listing.id, Listing.name, Listing.city_id, Listing.address,
+               Listing.phone_key, Listing.whatsapp_key, Listing.website)
+        .execution_options(yield_per=batch)
+    )
+    for row in db.session.execute(stmt):
+        yield Record.build(row.id, row.name, row.city_id, row.address, (row.phone_key, row.whatsapp_key), row.website)
+
+
+# --------------------
+# VERIFICARE PER SUBMISSION (admin)
+# --------------------
+def submission_candidates(sub, limit: int = 300) -> tuple[list[Record], int | None]:
+    """
+    (candidați, city_id). Candidații vin din DB pe coloane indexate: același
+    telefon / domeniu (egalitate pe website_domain), sau același oraș + cele
+    mai lungi cuvinte din nume.
+    """
+    key = phone_key(sub.contact or "")
+    domain = website_domain(sub.website)
+    tokens = sorted(name_tokens(sub.business_name), key=len, reverse=True)[:2]
+
+    # doar citire: verificarea din admin nu adaugă alias-uri
+    city_id = city_resolver.lookup(sub.city_name, learn=False)
+
+    conditions = []
+    if key:
+        conditions += [Listing.phone_key == key, Listing.whatsapp_key == key]
+    if domain:
+        conditions.append(Listing.website_domain == domain)
+    if city_id is not None and tokens:
+        conditions.append((Listing.city_id == city_id) & or_(*[func.lower(Listing.name).like(f"%{t}%") for t in tokens]))
+    if not conditions:
+        return [], city_id
+
+    rows = db.session.execute(
+        select(Listing.id, Listing.name, Listing.city_id, Listing.address,
+               Listing.phone_key, Listing.whatsapp_key, Listing.website)
+        .where(or_(*conditions))
+        .limit(limit)
+    )
+    return [Record.build(r.id, r.name, r.city_id, r.address, (r.phone_key, r.whatsapp_key), r.website) for r in rows], city_id
+
+
+def check_submission(sub, threshold: float = DEFAULT_THRESHOLD, limit: int = 5):
+    """[(scor, listing_id, nume, motive)] pentru listările care seamănă cu submission-ul."""
+    candidates, city_id = submission_candidates(sub)
+    probe = Record.build(0, sub.business_name, city_id, None, (phone_key(sub.contact or ""),), sub.website)
+    matches = []
+    for c in candidates:
+        s, reasons = score(probe, c)
+        if s >= threshold:
+            matches.append((s, c.id, c.name, reasons))
+    matches.sort(key=lambda m: -m[0])
+    return matches[:limit]
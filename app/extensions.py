@@ -1,5 +1,13 @@
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
 
-db = SQLAlchemy()
-migrate = Migrate()
+from .replica import RoutingSession
+
+# RoutingSession: citirile publice pot merge pe replică (app/replica.py)
+db = SQLAlchemy(session_options={"class_": RoutingSession})
+
+
+def init_migrate(app):
+    # Flask-Migrate aduce alembic (~130 ms la import) – îl încărcăm doar pentru `flask db ...`
+    from flask_migrate import Migrate
+
+    Migrate(app, db)
@@ -0,0 +1,206 @@
+import os
+import re
+import threading
+from array import array
+from bisect import bisect_left
+
+from slugify import slugify as _slugify
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), "data", "gazetteer_de.tsv")
+DISTRICTS_PATH = os.path.join(os.path.dirname(__file__), "data", "districts_de.tsv")
+
+_PLZ_RE = re.compile(r"\b(\d{5})\b")
+# "Frankfurt am Main" e găsit și ca "Frankfurt"
+_SHORT_NAME_RE = re.compile(r"\s+(am|an der|im|in|ob der|bei)\s+.*$|\s*\(.*\)$")
+_STREET_RE = re.compile(
+    r"(stra(ss|ß)e|str\.|weg\b|platz\b|allee\b|gasse\b|ring\b|damm\b|ufer\b|chaussee\b)",
+    re.IGNORECASE,
+)
+
+
+def _name_keys(name: str) -> list[str]:
+    """
+    "München" -> ["munchen", "muenchen"]; "Köln" -> ["koln", "koeln"]
+    (userii scriu fie fără diacritice, fie cu transliterarea germană)
+    """
+    plain = _slugify(name)
+    german = _slugify(
+        name.replace("ä", "ae").replace("ö", "oe").replace("ü", "ue")
+        .replace("Ä", "Ae").replace("Ö", "Oe").replace("Ü", "Ue")
+    )
+    return [plain] if plain == german else [plain, german]
+
+
+def looks_like_address(query: str) -> bool:
+    """
+    True dacă textul conține o stradă / număr de casă, nu doar PLZ + oraș.
+    "31655 Stadthagen" -> False; "Werdener Str. 6, 40227 Düsseldorf" -> True
+    """
+    rest = _PLZ_RE.sub(" ", query or "")
+    return bool(_STREET_RE.search(rest) or re.search(r"\d", rest))
+
+
+class Gazetteer:
+    """
+    PLZ + nume de localități din Germania, rezolvate local (fără rețea).
+
+    Încărcat leneș la prima folosire în array-uri compacte:
+    - `_plz` (sortat, array('I')) + `_plz_place` -> index în `_lat`/`_lng`
+    - `_names`: slug nume -> index
+    - `_districts`: index oraș -> slug-urile cartierelor lui ("Berlin" -> "charlottenburg", ...)
+    """
+
+    def __init__(self, path: str = DATA_PATH, districts_path: str = DISTRICTS_PATH):
+        self.path = path
+        self.districts_path = districts_path
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def _load(self):
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            plz_rows = []
+            names = {}
+            lat, lng, labels = array("d"), array("d"), []
+            place_index = {}
+
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip() or line.startswith("#"):
+                        continue
+                    plz, name, la, lo = line.rstrip("\n").split("\t")
+                    key = (name, la, lo)
+                    idx = place_index.get(key)
+                    if idx is None:
+                        idx = place_index[key] = len(labels)
+                        lat.append(float(la))
+                        lng.append(float(lo))
+                        labels.append(name)
+                    for k in _name_keys(name):
+                        names.setdefault(k, idx)
+                    if plz:
+                        plz_rows.append((int(plz), idx))
+
+            # nume scurte doar după ce toate numele complete sunt înregistrate
+            for idx, name in enumerate(labels):
+                short = _SHORT_NAME_RE.sub("", name)
+                if short != name:
+                    for k in _name_keys(short):
+                        names.setdefault(k, idx)
+
+            districts = {}
+            if os.path.exists(self.districts_path):
+                with open(self.districts_path, encoding="utf-8") as f:
+                    for line in f:
+                        if not line.strip() or line.startswith("#"):
+                            continue
+                        city, district = line.rstrip("\n").split("\t")
+                        idx = names.get(_name_keys(city)[0])
+                        if idx is not None:
+                            districts.setdefault(idx, set()).update(_name_keys(district))
+
+            plz_rows.sort()
+            self._plz = array("I", (p for p, _ in plz_rows))
+            self._plz_place = array("I", (i for _, i in plz_rows))
+            self._lat, self._lng, self._labels = lat, lng, labels
+            self._names = names
+            self._districts = districts
+            self._loaded = True
+
+    def __len__(self):
+        self._load()
+        return len(self._labels)
+
+    def _coords(self, idx: int):
+        return self._lat[idx], self._lng[idx]
+
+    def by_plz(self, plz: str):
+        """
+        PLZ exact; altfel cel mai apropiat PLZ cu aceleași 3 cifre
+        (zonele cu același prefix sunt vecine geografic).
+        """
+        self._load()
+        code = int(plz)
+        pos = bisect_left(self._plz, code)
+        if pos < len(self._plz) and self._plz[pos] == code:
+            return self._coords(self._plz_place[pos])
+
+        prefix = code // 100
+        candidates = [p for p in (pos - 1, pos) if 0 <= p < len(self._plz) and self._plz[p] // 100 == prefix]
+        if not candidates:
+            return None, None
+        best = min(candidates, key=lambda p: abs(self._plz[p] - code))
+        return self._coords(self._plz_place[best])
+
+    def _place(self, name: str) -> int | None:
+        for key in _name_keys(name):
+            idx = self._names.get(key)
+            if idx is not None:
+                return idx
+        return None
+
+    def same_place(self, name: str, other: str) -> bool:
+        """"Frankfurt am Main" / "Frankfurt" -> True; "Frankfurt (Oder)" / "Frankfurt" -> False (necunoscut)."""
+        self._load()
+        idx = self._place(name)
+        return idx is not None and idx == self._place(other)
+
+    def place_names(self, name: str) -> list[str]:
+        """"Frankfurt" / "Frankfurt am Main" -> ["Frankfurt am Main", "Frankfurt"]; loc necunoscut -> []."""
+        self._load()
+        idx = self._place(name)
+        if idx is None:
+            return []
+        label = self._labels[idx]
+        short = _SHORT_NAME_RE.sub("", label)
+        # numele scurt doar dacă nu e al altei localități ("Neustadt")
+        return [label, short] if short != label and self._place(short) == idx else [label]
+
+    def is_district(self, city: str, part: str) -> bool:
+        """"Berlin", "Charlottenburg" -> True; "Halle", "Saale" -> False."""
+        self._load()
+        idx = self._place(city)
+        return idx is not None and any(k in self._districts.get(idx, ()) for k in _name_keys(part))
+
+    def by_name(self, name: str, exact: bool = False):
+        """exact=False: "Berlin-Charlottenburg" cade pe "Berlin" (bun pentru centrul căutării, nu pentru orașe noi)."""
+        self._load()
+        name = (name or "").strip(" ,.;-")
+        if not name:
+            return None, None
+
+        # "Berlin-Charlottenburg", "Ottobrunn (München)", "Frankfurt, Hessen"
+        candidates = [name]
+        for sep in (" (", ",", "-", " – "):
+            if sep in name and not exact:
+                candidates.append(name.split(sep)[0])
+
+        for candidate in candidates:
+            for key in _name_keys(candidate):
+                idx = self._names.get(key)
+                if idx is not None:
+                    return self._coords(idx)
+        return None, None
+
+    def resolve(self, query: str, exact: bool = False):
+        """
+        "31655 Stadthagen" / "31655" / "München" -> (lat, lng) sau (None, None)
+        """
+        query = (query or "").strip()
+        if not query:
+            return None, None
+
+        m = _PLZ_RE.search(query)
+        if m:
+            lat, lng = self.by_plz(m.group(1))
+            if lat is not None:
+                return lat, lng
+            query = _PLZ_RE.sub(" ", query)
+
+        return self.by_name(re.sub(r"\s+", " ", query), exact=exact)
+
+
+gazetteer = Gazetteer()
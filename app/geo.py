@@ -0,0 +1,44 @@
+import math
+
+from .extensions import db
+from .models import City
+
+EARTH_RADIUS_KM = 6371.0
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp = p2 - p1
+    dl = math.radians(lng2 - lng1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def bounding_box(lat: float, lng: float, radius_km: float):
+    """
+    (min_lat, max_lat, min_lng, max_lng) care conține sigur cercul de rază radius_km.
+    """
+    dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    # lângă poli cos -> 0; Germania e departe, dar nu împărțim la 0
+    dlng = math.degrees(radius_km / (EARTH_RADIUS_KM * max(math.cos(math.radians(lat)), 0.01)))
+    return lat - dlat, lat + dlat, lng - dlng, lng + dlng
+
+
+def cities_within_radius(center_lat: float, center_lng: float, radius_km: float) -> list[int]:
+    """
+    ID-urile orașelor aflate la cel mult radius_km de centru.
+
+    1. bounding box pe City.lat/lng (ix_city_lat_lng) – doar câteva rânduri
+    2. distanța exactă (haversine) în Python pe supraviețuitori
+    Merge identic pe SQLite (fără funcții matematice) și Postgres.
+    """
+    min_lat, max_lat, min_lng, max_lng = bounding_box(center_lat, center_lng, radius_km)
+    rows = (
+        db.session.query(City.id, City.lat, City.lng)
+        .filter(City.lat.between(min_lat, max_lat))
+        .filter(City.lng.between(min_lng, max_lng))
+    )
+    return [
+        city_id for city_id, lat, lng in rows
+        if haversine_km(center_lat, center_lng, lat, lng) <= radius_km
+    ]
@@ -0,0 +1,199 @@
+import logging
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import IntegrityError
+
+from .extensions import db
+from .models import GeocodeCache
+
+log = logging.getLogger(__name__)
+
+_MISS = object()
+
+
+def normalize_query(query: str) -> str:
+    """
+    "  München ," -> "münchen"; "31655   Stadthagen" -> "31655 stadthagen"
+    """
+    text = unicodedata.normalize("NFC", query or "").lower()
+    text = re.sub(r"\s+", " ", text)
+    return text.strip(" ,.;")[:255]
+
+
+class _LRU:
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return _MISS
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return _MISS
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl: float | None = None):
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = (None, None)
+
+
+class Geocoder:
+    """
+    Nominatim cu 3 niveluri:
+    1. LRU în memorie (per proces)
+    2. tabela geocode_cache (comună tuturor workerilor)
+    3. request HTTP – un singur request pentru aceeași cheie, chiar dacă
+       mai multe thread-uri ratează cache-ul în același timp
+    """
+
+    def __init__(self):
+        self._lru = None
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.stats = {"memory": 0, "db": 0, "network": 0, "coalesced": 0}
+
+    def _memory(self) -> _LRU:
+        if self._lru is None:
+            self._lru = _LRU(current_app.config.get("GEOCODE_LRU_SIZE", 1024))
+        return self._lru
+
+    def clear_memory(self):
+        if self._lru is not None:
+            self._lru.clear()
+
+    def lookup(self, query: str):
+        key = normalize_query(query)
+        if not key:
+            return None, None
+
+        cached = self._memory().get(key)
+        if cached is not _MISS:
+            self.stats["memory"] += 1
+            return cached
+
+        with self._lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+
+        if not leader:
+            self.stats["coalesced"] += 1
+            flight.done.wait(current_app.config.get("GEOCODE_TIMEOUT", 5) + 1)
+            return flight.result
+
+        try:
+            flight.result = self._resolve(key)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.done.set()
+        return flight.result
+
+    def _resolve(self, key: str):
+        cfg = current_app.config
+        negative_ttl = cfg.get("GEOCODE_NEGATIVE_TTL", 86400)
+
+        row = self._db_get(key, negative_ttl)
+        if row is not _MISS:
+            self.stats["db"] += 1
+            self._remember(key, row, negative_ttl)
+            return row
+
+        self.stats["network"] += 1
+        try:
+            result = self._fetch(key)
+        except Exception:
+            # eroare de rețea / timeout: nu cache-uim, poate merge data viitoare
+            return None, None
+
+        self._db_put(key, result)
+        self._remember(key, result, negative_ttl)
+        return result
+
+    def _remember(self, key, result, negative_ttl):
+        self._memory().set(key, result, ttl=None if result[0] is not None else negative_ttl)
+
+    def _fetch(self, key: str):
+        import requests  # ~80 ms la import; doar workerii care chiar geocodează îl plătesc
+
+        cfg = current_app.config
+        r = requests.get(
+            cfg.get("NOMINATIM_URL", "https://nominatim.openstreetmap.org/search"),
+            params={"q": key, "format": "json", "limit": 1},
+            headers={"User-Agent": "servicii-ro-germania"},
+            timeout=cfg.get("GEOCODE_TIMEOUT", 5),
+        )
+        r.raise_for_status()
+        data = r.json()
+        if data:
+            return float(data[0]["lat"]), float(data[0]["lon"])
+        return None, None
+
+    def _db_get(self, key: str, negative_ttl: int):
+        table = GeocodeCache.__table__
+        try:
+            with db.engine.connect() as conn:
+                row = conn.execute(
+                    select(table.c.lat, table.c.lng, table.c.created_at)
+                    .where(table.c.query_key == key)
+                ).first()
+        except Exception as exc:
+            # tabelă lipsă / lock / statement_timeout: cache-ul e opțional, mergem la Nominatim
+            log.warning("geocode_cache: citire eșuată pentru %r (%s)", key, exc)
+            return _MISS
+        if row is None:
+            return _MISS
+        if row.lat is None or row.lng is None:
+            if row.created_at and row.created_at < datetime.utcnow() - timedelta(seconds=negative_ttl):
+                return _MISS
+            return None, None
+        return row.lat, row.lng
+
+    def _db_put(self, key: str, result):
+        # conexiune separată: nu atingem db.session-ul request-ului
+        table = GeocodeCache.__table__
+        try:
+            with db.engine.begin() as conn:
+                conn.execute(delete(table).where(table.c.query_key == key))
+                conn.execute(insert(table).values(
+                    query_key=key,
+                    lat=result[0],
+                    lng=result[1],
+                    created_at=datetime.utcnow(),
+                ))
+        except IntegrityError:
+            # alt worker a scris aceeași cheie între timp
+            pass
+        except Exception as exc:
+            log.warning("geocode_cache: scriere eșuată pentru %r (%s)", key, exc)
+
+
+geocoder = Geocoder()
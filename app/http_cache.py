@@ -0,0 +1,76 @@
+import hashlib
+from datetime import datetime, timezone
+
+from flask import current_app, request, make_response, Response
+from sqlalchemy import func, select
+
+from .cache import nav_cache
+from .extensions import db
+from .models import Listing
+
+
+def list_validators(query):
+    """
+    (max updated_at, count) pentru listările filtrate de `query` – un singur
+    agregat pe index, fără să încărcăm rândurile. count prinde ștergerile.
+    """
+    stmt = select(func.max(Listing.updated_at), func.count(Listing.id)).select_from(Listing)
+    if query.whereclause is not None:
+        stmt = stmt.where(query.whereclause)
+    return db.session.execute(stmt).one()
+
+
+def make_etag(*parts) -> str:
+    """
+    ETag din părțile care schimbă HTML-ul: ruta + query string, datele
+    din DB și meniurile (categorii/orașe din base.html).
+    """
+    raw = "|".join(str(p) for p in (
+        request.path,
+        request.query_string.decode("latin-1"),
+        nav_cache.fingerprint(),
+        *parts,
+    ))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]
+
+
+def _cache_control(resp: Response):
+    cfg = current_app.config
+    resp.cache_control.public = True
+    resp.cache_control.max_age = cfg.get("HTTP_CACHE_MAX_AGE", 60)
+    swr = cfg.get("HTTP_CACHE_STALE_WHILE_REVALIDATE", 600)
+    if swr:
+        # werkzeug nu are atribut dedicat pentru stale-while-revalidate
+        resp.headers["Cache-Control"] += f", stale-while-revalidate={swr}"
+    return resp
+
+
+def _set_validators(resp: Response, etag: str, last_modified: datetime | None):
+    resp.set_etag(etag, weak=True)
+    if last_modified is not None:
+        resp.last_modified = last_modified.replace(microsecond=0, tzinfo=timezone.utc)
+    return _cache_control(resp)
+
+
+def not_modified(etag: str, last_modified: datetime | None) -> Response | None:
+    """
+    Răspuns 304 dacă validatorii clientului se potrivesc – apelat ÎNAINTE de
+    render_template. If-None-Match are prioritate față de If-Modified-Since.
+    """
+    if request.method not in ("GET", "HEAD"):
+        return None
+
+    if request.if_none_match:
+        matched = request.if_none_match.contains_weak(etag)
+    elif request.if_modified_since and last_modified is not None:
+        matched = last_modified.replace(microsecond=0, tzinfo=timezone.utc) <= request.if_modified_since
+    else:
+        matched = False
+
+    if not matched:
+        return None
+    return _set_validators(Response(status=304), etag, last_modified)
+
+
+def cacheable(body, etag: str, last_modified: datetime | None) -> Response:
+    return _set_validators(make_response(body), etag, last_modified)
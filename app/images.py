@@ -0,0 +1,297 @@
+"""
+Upload imagini listări în fundal.
+
+Formularul admin salvează imediat: fișierul se scrie în spool (instance/),
+listarea primește image_status="PENDING" + un token, iar un thread pool
+limitat urcă fișierul (cu reîncercări) și completează Listing.image_url.
+Tokenul împiedică un upload vechi, terminat mai târziu, să suprascrie
+o imagine mai nouă.
+
+Un worker gunicorn reciclat (max_requests), omorât sau ajuns la timeout
+lasă listări PENDING: `resume()` (la pornirea pipeline-ului și prin
+`flask images-upload --resume`) le re-programează dacă fișierul din spool
+mai există, altfel le marchează FAILED. Fișierul din spool se numește după
+token (<token>.<ext>), deci se găsește fără o coloană în plus.
+"""
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import select, update
+
+from .extensions import db
+from .models import Listing
+
+log = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp", ".gif")
+
+
+# --------------------
+# UPLOADERE
+# --------------------
+def configure_cloudinary(config):
+    import cloudinary
+
+    if config.get("CLOUDINARY_URL"):
+        cloudinary.config(cloudinary_url=config["CLOUDINARY_URL"])
+    elif config.get("CLOUDINARY_CLOUD_NAME") and config.get("CLOUDINARY_API_KEY") and config.get("CLOUDINARY_API_SECRET"):
+        cloudinary.config(
+            cloud_name=config["CLOUDINARY_CLOUD_NAME"],
+            api_key=config["CLOUDINARY_API_KEY"],
+            api_secret=config["CLOUDINARY_API_SECRET"],
+            secure=True
+        )
+
+
+class CloudinaryUploader:
+    folder = "romani-servicii-de"
+    transformation = [
+        {"width": 600, "height": 600, "crop": "limit"},
+        {"quality": "auto", "fetch_format": "auto"},
+    ]
+
+    def upload(self, path: str) -> str:
+        import cloudinary.uploader
+
+        result = cloudinary.uploader.upload(
+            path,
+            folder=self.folder,
+            resource_type="image",
+            transformation=self.transformation,
+        )
+        return result["secure_url"]
+
+
+class LocalUploader:
+    """Înlocuitor local (dev / teste): copiază în static/uploads, fără rețea."""
+
+    def __init__(self, directory: str, url_prefix: str = "/static/uploads"):
+        self.directory = directory
+        self.url_prefix = url_prefix.rstrip("/")
+
+    def upload(self, path: str) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        name = f"{uuid.uuid4().hex}{os.path.splitext(path)[1].lower()}"
+        shutil.copyfile(path, os.path.join(self.directory, name))
+        return f"{self.url_prefix}/{name}"
+
+
+def make_uploader(config):
+    if config.get("IMAGE_UPLOADER") == "local":
+        return LocalUploader(config["IMAGE_LOCAL_DIR"])
+    # o singură dată per proces, la primul upload (nu la fiecare request)
+    configure_cloudinary(config)
+    return CloudinaryUploader()
+
+
+# --------------------
+# PIPELINE
+# --------------------
+class ImagePipeline:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._slots = None
+        self.uploader = None
+
+    def _ensure(self, app):
+        with self._lock:
+            started = self._executor is None
+            if started:
+                workers = app.config.get("IMAGE_UPLOAD_WORKERS", 4)
+                self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="image-upload")
+                # coadă limitată: cel mult 4 fișiere în așteptare per thread
+                self._slots = threading.BoundedSemaphore(workers * 4)
+            if self.uploader is None:
+                self.uploader = make_uploader(app.config)
+        if started and app.config.get("IMAGE_RESUME_ON_START", True):
+            # thread separat: resume() ocupă sloturi din coadă, nu un worker din pool
+            threading.Thread(target=self._resume_logged, args=(app,), name="image-resume", daemon=True).start()
+
+    def submit(self, listing_id: int, token: str, path: str, remove_after: bool = True):
+        """Programează upload-ul; token-ul trebuie deja salvat (commit) pe listare."""
+        return self._submit(current_app._get_current_object(), listing_id, token, path, remove_after)
+
+    def _submit(self, app, listing_id: int, token: str, path: str, remove_after: bool = True):
+        self._ensure(app)
+        self._slots.acquire()
+        future = self._executor.submit(self._run, app, listing_id, token, path, remove_after)
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def _upload_with_retries(self, app, path: str) -> str:
+        retries = app.config.get("IMAGE_UPLOAD_RETRIES", 3)
+        delay = app.config.get("IMAGE_UPLOAD_RETRY_DELAY", 1.0)
+        for attempt in range(retries + 1):
+            try:
+                return self.uploader.upload(path)
+            except Exception as exc:  # noqa: BLE001 – SDK-ul aruncă tipuri diverse
+                if attempt == retries:
+                    raise
+                log.warning("upload %s: încercarea %s a eșuat (%s)", path, attempt + 1, exc)
+                time.sleep(delay * (2 ** attempt))
+
+    def _run(self, app, listing_id: int, token: str, path: str, remove_after: bool) -> str:
+        url, status = None, None
+        try:
+            url = self._upload_with_retries(app, path)
+        except Exception:  # noqa: BLE001
+            log.exception("upload imagine listare %s eșuat", listing_id)
+            status = "FAILED"
+
+        try:
+            with app.app_context():
+                item = db.session.get(Listing, listing_id, with_for_update=True)
+                # altă imagine a fost încărcată între timp -> rezultatul ăsta e vechi
+                if item is None or item.image_token != token:
+                    db.session.rollback()
+                    return "stale"
+                if url:
+                    item.image_url = url
+                item.image_status = status
+                item.image_token = None
+                db.session.commit()  # evenimentele ORM invalidează cache-urile de pagini
+                return "ok" if url else "failed"
+        finally:
+            if remove_after:
+                _remove(path)
+
+    def resume(self, app, older_than: float | None = None) -> dict:
+        """
+        Listările PENDING mai vechi de IMAGE_PENDING_TIMEOUT secunde:
+        fișier în spool -> re-programat, altfel FAILED. Fișierele din spool
+        fără listare PENDING (la fel de vechi) sunt șterse.
+        """
+        if older_than is None:
+            older_than = app.config.get("IMAGE_PENDING_TIMEOUT", 900)
+        cutoff = datetime.utcnow() - timedelta(seconds=older_than)
+        spool = app.config["IMAGE_SPOOL_DIR"]
+        files = {}
+        if os.path.isdir(spool):
+            files = {os.path.splitext(name)[0]: os.path.join(spool, name) for name in os.listdir(spool)}
+
+        counts = {"requeued": 0, "failed": 0, "orphans": 0}
+        queued = []
+        with app.app_context():
+            rows = db.session.execute(
+                select(Listing.id, Listing.image_token)
+                .where(Listing.image_status == "PENDING", Listing.updated_at < cutoff)
+            ).all()
+            for listing_id, token in rows:
+                path = files.pop(token, None) if token else None
+                new_token, new_path = None, None
+                if path:
+                    # revendicare: rename-ul e atomic, alt worker care face resume în paralel ratează
+                    new_token = uuid.uuid4().hex
+                    new_path = os.path.join(spool, new_token + os.path.splitext(path)[1])
+                    try:
+                        os.rename(path, new_path)
+                    except OSError:
+                        continue
+                values = {"image_token": new_token, "updated_at": Listing.updated_at}  # fără onupdate
+                if new_token is None:
+                    values["image_status"] = "FAILED"
+                claimed = db.session.execute(
+                    update(Listing)
+                    .where(Listing.id == listing_id, Listing.image_token == token, Listing.image_status == "PENDING")
+                    .values(**values)
+                ).rowcount
+                db.session.commit()
+                if not claimed:
+                    # între timp a venit o imagine nouă / upload-ul s-a terminat
+                    if new_path:
+                        _remove(new_path)
+                    continue
+                if new_path:
+                    queued.append((listing_id, new_token, new_path))
+                    counts["requeued"] += 1
+                else:
+                    counts["failed"] += 1
+                    log.warning("upload imagine listare %s: rămas PENDING fără fișier în spool -> FAILED", listing_id)
+
+            pending = {t for (t,) in db.session.execute(
+                select(Listing.image_token).where(Listing.image_status == "PENDING", Listing.image_token.is_not(None))
+            )}
+            db.session.rollback()
+
+        for stem, path in files.items():
+            try:
+                old = os.path.getmtime(path) < time.time() - older_than
+            except OSError:
+                continue
+            if old and stem not in pending:
+                _remove(path)
+                counts["orphans"] += 1
+
+        for listing_id, token, path in queued:
+            self._submit(app, listing_id, token, path)
+        return counts
+
+    def _resume_logged(self, app):
+        try:
+            counts = self.resume(app)
+        except Exception:  # noqa: BLE001 – nu oprim pipeline-ul
+            log.exception("resume upload-uri imagini eșuat")
+            return
+        if any(counts.values()):
+            log.warning("resume upload-uri imagini: %s", counts)
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
+
+
+image_pipeline = ImagePipeline()
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+# --------------------
+# HELPERS PENTRU RUTE / CLI
+# --------------------
+def spool_upload(file_storage) -> str | None:
+    """Salvează fișierul din formular pe disc (request-ul se termină înainte de upload)."""
+    if not file_storage or not file_storage.filename:
+        return None
+    spool = current_app.config["IMAGE_SPOOL_DIR"]
+    os.makedirs(spool, exist_ok=True)
+    ext = os.path.splitext(file_storage.filename)[1].lower()
+    # numele (fără extensie) devine token-ul listării – vezi mark_pending / resume
+    path = os.path.join(spool, f"{uuid.uuid4().hex}{ext if ext in IMAGE_EXTENSIONS else ''}")
+    file_storage.save(path)
+    return path
+
+
+def mark_pending(item: Listing, spool_path: str | None = None) -> str:
+    """
+    Setează starea PENDING + un token nou; commit-ul îl face apelantul.
+    Pentru fișierele din spool token-ul e numele fișierului (resume() îl regăsește).
+    """
+    token = os.path.splitext(os.path.basename(spool_path))[0] if spool_path else uuid.uuid4().hex
+    item.image_status = "PENDING"
+    item.image_token = token
+    return token
+
+
+def directory_images(directory: str) -> dict[str, str]:
+    """{slug: cale} pentru fișierele <slug>.<ext> dintr-un director."""
+    found = {}
+    for name in sorted(os.listdir(directory)):
+        slug, ext = os.path.splitext(name)
+        if ext.lower() in IMAGE_EXTENSIONS:
+            found[slug] = os.path.join(directory, name)
+    return found
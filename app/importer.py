@@ -0,0 +1,279 @@
+"""
+Import în masă din full_directory.csv (înlocuiește scripturile Node/Supabase).
+
+- CSV-ul e citit în flux, în loturi de `batch` rânduri
+- telefoanele -> utils.phone_key; cheia de deduplicare e phone_key, altfel
+  (nume, oraș) – un rând existent își păstrează slug-ul
+- categorii din hartă în memorie (o interogare), orașe prin cities.city_resolver
+  (cheie normalizată + alias-uri); orașele noi doar dacă gazetteer-ul le cunoaște
+- INSERT ... ON CONFLICT (slug) DO UPDATE pe lot; rândurile neschimbate nu
+  se mai scriu, deci un re-import e ieftin
+- indexul full-text e actualizat pentru id-urile atinse (Core nu declanșează
+  evenimentele ORM)
+"""
+import csv
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from .cities import city_key, city_parts, city_resolver, clean_city_name, variant_keys
+from .extensions import db
+from .gazetteer import gazetteer
+from .models import Category, City, Listing
+from .search import _document, _document_rows, get_backend
+from .slugs import SlugAllocator, base_slug
+from .utils import phone_key, slugify, website_domain
+
+# categoriile din CSV (specialități) -> categoriile site-ului
+CATEGORY_MAP = {
+    "stomatologie": "Dentiști",
+    "avocat": "Avocați",
+    "traduceri ro-de": "Traducători",
+    "contabil": "Contabili",
+    "constructii": "Constructori",
+    "salon de frizerie/coafor": "Frizerii",
+}
+MEDICAL = (
+    "medicina", "dermatologie", "oftalmologie", "ginecologie", "psihiatrie",
+    "neurologie", "urologie", "radiologie", "radioterapie", "o.r.l", "chirurgie",
+    "cardiologie", "pediatrie", "ortopedie",
+)
+DEFAULT_CATEGORY = "Altele"
+
+# coloanele comparate / scrise la upsert
+FIELDS = ("name", "category_id", "city_id", "address", "phone", "phone_key", "website", "website_domain", "verified")
+
+
+def _key(text_: str) -> str:
+    text_ = unicodedata.normalize("NFKD", (text_ or "").lower().replace("ß", "ss"))
+    text_ = "".join(c for c in text_ if not unicodedata.combining(c))
+    return re.sub(r"\s+", " ", text_).strip(" ,.;-")
+
+
+def category_name_for(raw: str) -> str:
+    key = _key(raw)
+    if key in CATEGORY_MAP:
+        return CATEGORY_MAP[key]
+    if any(key.startswith(m) for m in MEDICAL):
+        return "Medici"
+    if key.startswith("restaurant"):
+        return "Restaurante"
+    return DEFAULT_CATEGORY
+
+
+@dataclass
+class ImportReport:
+    rows: int = 0
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    duplicates: int = 0
+    skipped: list = field(default_factory=list)  # (linie, motiv)
+    diff: list = field(default_factory=list)     # linii pentru --dry-run
+    created_categories: list = field(default_factory=list)
+    created_cities: list = field(default_factory=list)
+
+
+class DirectoryImporter:
+    def __init__(self, dry_run: bool = False, batch: int = 2000):
+        self.dry_run = dry_run
+        self.batch = batch
+        self.report = ImportReport()
+
+        self.categories = {_key(name): cid for cid, name in db.session.execute(select(Category.id, Category.name))}
+        self.cities = {}      # textul din CSV -> city_id (inclusiv None), ca fiecare variantă să fie rezolvată o dată
+        self.new_cities = {}  # city_key -> id pentru orașele create de acest import (în dry-run id-uri provizorii)
+        self._next_fake_id = -1  # id-uri provizorii pentru categorii / orașe noi în dry-run
+
+        # listările existente: o singură interogare, doar coloanele necesare
+        self.existing = {}
+        self.by_phone = {}
+        self.by_name_city = {}
+        stmt = select(Listing.id, Listing.slug, *[getattr(Listing, f) for f in FIELDS])
+        for row in db.session.execute(stmt):
+            values = dict(row._mapping)
+            self.existing[values["slug"]] = values
+            if values["phone_key"]:
+                self.by_phone[values["phone_key"]] = values["slug"]
+            self.by_name_city[(_key(values["name"]), values["city_id"])] = values["slug"]
+
+        self.slugs = SlugAllocator(self.existing)
+        self.seen = set()
+
+    # --------------------
+    # categorii / orașe
+    # --------------------
+    def _category_id(self, raw: str) -> int:
+        name = category_name_for(raw)
+        key = _key(name)
+        if key not in self.categories:
+            self.categories[key] = self._create(Category(name=name, slug=slugify(name)))
+            self.report.created_categories.append(name)
+        return self.categories[key]
+
+    def _city_id(self, raw: str, plz: str) -> int | None:
+        if raw not in self.cities:
+            self.cities[raw] = self._resolve_city(raw, plz)
+        return self.cities[raw]
+
+    def _resolve_city(self, raw: str, plz: str) -> int | None:
+        # "60311, Frankfurt" -> "Frankfurt"; "Berlin-Charlottenburg" / "Stuttgart Wangen" ->
+        # orașul din prefix doar dacă restul e cartier cunoscut (cities.city_parts);
+        # "Frankfurt (Oder)" rămâne oraș separat
+        name = clean_city_name(raw)
+        parts = city_parts(raw, plz=plz)
+        names = [name] + parts + [other for n in [name] + parts for other in gazetteer.place_names(n)]
+        for key in (k for n in names for k in variant_keys(n)):
+            if key in self.new_cities:
+                return self.new_cities[key]
+        # în dry-run nu scriem alias-uri
+        city_id = city_resolver.lookup(raw, learn=not self.dry_run, plz=plz)
+        if city_id is not None:
+            return city_id
+
+        # oraș nou doar cu nume plauzibil (nu stradă / "remote") și coordonate din
+        # gazetteer: după numele exact, altfel după PLZ
+        if not name or re.search(r"\d", name):
+            return None
+        candidate = parts[0] if parts else name
+        lat, lng = gazetteer.by_name(candidate, exact=True)
+        if lat is None:
+            lat, lng = gazetteer.by_plz(plz) if plz.isdigit() else (None, None)
+            if lat is None:
+                return None
+        city_id = self._create(City(name=candidate, slug=slugify(candidate), lat=lat, lng=lng))
+        self.new_cities[city_key(candidate)] = self.new_cities[city_key(name)] = city_id
+        if not self.dry_run:
+            # varianta ("Berlin-Charlottenburg") doar în harta procesului, nu alias în DB
+            city_resolver.remember(city_key(candidate), city_id)
+            city_resolver.remember(city_key(name), city_id)
+        self.report.created_cities.append(candidate)
+        return city_id
+
+    def _create(self, obj) -> int:
+        if self.dry_run:
+            self._next_fake_id -= 1
+            return self._next_fake_id
+        db.session.add(obj)
+        db.session.flush()
+        return obj.id
+
+    # --------------------
+    # rânduri
+    # --------------------
+    def _values(self, lineno: int, row: dict) -> dict | None:
+        name = (row.get("Name") or "").strip()
+        if not name:
+            self.report.skipped.append((lineno, "fără nume"))
+            return None
+        city_id = self._city_id(row.get("City", ""), (row.get("PLZ") or "").strip())
+        if city_id is None:
+            self.report.skipped.append((lineno, f"oraș necunoscut: {row.get('City')!r}"))
+            return None
+
+        phone = (row.get("Phone") or "").strip() or None
+        website = (row.get("Website") or "").strip() or None
+        address = ", ".join(p for p in ((row.get("Address") or "").strip(), (row.get("PLZ") or "").strip()) if p)
+        return {
+            "name": name,
+            "category_id": self._category_id(row.get("Category", "")),
+            "city_id": city_id,
+            "address": address or None,
+            "phone": phone,
+            "phone_key": phone_key(phone),
+            "website": website,
+            "website_domain": website_domain(website),
+            "verified": (row.get("Verified") or "").strip() in ("1", "1.0", "true", "da"),
+        }
+
+    def _match(self, values: dict) -> str | None:
+        if values["phone_key"] and values["phone_key"] in self.by_phone:
+            return self.by_phone[values["phone_key"]]
+        return self.by_name_city.get((_key(values["name"]), values["city_id"]))
+
+    def _remember(self, values: dict, slug: str):
+        if values["phone_key"]:
+            self.by_phone[values["phone_key"]] = slug
+        self.by_name_city[(_key(values["name"]), values["city_id"])] = slug
+
+    def _plan(self, lineno: int, row: dict):
+        values = self._values(lineno, row)
+        if values is None:
+            return None
+
+        slug = self._match(values)
+        if slug in self.seen:
+            self.report.duplicates += 1
+            self.report.skipped.append((lineno, f"duplicat în fișier ({slug})"))
+            return None
+
+        old = self.existing.get(slug) if slug else None
+        if old is not None:
+            # verificat rămâne verificat (CSV-ul gol nu anulează munca din admin)
+            values["verified"] = values["verified"] or bool(old["verified"])
+            changed = {f: (old[f], values[f]) for f in FIELDS if old[f] != values[f]}
+            self.seen.add(slug)
+            # telefonul / numele nou aparțin de acum acestei listări: un rând ulterior cu
+            # același telefon e duplicat, nu o listare nouă (phone_key e UNIQUE)
+            self._remember(values, slug)
+            if not changed:
+                self.report.unchanged += 1
+                return None
+            self.report.updated += 1
+            if self.dry_run:
+                self.report.diff.append(f"~ {slug}: " + ", ".join(f"{f}: {a!r} -> {b!r}" for f, (a, b) in changed.items()))
+            values["slug"] = slug
+            return values
+
+        values["slug"] = slug = self.slugs.allocate(base_slug(values["name"]))
+        self.seen.add(slug)
+        self._remember(values, slug)
+        self.report.inserted += 1
+        if self.dry_run:
+            self.report.diff.append(f"+ {slug}: {values['name']} ({values['address'] or '-'})")
+        return values
+
+    # --------------------
+    # scriere
+    # --------------------
+    def _upsert(self, rows: list[dict]):
+        if self.dry_run or not rows:
+            return
+        now = datetime.utcnow()
+        for r in rows:
+            r["updated_at"] = now
+            r.setdefault("created_at", now)
+
+        dialect = db.engine.dialect.name
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = insert(Listing.__table__)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Listing.__table__.c.slug],
+            set_={f: stmt.excluded[f] for f in (*FIELDS, "updated_at")},
+        ).returning(Listing.__table__.c.id)
+
+        conn = db.session.connection()
+        # executemany + RETURNING: SQLAlchemy le grupează în INSERT-uri multi-VALUES
+        ids = [row.id for row in conn.execute(stmt, rows)]
+
+        backend = get_backend(conn)
+        for doc in _document_rows(conn, Listing.id.in_(ids)):
+            backend.upsert(conn, doc.id, _document(doc))
+
+    def run(self, lines):
+        reader = csv.DictReader(lines)
+        pending = []
+        for lineno, row in enumerate(reader, start=2):
+            self.report.rows += 1
+            values = self._plan(lineno, row)
+            if values is not None:
+                pending.append(values)
+            if len(pending) >= self.batch:
+                self._upsert(pending)
+                pending = []
+        self._upsert(pending)
+        return self.report
@@ -0,0 +1,36 @@
+from sqlalchemy.orm import defer, joinedload
+
+from .extensions import db
+from .models import Category, City, Listing
+
+# Profiluri de încărcare pentru Listing: fiecare pagină ia categoria/orașul
+# în același SELECT (JOIN), nu câte un SELECT lazy pentru fiecare card.
+LOAD_PROFILES = {
+    # carduri în liste publice (home, category, city, seo_landing)
+    "card": (
+        defer(Listing.description),
+        joinedload(Listing.category).load_only(Category.name, Category.slug),
+        joinedload(Listing.city).load_only(City.name, City.slug),
+    ),
+    # pagina unei firme / formularul de editare
+    "detail": (
+        joinedload(Listing.category),
+        joinedload(Listing.city),
+    ),
+}
+
+
+def with_profile(query, profile: str):
+    return query.options(*LOAD_PROFILES[profile])
+
+
+def admin_rows():
+    """
+    Rândurile din admin/listings: proiecție pe coloanele afișate (tupluri, nu
+    obiecte Listing), cu numele categoriei / orașului din același SELECT.
+    """
+    return db.session.query(
+        Listing.id, Listing.name, Listing.slug, Listing.featured, Listing.verified,
+        Listing.image_url, Listing.image_status, Listing.updated_at,
+        Category.name.label("category_name"), City.name.label("city_name"),
+    ).join(Category, Listing.category_id == Category.id).join(City, Listing.city_id == City.id)
@@ -0,0 +1,201 @@
+import logging
+import random
+import smtplib
+import time
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+
+from flask import current_app
+
+from .extensions import db
+from .models import EmailOutbox
+
+log = logging.getLogger(__name__)
+
+# coduri SMTP 5xx = respins definitiv (adresă invalidă etc.) -> nu mai reîncercăm
+PERMANENT_ERRORS = (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused)
+
+
+# --------------------
+# OUTBOX (în request: doar un INSERT)
+# --------------------
+def queue_email(subject: str, body: str, to_addr: str | None = None, reply_to: str | None = None) -> EmailOutbox:
+    """Adaugă mesajul în outbox; commit-ul îl face apelantul."""
+    item = EmailOutbox(
+        to_addr=to_addr or current_app.config["MAIL_TO"],
+        reply_to=reply_to,
+        subject=subject,
+        body=body,
+    )
+    db.session.add(item)
+    return item
+
+
+def queue_contact_email(name: str, sender_email: str, message: str) -> EmailOutbox:
+    body = f"""
+Nume: {name}
+Email: {sender_email}
+
+Mesaj:
+{message}
+"""
+    return queue_email("Mesaj nou – Contact Servicii RO", body, reply_to=sender_email)
+
+
+# --------------------
+# SMTP: o singură conexiune autentificată, refolosită
+# --------------------
+class SmtpSender:
+    def __init__(self, host, port, username=None, password=None, use_ssl=True, use_tls=False, timeout=10.0):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_ssl = use_ssl
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self._smtp = None
+        self.connects = 0
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            config["MAIL_SERVER"],
+            config["MAIL_PORT"],
+            config["MAIL_USERNAME"] or None,
+            config["MAIL_PASSWORD"] or None,
+            use_ssl=config["MAIL_USE_SSL"],
+            use_tls=config["MAIL_USE_TLS"],
+            timeout=config["MAIL_TIMEOUT"],
+        )
+
+    def _connect(self):
+        smtp_cls = smtplib.SMTP_SSL if self.use_ssl else smtplib.SMTP
+        smtp = smtp_cls(self.host, self.port, timeout=self.timeout)
+        if self.use_tls and not self.use_ssl:
+            smtp.starttls()
+        if self.username:
+            smtp.login(self.username, self.password or "")
+        self.connects += 1
+        return smtp
+
+    def send(self, msg: EmailMessage):
+        if self._smtp is None:
+            self._smtp = self._connect()
+        try:
+            self._smtp.send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            # serverul a închis conexiunea inactivă – o refacem o singură dată
+            self._smtp = self._connect()
+            self._smtp.send_message(msg)
+
+    def close(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except smtplib.SMTPException:
+                pass
+            except OSError:
+                pass
+            self._smtp = None
+
+
+def _message(item: EmailOutbox, sender: str) -> EmailMessage:
+    msg = EmailMessage()
+    msg["Subject"] = item.subject
+    msg["From"] = sender
+    msg["To"] = item.to_addr
+    if item.reply_to:
+        msg["Reply-To"] = item.reply_to
+    msg["Message-ID"] = f"<outbox-{item.id}@servicii-ro>"  # aceeași valoare la reîncercări
+    msg.set_content(item.body)
+    return msg
+
+
+def backoff_seconds(attempts: int, base: float, cap: float) -> float:
+    """base * 2^(attempts-1), plafonat, cu jitter ±20% ca să nu reîncercăm toate odată."""
+    delay = min(cap, base * (2 ** max(attempts - 1, 0)))
+    return delay * random.uniform(0.8, 1.2)
+
+
+# --------------------
+# WORKER
+# --------------------
+def claim_due(batch: int, lease_seconds: float = 300):
+    """
+    Ia un lot de mesaje scadente și le mută next_attempt_at în viitor (lease),
+    cu commit: alt worker nu le mai vede, iar după un crash reapar singure.
+    """
+    now = datetime.utcnow()
+    items = (
+        EmailOutbox.query
+        .filter(EmailOutbox.status == "PENDING", EmailOutbox.next_attempt_at <= now)
+        .order_by(EmailOutbox.next_attempt_at, EmailOutbox.id)
+        .limit(batch)
+        .with_for_update(skip_locked=True)  # Postgres; SQLite ignoră
+        .all()
+    )
+    for item in items:
+        item.next_attempt_at = now + timedelta(seconds=lease_seconds)
+    db.session.commit()
+    return items
+
+
+def drain_outbox(smtp: SmtpSender, batch: int = 50) -> dict:
+    """Trimite un lot de mesaje scadente; întoarce {'sent', 'retry', 'failed'}."""
+    cfg = current_app.config
+    counts = {"sent": 0, "retry": 0, "failed": 0}
+
+    for item in claim_due(batch):
+        try:
+            smtp.send(_message(item, cfg["MAIL_FROM"]))
+        except Exception as exc:  # noqa: BLE001 – orice eroare SMTP / rețea
+            smtp.close()  # conexiunea poate fi într-o stare necunoscută
+            item.attempts += 1
+            item.last_error = f"{type(exc).__name__}: {exc}"[:500]
+            if isinstance(exc, PERMANENT_ERRORS) or item.attempts >= cfg["MAIL_MAX_ATTEMPTS"]:
+                item.status = "FAILED"
+                counts["failed"] += 1
+                log.error("outbox %s: eșuat definitiv (%s)", item.id, item.last_error)
+            else:
+                delay = backoff_seconds(item.attempts, cfg["MAIL_RETRY_BASE"], cfg["MAIL_RETRY_MAX"])
+                item.next_attempt_at = datetime.utcnow() + timedelta(seconds=delay)
+                counts["retry"] += 1
+                log.warning("outbox %s: reîncercare în %.0fs (%s)", item.id, delay, item.last_error)
+        else:
+            item.status = "SENT"
+            item.sent_at = datetime.utcnow()
+            item.last_error = None
+            counts["sent"] += 1
+        # commit per mesaj: un crash nu retrimite ce a plecat deja
+        db.session.commit()
+
+    return counts
+
+
+def run_worker(batch: int = 50, interval: float = 5.0, once: bool = False, idle_close: float = 60.0, echo=print):
+    """
+    Golește outbox-ul în loturi pe aceeași conexiune SMTP. `once`: se oprește
+    când nu mai sunt mesaje scadente (cron / teste).
+    """
+    smtp = SmtpSender.from_config(current_app.config)
+    total = {"sent": 0, "retry": 0, "failed": 0}
+    idle_since = time.monotonic()
+    try:
+        while True:
+            counts = drain_outbox(smtp, batch)
+            processed = sum(counts.values())
+            for key in total:
+                total[key] += counts[key]
+            if processed:
+                idle_since = time.monotonic()
+                echo(f"📨 trimise {counts['sent']}, reîncercări {counts['retry']}, eșuate {counts['failed']}")
+            if processed < batch:
+                if once:
+                    return total
+                # nimic de trimis de ceva vreme: nu ținem conexiunea deschisă degeaba
+                if time.monotonic() - idle_since >= idle_close:
+                    smtp.close()
+                time.sleep(interval)
+    finally:
+        smtp.close()
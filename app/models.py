@@ -1,20 +1,45 @@
 from datetime import datetime
+from sqlalchemy.orm import validates
 from .extensions import db
+from .utils import phone_key, website_domain
 
 class Category(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(120), nullable=False, unique=True)
     slug = db.Column(db.String(140), nullable=False, unique=True)
+    # pagină nouă în sitemap (categorie / categorie × oraș) -> <lastmod> nou
+    created_at = db.Column(db.DateTime, nullable=True, default=datetime.utcnow)
 
 class City(db.Model):
+    __table_args__ = (
+        # bounding box pentru căutarea pe rază (geo.cities_within_radius)
+        db.Index("ix_city_lat_lng", "lat", "lng"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(120), nullable=False)
     slug = db.Column(db.String(140), nullable=False, unique=True)
+    # numele normalizat (app/cities.py::city_key) – căutarea orașelor merge pe el, nu pe lower(name)
+    name_key = db.Column(db.String(140), nullable=True, unique=True, index=True)
     state = db.Column(db.String(120), nullable=True)
 
     # for radius search (center of city)
     lat = db.Column(db.Float, nullable=True)
     lng = db.Column(db.Float, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=True, default=datetime.utcnow)
+
+    @validates("name")
+    def _sync_name_key(self, key, value):
+        from .cities import city_key
+        self.name_key = city_key(value)
+        return value
+
+class CityAlias(db.Model):
+    # variante de nume deja întâlnite ("Berlin.", "60311, Frankfurt") -> orașul canonic
+    id = db.Column(db.Integer, primary_key=True)
+    alias_key = db.Column(db.String(140), nullable=False, unique=True, index=True)
+    city_id = db.Column(db.Integer, db.ForeignKey("city.id", ondelete="CASCADE"), nullable=False, index=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
 class Listing(db.Model):
     # id = db.Column(db.Integer, primary_key=True)
@@ -65,19 +90,57 @@ class Listing(db.Model):
     whatsapp_key = db.Column(db.String(30), nullable=True, unique=True, index=True)
 
     website = db.Column(db.String(255), nullable=True)
+    # domeniul din website (utils.website_domain) – duplicate prin egalitate, nu LIKE '%domeniu%'
+    website_domain = db.Column(db.String(255), nullable=True, index=True)
 
     languages = db.Column(db.String(50), nullable=True)  # "ro,de,en"
-    verified = db.Column(db.Boolean, default=False)
-    featured = db.Column(db.Boolean, default=False)
+    # NOT NULL: fac parte din cheia de paginare (featured, verified, updated_at, id)
+    verified = db.Column(db.Boolean, nullable=False, default=False, server_default=db.false())
+    featured = db.Column(db.Boolean, nullable=False, default=False, server_default=db.false())
 
     image_url = db.Column(db.String(500), nullable=True)  # Cloudinary URL
+    # upload în fundal (app/images.py): NULL | PENDING | FAILED; tokenul identifică ultimul upload
+    image_status = db.Column(db.String(20), nullable=True)
+    image_token = db.Column(db.String(32), nullable=True)
 
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     category = db.relationship("Category")
     city = db.relationship("City")
 
+    @validates("phone", "whatsapp")
+    def _sync_phone_key(self, key, value):
+        # cheile de dedup / căutare în admin urmează numărul afișat
+        # (importul în masă le scrie direct, prin Core)
+        setattr(self, f"{key}_key", phone_key(value))
+        return value
+
+    @validates("website")
+    def _sync_website_domain(self, key, value):
+        self.website_domain = website_domain(value)
+        return value
+
+    __table_args__ = (
+        # paginare keyset (app/pagination.py) pe category_page / city_page / admin
+        db.Index("ix_listing_category_order", "category_id", "featured", "verified", "updated_at", "id"),
+        db.Index("ix_listing_city_order", "city_id", "featured", "verified", "updated_at", "id"),
+        # /servicii/<categorie>/<oraș>, /category/x?city=y, /city/y?category=x
+        db.Index("ix_listing_category_city_order", "category_id", "city_id", "featured", "verified", "updated_at", "id"),
+        # home fără filtre (featured DESC, verified DESC, updated_at DESC) LIMIT 30
+        db.Index("ix_listing_public_order", "featured", "verified", "updated_at", "id"),
+        # home: bara „recomandate” (featured = true ORDER BY updated_at DESC LIMIT 8);
+        # parțial – conține doar listările featured
+        db.Index(
+            "ix_listing_featured_updated", "featured", "updated_at", "id",
+            postgresql_where=db.text("featured"), sqlite_where=db.text("featured = 1"),
+        ),
+        db.Index("ix_listing_updated_order", "updated_at", "id"),
+        # admin/listings filtrat pe categorie / oraș, ordonat (updated_at, id)
+        db.Index("ix_listing_category_updated", "category_id", "updated_at", "id"),
+        db.Index("ix_listing_city_updated", "city_id", "updated_at", "id"),
+    )
+
 class Submission(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     business_name = db.Column(db.String(200), nullable=False)
@@ -95,3 +158,40 @@ class Submission(db.Model):
 
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class GeocodeCache(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+
+    # textul normalizat (lowercase, spații comprimate) – vezi geocode.normalize_query
+    query_key = db.Column(db.String(255), nullable=False, unique=True, index=True)
+
+    # NULL/NULL = rezultat negativ (Nominatim nu a găsit nimic), expiră după GEOCODE_NEGATIVE_TTL
+    lat = db.Column(db.Float, nullable=True)
+    lng = db.Column(db.Float, nullable=True)
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class EmailOutbox(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+
+    to_addr = db.Column(db.String(255), nullable=False)
+    reply_to = db.Column(db.String(255), nullable=True)
+    subject = db.Column(db.String(255), nullable=False)
+    body = db.Column(db.Text, nullable=False)
+
+    status = db.Column(db.String(20), nullable=False, default="PENDING")  # PENDING/SENT/FAILED
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    last_error = db.Column(db.String(500), nullable=True)
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime, nullable=True)
+
+    # workerul caută doar mesajele PENDING scadente
+    __table_args__ = (db.Index("ix_email_outbox_due", "status", "next_attempt_at"),)
+
+class StatCounter(db.Model):
+    # contoare pentru dashboard, ținute la zi de app/stats.py (evenimente ORM + reconciliere):
+    # "listings", "listings:featured", "listings:verified", "category:<id>", "city:<id>", "submissions:<STATUS>"
+    name = db.Column(db.String(60), primary_key=True)
+    value = db.Column(db.Integer, nullable=False, default=0)
@@ -0,0 +1,196 @@
+"""
+Moderare în lot a submission-urilor (admin + `flask submissions-moderate`).
+
+Într-o singură tranzacție, indiferent câte sunt:
+- submission-urile și categoriile: câte un SELECT
+- orașele: cities.city_resolver (hartă în memorie, cheie normalizată + alias-uri);
+  cele noi create împreună (un flush), coordonate din gazetteer
+- telefoanele deja folosite: un SELECT pe phone_key
+- slug-urile: `taken_slugs_many` + alocare în memorie
+- listările: un singur INSERT executemany; la coliziune de slug (request
+  concurent) se realocă și se reîncearcă într-un SAVEPOINT
+
+Rândurile cu probleme (deja moderate, telefon folosit) nu opresc lotul – apar
+în rezultat cu motivul lor.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+
+from . import page_cache, stats
+from .cities import city_key, city_resolver, clean_city_name
+from .extensions import db
+from .gazetteer import gazetteer
+from .models import Category, City, Listing, Submission
+from .search import _document, _document_rows, get_backend
+from .slugs import SlugAllocator, base_slug, taken_slugs_many
+from .utils import phone_key, slugify, website_domain
+
+APPROVE = "approve"
+REJECT = "reject"
+
+
+@dataclass
+class Outcome:
+    sub_id: int
+    status: str                 # approved / rejected / skipped / error
+    message: str = ""
+    listing_id: int | None = None
+    slug: str | None = None
+
+
+class BulkModeration:
+    def __init__(self, slug_attempts: int = 5):
+        self.slug_attempts = slug_attempts
+        self.created_cities = []
+
+    # --------------------
+    # rezolvare în memorie
+    # --------------------
+    def _categories(self):
+        rows = db.session.execute(select(Category.id, Category.name).order_by(Category.name.asc())).all()
+        by_name = {name.casefold(): cid for cid, name in rows}
+        # aceeași regulă ca la aprobarea individuală: prima categorie alfabetic
+        return by_name, (rows[0][0] if rows else None)
+
+    def _cities(self, subs) -> dict:
+        """{city_key: city_id}; orașele lipsă sunt create acum, toate deodată."""
+        found, new = {}, {}
+        for sub in subs:
+            key = city_key(sub.city_name)
+            if not key or key in found or key in new:
+                continue
+            city_id = city_resolver.lookup(sub.city_name)
+            if city_id is not None:
+                found[key] = city_id
+            else:
+                name = clean_city_name(sub.city_name)
+                lat, lng = gazetteer.resolve(sub.city_name, exact=True)
+                new[key] = City(name=name, slug=slugify(name), state=None, lat=lat, lng=lng)
+        if new:
+            db.session.add_all(new.values())
+            db.session.flush()
+            for key, city in new.items():
+                found[key] = city.id
+                city_resolver.remember(key, city.id)
+            self.created_cities = [c.name for c in new.values()]
+        return found
+
+    def _taken_phones(self, keys) -> dict:
+        if not keys:
+            return {}
+        rows = db.session.execute(
+            select(Listing.phone_key, Listing.name).where(Listing.phone_key.in_(list(keys)))
+        )
+        return dict(rows.all())
+
+    # --------------------
+    # scriere
+    # --------------------
+    def _insert(self, rows: list[dict]) -> list[int]:
+        """
+        Un INSERT executemany (SQLAlchemy îl grupează în INSERT-uri multi-VALUES);
+        id-urile se potrivesc după slug, unic în lot. La conflict de slug realocăm.
+        """
+        lost = set()
+        for _ in range(self.slug_attempts):
+            allocator = SlugAllocator(taken_slugs_many(r["_base"] for r in rows) | lost)
+            for r in rows:
+                r["slug"] = allocator.allocate(r["_base"])
+            values = [{k: v for k, v in r.items() if not k.startswith("_")} for r in rows]
+            try:
+                with db.session.begin_nested():
+                    table = Listing.__table__
+                    result = db.session.execute(insert(table).returning(table.c.id, table.c.slug), values)
+                    ids = {row.slug: row.id for row in result}
+                return [ids[r["slug"]] for r in rows]
+            except IntegrityError:
+                slugs = [r["slug"] for r in rows]
+                existing = set(db.session.execute(select(Listing.slug).where(Listing.slug.in_(slugs))).scalars())
+                if not existing:
+                    raise  # altă constrângere, nu slug-ul
+                lost |= existing
+        raise RuntimeError("nu am putut aloca slug-uri unice pentru lot")
+
+    def run(self, ids, action: str) -> list[Outcome]:
+        if action not in (APPROVE, REJECT):
+            raise ValueError(f"acțiune necunoscută: {action!r}")
+        ids = list(dict.fromkeys(int(i) for i in ids))
+        subs = {s.id: s for s in Submission.query.filter(Submission.id.in_(ids)).with_for_update()}
+
+        outcomes = {}
+        pending = []
+        for sub_id in ids:
+            sub = subs.get(sub_id)
+            if sub is None:
+                outcomes[sub_id] = Outcome(sub_id, "error", "nu există")
+            elif (sub.status or "PENDING") != "PENDING":
+                outcomes[sub_id] = Outcome(sub_id, "skipped", f"deja {sub.status}")
+            else:
+                pending.append(sub)
+
+        if action == REJECT:
+            for sub in pending:
+                sub.status = "REJECTED"
+                outcomes[sub.id] = Outcome(sub.id, "rejected")
+            db.session.flush()
+            return [outcomes[i] for i in ids]
+
+        categories, default_category = self._categories()
+        cities = self._cities(pending)
+        taken_phones = self._taken_phones({k for k in (phone_key(s.contact) for s in pending) if k})
+
+        now = datetime.utcnow()
+        rows, approved = [], []
+        for sub in pending:
+            key = phone_key(sub.contact)
+            city_id = cities.get(city_key(sub.city_name))
+            category_id = categories.get((sub.category_name or "").casefold(), default_category)
+            if city_id is None or category_id is None:
+                outcomes[sub.id] = Outcome(sub.id, "error", "oraș / categorie lipsă")
+                continue
+            if key and key in taken_phones:
+                outcomes[sub.id] = Outcome(sub.id, "error", f"telefonul există deja la „{taken_phones[key]}”")
+                continue
+            if key:
+                taken_phones[key] = sub.business_name  # și între submission-urile din lot
+            rows.append({
+                "_base": base_slug(sub.business_name),
+                "name": sub.business_name,
+                "description": sub.message,
+                "category_id": category_id,
+                "city_id": city_id,
+                "website": sub.website,
+                "website_domain": website_domain(sub.website),
+                "phone": sub.contact,
+                "phone_key": key,
+                "verified": False,
+                "featured": False,
+                "created_at": now,
+                "updated_at": now,
+            })
+            approved.append(sub)
+
+        if rows:
+            listing_ids = self._insert(rows)
+            # INSERT-ul prin Core nu declanșează evenimentele ORM: index, contoare, cache pagini
+            conn = db.session.connection()
+            backend = get_backend(conn)
+            for doc in _document_rows(conn, Listing.id.in_(listing_ids)):
+                backend.upsert(conn, doc.id, _document(doc))
+            stats.listings_inserted(db.session, rows)
+            page_cache.listings_written(db.session, {(r["category_id"], r["city_id"]) for r in rows})
+
+            for sub, row, listing_id in zip(approved, rows, listing_ids):
+                sub.status = "APPROVED"
+                outcomes[sub.id] = Outcome(sub.id, "approved", listing_id=listing_id, slug=row["slug"])
+        db.session.flush()
+        return [outcomes[i] for i in ids]
+
+
+def moderate(ids, action: str) -> tuple[list[Outcome], list[str]]:
+    """(rezultate per submission, orașe create). Commit-ul rămâne la apelant."""
+    job = BulkModeration()
+    return job.run(ids, action), job.created_cities
@@ -0,0 +1,229 @@
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from functools import wraps
+
+from flask import current_app, g, request, session
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
+
+from .cache import nav_cache
+from .http_cache import cacheable, not_modified
+from .models import Listing
+from .replica import reads_from_replica
+
+# overhead aproximativ per intrare (cheie, tag-uri, obiecte python)
+ENTRY_OVERHEAD = 512
+
+PageEntry = namedtuple("PageEntry", "body etag last_modified tags nav stored_at size")
+
+
+def category_tag(category_id) -> str:
+    return f"category:{category_id}"
+
+
+def landing_tag(category_id, city_id) -> str:
+    return f"landing:{category_id}:{city_id}"
+
+
+def listing_tags(category_id, city_id) -> set[str]:
+    return {category_tag(category_id), landing_tag(category_id, city_id)}
+
+
+class PageCache:
+    """
+    Cache per proces pentru HTML-ul randat (seo_landing / category_page).
+
+    - cheie: host + path + query string normalizat
+    - fiecare intrare are tag-uri (category:X, landing:X:Y); `invalidate_tags`
+      scoate doar paginile afectate
+    - LRU cu limită de memorie (PAGE_CACHE_MAX_BYTES)
+    - TTL (PAGE_CACHE_TTL) pentru ceilalți workeri gunicorn, care nu văd
+      invalidarea locală – la fel ca NavCache
+    - o schimbare în meniuri (categorii/orașe) invalidează implicit totul
+      prin fingerprint-ul din nav_cache
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple, PageEntry] = OrderedDict()
+        self._by_tag: dict[str, set[tuple]] = {}
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.invalidated_at = float("-inf")  # monotonic, ultima invalidare
+
+    def _drop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self.bytes -= entry.size
+        for tag in entry.tags:
+            keys = self._by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_tag[tag]
+
+    def get(self, key, nav: str):
+        ttl = current_app.config.get("PAGE_CACHE_TTL", 300)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.nav != nav or (ttl > 0 and time.monotonic() - entry.stored_at >= ttl):
+                self._drop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, body: bytes, etag, last_modified, tags, nav: str):
+        max_bytes = current_app.config.get("PAGE_CACHE_MAX_BYTES", 32 * 1024 * 1024)
+        size = len(body) + ENTRY_OVERHEAD
+        if size > max_bytes:
+            return
+        entry = PageEntry(body, etag, last_modified, frozenset(tags), nav, time.monotonic(), size)
+        with self._lock:
+            self._drop(key)
+            self._entries[key] = entry
+            self.bytes += size
+            for tag in entry.tags:
+                self._by_tag.setdefault(tag, set()).add(key)
+            while self.bytes > max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def invalidate_tags(self, tags) -> int:
+        with self._lock:
+            self.invalidated_at = time.monotonic()
+            keys = set()
+            for tag in tags:
+                keys |= self._by_tag.get(tag, set())
+            for key in keys:
+                self._drop(key)
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_tag.clear()
+            self.bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_ratio": (self.hits / total) if total else 0.0,
+            }
+
+
+page_cache = PageCache()
+
+
+# --------------------
+# DECORATOR PENTRU RUTE
+# --------------------
+def _page_key() -> tuple:
+    # parametrii goi (?city=&verified=) nu schimbă pagina
+    args = sorted((k, v) for k, v in request.args.items(multi=True) if v.strip())
+    return request.host, request.path, tuple(args)
+
+
+def tag_page(*tags: str):
+    """Apelat din view: paginile de care depinde răspunsul curent."""
+    g.page_cache_tags = set(tags)
+
+
+def cached_page(view):
+    """
+    Servește HTML-ul din page_cache. View-ul trebuie să apeleze `tag_page(...)`
+    – fără tag-uri răspunsul nu intră în cache (nu l-am putea invalida).
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        # mesajele flash sunt per utilizator -> nu servim / nu salvăm din cache
+        if not current_app.config.get("PAGE_CACHE_ENABLED", True) or "_flashes" in session:
+            return view(*args, **kwargs)
+
+        key = _page_key()
+        nav = nav_cache.fingerprint()
+        entry = page_cache.get(key, nav)
+        if entry is not None:
+            return (
+                not_modified(entry.etag, entry.last_modified)
+                or cacheable(entry.body, entry.etag, entry.last_modified)
+            )
+
+        g.page_cache_tags = None
+        resp = current_app.make_response(view(*args, **kwargs))
+        tags = g.pop("page_cache_tags", None)
+        # randată din replică imediat după o invalidare -> poate fi exact pagina veche
+        lagging = reads_from_replica() and (
+            time.monotonic() - page_cache.invalidated_at < current_app.config.get("DB_REPLICA_STICKY_SECONDS", 10)
+        )
+        if resp.status_code == 200 and tags and resp.get_etag()[0] and not lagging:
+            page_cache.put(key, resp.get_data(), resp.get_etag()[0], resp.last_modified, tags, nav)
+        return resp
+
+    return wrapper
+
+
+# --------------------
+# INVALIDARE: Listing creat / editat / șters (inclusiv aprobare din Submission)
+# --------------------
+def _pending_tags(target) -> set | None:
+    session = object_session(target)
+    if session is None:
+        return None
+    return session.info.setdefault("page_cache_tags", set())
+
+
+@event.listens_for(Listing, "after_insert")
+@event.listens_for(Listing, "after_update")
+@event.listens_for(Listing, "after_delete")
+def _collect_listing_tags(mapper, connection, target):
+    tags = _pending_tags(target)
+    if tags is None:
+        return
+    state = inspect(target)
+    category_ids = {target.category_id}
+    city_ids = {target.city_id}
+    # la mutarea în altă categorie / alt oraș invalidăm și paginile vechi
+    category_ids.update(state.attrs.category_id.history.deleted or ())
+    city_ids.update(state.attrs.city_id.history.deleted or ())
+    for category_id in category_ids:
+        for city_id in city_ids:
+            tags |= listing_tags(category_id, city_id)
+
+
+def listings_written(session, pairs):
+    """Pentru scrieri prin Core (fără evenimente ORM): (category_id, city_id) atinse."""
+    tags = session.info.setdefault("page_cache_tags", set())
+    for category_id, city_id in pairs:
+        tags |= listing_tags(category_id, city_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    # abia după commit: altfel un request concurent ar pune înapoi varianta veche
+    tags = session.info.pop("page_cache_tags", None)
+    if tags:
+        page_cache.invalidate_tags(tags)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session):
+    session.info.pop("page_cache_tags", None)
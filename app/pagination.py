@@ -0,0 +1,123 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from sqlalchemy import literal, tuple_
+
+from .models import Listing
+
+PER_PAGE = 30
+
+# ordinea publică: featured DESC, verified DESC, updated_at DESC, id DESC
+# (id la final = ordine totală, fără duplicate între pagini)
+PUBLIC_ORDER = (Listing.featured, Listing.verified, Listing.updated_at, Listing.id)
+ADMIN_ORDER = (Listing.updated_at, Listing.id)
+
+
+def encode_cursor(values) -> str:
+    raw = json.dumps([v.isoformat() if isinstance(v, datetime) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str, columns):
+    """Cursor invalid / modificat de mână -> None (prima pagină)."""
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, ValueError):
+        return None
+    if not isinstance(values, list) or len(values) != len(columns):
+        return None
+
+    out = []
+    for col, value in zip(columns, values):
+        if col.key.endswith("_at"):
+            try:
+                value = datetime.fromisoformat(value)
+            except (TypeError, ValueError):
+                return None
+        elif col.key in ("featured", "verified"):
+            if not isinstance(value, bool):
+                return None
+        elif not isinstance(value, int) or isinstance(value, bool):
+            return None
+        out.append(value)
+    return out
+
+
+def _row(columns, values):
+    return tuple_(*[literal(v, c.type) for c, v in zip(columns, values)])
+
+
+def _after(columns, values):
+    # (featured, verified, updated_at, id) < (cursor): row value, folosește indexul compus
+    return tuple_(*columns) < _row(columns, values)
+
+
+def _before(columns, values):
+    return tuple_(*columns) > _row(columns, values)
+
+
+class KeysetPage:
+    def __init__(self, items, next_cursor, prev_cursor, cursor=None):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+        # ("after" | "before", token) dacă pagina vine dintr-un cursor valid; None = prima pagină
+        self.cursor = cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self):
+        return self.prev_cursor is not None
+
+
+def keyset_paginate(query, columns=PUBLIC_ORDER, after: str = "", before: str = "", per_page: int = PER_PAGE):
+    """
+    Paginare pe cursor: pagina N costă cât pagina 1 (nu există OFFSET).
+
+    - `after`  = cursorul ultimului rând de pe pagina anterioară (rel=next)
+    - `before` = cursorul primului rând de pe pagina următoare (rel=prev)
+    Rândurile cu valori NULL în coloanele de ordonare nu sunt suportate
+    (migrarea le completează și pune NOT NULL).
+    """
+    after_values = decode_cursor(after, columns)
+    before_values = None if after_values else decode_cursor(before, columns)
+
+    if before_values:
+        rows = (
+            query.filter(_before(columns, before_values))
+            .order_by(*[c.asc() for c in columns])
+            .limit(per_page + 1)
+            .all()
+        )
+        more = len(rows) > per_page
+        items = list(reversed(rows[:per_page]))
+        has_prev, has_next = more, True
+    else:
+        if after_values:
+            query = query.filter(_after(columns, after_values))
+        rows = (
+            query.order_by(*[c.desc() for c in columns])
+            .limit(per_page + 1)
+            .all()
+        )
+        more = len(rows) > per_page
+        items = rows[:per_page]
+        has_prev, has_next = after_values is not None, more
+
+    def cursor_of(item):
+        return encode_cursor([getattr(item, c.key) for c in columns])
+
+    return KeysetPage(
+        items,
+        next_cursor=cursor_of(items[-1]) if items and has_next else None,
+        prev_cursor=cursor_of(items[0]) if items and has_prev else None,
+        cursor=("after", after) if after_values else ("before", before) if before_values else None,
+    )
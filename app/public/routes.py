@@ -1,15 +1,24 @@
-from flask import Blueprint, render_template, request, abort, Response, url_for
-from sqlalchemy import or_, text
+from flask import Blueprint, render_template, request, abort, Response, url_for, stream_with_context
 from flask import abort
 from ..extensions import db
+from ..cache import nav_cache
+from ..geo import cities_within_radius
+from ..http_cache import cacheable, list_validators, make_etag, not_modified
+from ..loading import with_profile
+from ..page_cache import cached_page, category_tag, landing_tag, tag_page
+from ..pagination import keyset_paginate
+from ..replica import route_reads
+from ..search import get_backend
+from .. import sitemap as sitemap_xml
 from ..models import Category, City, Listing, Submission
 from ..utils import languages_from_str
 from ..utils import geocode_location
-from datetime import datetime, timezone
-from ..utils import send_contact_email
+from ..mailer import queue_contact_email
 from app.utils import phone_key
 
 public_bp = Blueprint("public", __name__)
+# GET-urile publice citesc din replică, dacă e configurată (app/replica.py)
+public_bp.before_request(route_reads)
 
 @public_bp.route("/contact", methods=["GET", "POST"])
 def contact():
@@ -26,10 +35,13 @@ def contact():
             message = request.form.get("message", "").strip()
 
             if name and email and message:
+                # doar INSERT în outbox – `flask mail-worker` trimite în fundal
                 try:
-                    send_contact_email(name, email, message)
+                    queue_contact_email(name, email, message)
+                    db.session.commit()
                     success = True
                 except Exception:
+                    db.session.rollback()
                     error = True
 
     return render_template("contact.html", success=success, error=error)
@@ -43,20 +55,15 @@ def fake_admin():
     
 def _apply_radius_filter(query, center_lat: float, center_lng: float, radius_km: int):
     # Uses City.lat/lng as the listing position (city center approximation)
-    return query.filter(
-        text("""
-        (6371 * acos(
-          cos(radians(:clat)) * cos(radians(city.lat)) * cos(radians(city.lng) - radians(:clng)) +
-          sin(radians(:clat)) * sin(radians(city.lat))
-        )) <= :rkm
-        """)
-    ).params(clat=center_lat, clng=center_lng, rkm=radius_km)
+    city_ids = cities_within_radius(center_lat, center_lng, radius_km)
+    return query.filter(Listing.city_id.in_(city_ids))
 
 @public_bp.app_context_processor
 def inject_globals():
+    all_categories, all_cities = nav_cache.get()
     return {
-        "all_categories": Category.query.order_by(Category.name.asc()).all(),
-        "all_cities": City.query.order_by(City.name.asc()).all(),
+        "all_categories": all_categories,
+        "all_cities": all_cities,
         "languages_from_str": languages_from_str
     }
 
@@ -69,14 +76,14 @@ def home():
     city_slug = request.args.get("city", "").strip()
 
     featured = (
-        Listing.query
+        with_profile(Listing.query, "card")
         .filter_by(featured=True)
         .order_by(Listing.updated_at.desc())
         .limit(8)
         .all()
     )
 
-    listings_query = Listing.query
+    listings_query = with_profile(Listing.query, "card")
 
     # -----------------
     # Category filter
@@ -91,20 +98,9 @@ def home():
     # -----------------
     # Text search
     # -----------------
+    rank = None
     if q_text:
-        listings_query = (
-            listings_query
-            .join(Category, Listing.category_id == Category.id)
-            .join(City, Listing.city_id == City.id)
-            .filter(or_(
-                Listing.name.ilike(f"%{q_text}%"),
-                Listing.description.ilike(f"%{q_text}%"),
-                Category.name.ilike(f"%{q_text}%"),
-                City.name.ilike(f"%{q_text}%"),
-                Listing.languages.ilike(f"%{q_text}%"),
-            ))
-            .distinct()
-        )
+        listings_query, rank = get_backend().apply(listings_query, q_text)
 
     # -----------------
     # Location (manual) + radius
@@ -116,10 +112,6 @@ def home():
     if lat and lng and radius_km.isdigit():
         r = int(radius_km)
         if r in RADIUS_ALLOWED:
-            listings_query = (
-                listings_query
-                .join(City, Listing.city_id == City.id)
-            )
             listings_query = _apply_radius_filter(
                 listings_query,
                 lat,
@@ -130,13 +122,14 @@ def home():
     # -----------------
     # Final result
     # -----------------
+    order = [Listing.featured.desc()]
+    if rank is not None:
+        order.append(rank.desc())
+    order += [Listing.verified.desc(), Listing.updated_at.desc()]
+
     listings = (
         listings_query
-        .order_by(
-            Listing.featured.desc(),
-            Listing.verified.desc(),
-            Listing.updated_at.desc()
-        )
+        .order_by(*order)
         .limit(30)
         .all()
     )
@@ -155,17 +148,19 @@ def home():
     )
 
 @public_bp.get("/category/<slug>")
+@cached_page
 def category_page(slug: str):
     category = Category.query.filter_by(slug=slug).first()
     if not category:
         abort(404)
+    tag_page(category_tag(category.id))
 
     city_slug = request.args.get("city", "").strip()
     radius_km = request.args.get("radius", "").strip()
     verified = request.args.get("verified", "").strip() == "1"
     featured = request.args.get("featured", "").strip() == "1"
 
-    q = Listing.query.filter_by(category_id=category.id)
+    q = with_profile(Listing.query, "card").filter_by(category_id=category.id)
 
     city = None
     if city_slug:
@@ -176,7 +171,6 @@ def category_page(slug: str):
     if city and radius_km.isdigit():
         r = int(radius_km)
         if r in RADIUS_ALLOWED and city.lat is not None and city.lng is not None:
-            q = q.join(City, Listing.city_id == City.id)
             q = _apply_radius_filter(q, city.lat, city.lng, r)
 
     if verified:
@@ -184,17 +178,24 @@ def category_page(slug: str):
     if featured:
         q = q.filter_by(featured=True)
 
-    listings = q.order_by(Listing.featured.desc(), Listing.verified.desc(), Listing.updated_at.desc()).all()
+    last_modified, count = list_validators(q)
+    etag = make_etag(category.id, category.name, last_modified, count)
+    cached = not_modified(etag, last_modified)
+    if cached:
+        return cached
 
-    return render_template(
+    page = keyset_paginate(q, after=request.args.get("after", ""), before=request.args.get("before", ""))
+
+    return cacheable(render_template(
         "category.html",
         category=category,
-        listings=listings,
+        listings=page.items,
+        page=page,
         city_slug=city_slug,
         radius_km=radius_km,
         verified=verified,
         featured=featured
-    )
+    ), etag, last_modified)
 
 @public_bp.get("/city/<slug>")
 def city_page(slug: str):
@@ -206,7 +207,7 @@ def city_page(slug: str):
     verified = request.args.get("verified", "").strip() == "1"
     featured = request.args.get("featured", "").strip() == "1"
 
-    q = Listing.query.filter_by(city_id=city.id)
+    q = with_profile(Listing.query, "card").filter_by(city_id=city.id)
     if category_slug:
         cat = Category.query.filter_by(slug=category_slug).first()
         if cat:
@@ -216,15 +217,30 @@ def city_page(slug: str):
     if featured:
         q = q.filter_by(featured=True)
 
-    listings = q.order_by(Listing.featured.desc(), Listing.verified.desc(), Listing.updated_at.desc()).all()
-    return render_template("city.html", city=city, listings=listings, category_slug=category_slug, verified=verified, featured=featured)
+    last_modified, count = list_validators(q)
+    etag = make_etag(city.id, city.name, last_modified, count)
+    cached = not_modified(etag, last_modified)
+    if cached:
+        return cached
+
+    page = keyset_paginate(q, after=request.args.get("after", ""), before=request.args.get("before", ""))
+    return cacheable(
+        render_template("city.html", city=city, listings=page.items, page=page, category_slug=category_slug, verified=verified, featured=featured),
+        etag,
+        last_modified,
+    )
 
 @public_bp.get("/listing/<slug>")
 def listing_page(slug: str):
-    listing = Listing.query.filter_by(slug=slug).first()
+    listing = with_profile(Listing.query, "detail").filter_by(slug=slug).first()
     if not listing:
         abort(404)
-    return render_template("listing.html", listing=listing)
+
+    etag = make_etag(listing.id, listing.updated_at, listing.category.name, listing.city.name)
+    cached = not_modified(etag, listing.updated_at)
+    if cached:
+        return cached
+    return cacheable(render_template("listing.html", listing=listing), etag, listing.updated_at)
 
 @public_bp.route("/recommend", methods=["GET", "POST"])
 def recommend():
@@ -256,17 +272,26 @@ def recommend():
 
 # SEO landing: /servicii/<category_slug>/<city_slug>
 @public_bp.get("/servicii/<category_slug>/<city_slug>")
+@cached_page
 def seo_landing(category_slug: str, city_slug: str):
     category = Category.query.filter_by(slug=category_slug).first()
     city = City.query.filter_by(slug=city_slug).first()
     if not category or not city:
         abort(404)
+    tag_page(landing_tag(category.id, city.id))
 
-    listings = (
-        Listing.query
-        .filter_by(category_id=category.id, city_id=city.id)
-        .order_by(Listing.featured.desc(), Listing.verified.desc(), Listing.updated_at.desc())
-        .all()
+    q = with_profile(Listing.query, "card").filter_by(category_id=category.id, city_id=city.id)
+
+    last_modified, count = list_validators(q)
+    etag = make_etag(category.id, category.name, city.id, city.name, last_modified, count)
+    cached = not_modified(etag, last_modified)
+    if cached:
+        return cached
+
+    page = keyset_paginate(
+        q,
+        after=request.args.get("after", ""),
+        before=request.args.get("before", ""),
     )
 
     seo_title = f"{category.name} români în {city.name} — Servicii în limba română"
@@ -275,14 +300,15 @@ def seo_landing(category_slug: str, city_slug: str):
         f"Listă verificată, contacte rapide și firme recomandate de comunitate."
     )
 
-    return render_template(
+    return cacheable(render_template(
         "seo_landing.html",
         category=category,
         city=city,
-        listings=listings,
+        listings=page.items,
+        page=page,
         seo_title=seo_title,
         seo_description=seo_description
-    )
+    ), etag, last_modified)
 
 # sitemap.xml
 # @public_bp.get("/sitemap.xml")
@@ -318,41 +344,47 @@ def seo_landing(category_slug: str, city_slug: str):
 
 #     return Response("\n".join(xml), mimetype="application/xml")
 
-@public_bp.get("/sitemap.xml")
-def sitemap():
-    base = request.url_root.rstrip("/").replace("http://", "https://")
-    now = datetime.now(timezone.utc)
-
-    categories = Category.query.all()
-    cities = City.query.all()
-    listings = Listing.query.with_entities(Listing.slug, Listing.updated_at).all()
-
-    urls = []
-    urls.append((f"{base}{url_for('public.home')}", now))
-
-    for c in categories:
-        urls.append((f"{base}{url_for('public.category_page', slug=c.slug)}", now))
-    for city in cities:
-        urls.append((f"{base}{url_for('public.city_page', slug=city.slug)}", now))
-    for c in categories:
-        for city in cities:
-            urls.append((f"{base}{url_for('public.seo_landing', category_slug=c.slug, city_slug=city.slug)}", now))
-    for slug, updated_at in listings:
-        urls.append((f"{base}{url_for('public.listing_page', slug=slug)}", updated_at or now))
-
-    xml = [
-        '<?xml version="1.0" encoding="UTF-8"?>',
-        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
-    ]
+def _xml_stream(chunks, etag, lastmod, gzipped=False):
+    body = sitemap_xml.gzip_stream(chunks) if gzipped else chunks
+    resp = Response(stream_with_context(body), mimetype="application/x-gzip" if gzipped else "application/xml")
+    return cacheable(resp, etag, lastmod)
 
-    for loc, lastmod in urls:
-        xml.append("  <url>")
-        xml.append(f"    <loc>{loc}</loc>")
-        xml.append(f"    <lastmod>{lastmod.date().isoformat()}</lastmod>")
-        xml.append("  </url>")
 
-    xml.append("</urlset>")
-    return Response("\n".join(xml), mimetype="application/xml")
+# sitemap index -> sitemap-pages-N.xml.gz + sitemap-listings-N.xml.gz (max 50.000 URL-uri fiecare)
+@public_bp.get("/sitemap.xml")
+@public_bp.get("/sitemap_index.xml")
+def sitemap():
+    lastmod = sitemap_xml.pages_lastmod()
+    # ETag-ul include fingerprint-ul meniurilor: oraș / categorie ștearsă = alt index
+    etag = make_etag(lastmod)
+    cached = not_modified(etag, lastmod)
+    if cached:
+        return cached
+    return _xml_stream(sitemap_xml.iter_index(lastmod), etag, lastmod)
+
+
+@public_bp.get("/sitemap-pages-<int:n>.xml.gz")
+def sitemap_pages(n: int):
+    if n >= sitemap_xml.page_chunk_count():
+        abort(404)
+    lastmod = sitemap_xml.pages_lastmod()
+    etag = make_etag(lastmod)
+    cached = not_modified(etag, lastmod)
+    if cached:
+        return cached
+    return _xml_stream(sitemap_xml.iter_page_chunk(n, lastmod), etag, lastmod, gzipped=True)
+
+
+@public_bp.get("/sitemap-listings-<int:n>.xml.gz")
+def sitemap_listings(n: int):
+    lastmod = sitemap_xml.listing_chunk_lastmod(n)
+    if lastmod is None:
+        abort(404)
+    etag = make_etag(lastmod)
+    cached = not_modified(etag, lastmod)
+    if cached:
+        return cached
+    return _xml_stream(sitemap_xml.iter_listing_chunk(n), etag, lastmod, gzipped=True)
 
 @public_bp.get("/impressum")
 def impressum():
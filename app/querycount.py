@@ -0,0 +1,72 @@
+from contextlib import contextmanager
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+# număr fix de query-uri / pagină, indiferent câte carduri sunt afișate;
+# măsurat cu cache-urile per proces calde (meniuri, backend-ul de căutare),
+# ca în producție după primul request al fiecărui worker
+ROUTE_BUDGETS = {
+    "/": 2,
+    "/?q={listing_name}": 2,
+    "/category/{category}": 3,
+    "/category/{category}?city={city}": 4,
+    "/city/{city}": 3,
+    "/city/{city}?category={category}": 4,
+    "/servicii/{category}/{city}": 4,
+    "/listing/{listing}": 1,
+}
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@contextmanager
+def count_queries(engine):
+    """
+    Colectează SQL-ul executat pe `engine` (sau pe o listă de engine-uri) în blocul `with`:
+
+        with count_queries(db.engines.values()) as statements:
+            client.get("/")
+        print(len(statements))
+    """
+    statements = []
+    engines = [engine] if isinstance(engine, Engine) else list(engine)
+
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    for e in engines:
+        event.listen(e, "before_cursor_execute", _before)
+    try:
+        yield statements
+    finally:
+        for e in engines:
+            event.remove(e, "before_cursor_execute", _before)
+
+
+@contextmanager
+def query_budget(engine, max_queries: int, label: str = ""):
+    """
+    Eșuează (AssertionError) dacă blocul execută mai mult de `max_queries` query-uri.
+    Folosit în teste / scripts/check_query_budgets.py ca să prindem N+1 noi.
+    """
+    with count_queries(engine) as statements:
+        yield statements
+    if len(statements) > max_queries:
+        listing = "\n".join(f"  {i + 1}. {s.strip()[:160]}" for i, s in enumerate(statements))
+        raise QueryBudgetExceeded(
+            f"{label or 'block'}: {len(statements)} queries > budget {max_queries}\n{listing}"
+        )
+
+
+def assert_route_budget(app, client, url: str, max_queries: int):
+    with app.app_context():
+        # toate bind-urile: cu DATABASE_REPLICA_URL citirile publice merg pe replică
+        engines = list(app.extensions["sqlalchemy"].engines.values())
+    with query_budget(engines, max_queries, label=f"GET {url}"):
+        response = client.get(url)
+    assert response.status_code < 500, f"GET {url} -> {response.status_code}"
+    return response
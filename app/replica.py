@@ -0,0 +1,93 @@
+"""
+Citiri din replica Postgres pentru paginile publice (DATABASE_REPLICA_URL).
+
+- GET / HEAD din public_bp: SELECT-urile merg pe bind-ul "replica"
+- orice flush (scriere) merge pe primary; după primul flush tot restul
+  request-ului citește tot din primary
+- read-your-writes: după un request care a scris (admin, /contact,
+  /recommend) sesiunea vizitatorului rămâne pe primary încă
+  DB_REPLICA_STICKY_SECONDS – mai mult decât lag-ul maxim al replicii
+- fără DATABASE_REPLICA_URL totul merge pe primary, ca înainte
+
+Local: două fișiere SQLite (sau două baze Postgres) + scripts/simulate_replica.py,
+care copiază primary -> replica cu întârziere.
+"""
+import time
+from contextlib import contextmanager
+
+from flask import current_app, g, has_request_context, request, session
+from flask_sqlalchemy.session import Session as _FlaskSession
+from sqlalchemy import event
+
+REPLICA = "replica"
+_STICKY_KEY = "db_primary_until"
+
+
+def _is_write(clause) -> bool:
+    # INSERT / UPDATE / DELETE prin session.execute, SELECT ... FOR UPDATE
+    return getattr(clause, "is_dml", False) or getattr(clause, "_for_update_arg", None) is not None
+
+
+class RoutingSession(_FlaskSession):
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and not _is_write(clause) and reads_from_replica():
+            engine = self._db.engines.get(REPLICA)
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def reads_from_replica() -> bool:
+    return has_request_context() and g.get("db_replica", False) and not g.get("db_primary", False)
+
+
+@contextmanager
+def primary():
+    """Citiri din primary în interiorul unui request rutat pe replică (ex. cache-uri încărcate rar)."""
+    if not has_request_context():
+        yield
+        return
+    previous = g.get("db_primary", False)
+    g.db_primary = True
+    try:
+        yield
+    finally:
+        g.db_primary = previous
+
+
+def _sticky() -> bool:
+    # fără cookie de sesiune nu atingem `session` (ar adăuga Vary: Cookie)
+    if current_app.config["SESSION_COOKIE_NAME"] not in request.cookies:
+        return False
+    return session.get(_STICKY_KEY, 0) > time.time()
+
+
+def route_reads():
+    """before_request pe public_bp."""
+    if REPLICA not in current_app.config.get("SQLALCHEMY_BINDS", {}):
+        return
+    g.db_replica = request.method in ("GET", "HEAD") and not _sticky()
+
+
+def remember_writes(response):
+    """after_request pe app: după o scriere, vizitatorul citește din primary o vreme."""
+    if g.get("db_wrote") and REPLICA in current_app.config.get("SQLALCHEMY_BINDS", {}):
+        session[_STICKY_KEY] = time.time() + current_app.config["DB_REPLICA_STICKY_SECONDS"]
+    return response
+
+
+def _wrote():
+    if has_request_context():
+        # restul request-ului își vede propriile scrieri
+        g.db_wrote = g.db_primary = True
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _flushed(session_, flush_context):
+    _wrote()
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _executed(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        _wrote()
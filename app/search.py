@@ -0,0 +1,261 @@
+import re
+import unicodedata
+
+import sqlalchemy as sa
+from flask import current_app
+from sqlalchemy import event, or_, text
+from sqlalchemy.dialects import postgresql
+
+from .extensions import db
+from .models import Category, City, Listing
+
+# Transliterări care nu se obțin doar scoțând diacriticele
+_GERMAN = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss"})
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _strip_marks(text_: str) -> str:
+    # ă/â/î/ș/ț/ş/ţ/ä/ö/ü -> a/a/i/s/t/s/t/a/o/u; ß -> ss
+    text_ = text_.lower().replace("ß", "ss")
+    decomposed = unicodedata.normalize("NFKD", text_)
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def fold_text(text_: str | None) -> str:
+    """
+    Textul de indexat: cuvinte fără diacritice + varianta germană pentru umlaut
+    ("München" -> "munchen muenchen"), ca să găsim ambele forme tastate.
+    """
+    if not text_:
+        return ""
+    words = []
+    for word in _WORD_RE.findall(text_.lower()):
+        plain = _strip_marks(word)
+        words.append(plain)
+        german = word.translate(_GERMAN)
+        if german != word:
+            german = _strip_marks(german)
+            if german != plain:
+                words.append(german)
+    return " ".join(words)
+
+
+def query_terms(q: str) -> list[str]:
+    return [_strip_marks(w) for w in _WORD_RE.findall((q or "").lower())][:8]
+
+
+def _document_rows(connection, *where):
+    return connection.execute(
+        sa.select(
+            Listing.id, Listing.name, Listing.description, Listing.languages,
+            Category.name.label("category"), City.name.label("city"),
+        )
+        .join(Category, Listing.category_id == Category.id)
+        .join(City, Listing.city_id == City.id)
+        .where(*where)
+    )
+
+
+def _document(row) -> str:
+    return " ".join(fold_text(x) for x in (
+        row.name, row.description, row.category, row.city, row.languages
+    ) if x)
+
+
+# --------------------
+# BACKENDS
+# --------------------
+class LikeSearch:
+    """Fallback: ilike pe câmpuri (comportamentul vechi din home())."""
+
+    name = "like"
+
+    def ready(self, connection) -> bool:
+        return True
+
+    def ensure_schema(self, connection):
+        pass
+
+    def apply(self, query, q: str):
+        query = (
+            query
+            .join(Category, Listing.category_id == Category.id)
+            .join(City, Listing.city_id == City.id)
+            .filter(or_(
+                Listing.name.ilike(f"%{q}%"),
+                Listing.description.ilike(f"%{q}%"),
+                Category.name.ilike(f"%{q}%"),
+                City.name.ilike(f"%{q}%"),
+                Listing.languages.ilike(f"%{q}%"),
+            ))
+            .distinct()
+        )
+        return query, None
+
+    def upsert(self, connection, listing_id: int, document: str):
+        pass
+
+    def delete(self, connection, listing_id: int):
+        pass
+
+    def rebuild(self, connection):
+        pass
+
+
+class _ShadowSearch(LikeSearch):
+    table_name = None
+
+    def ready(self, connection) -> bool:
+        if not sa.inspect(connection).has_table(self.table_name):
+            return False
+        # index gol pe o bază cu listări (ex. migrată fără reindex) ar da zero rezultate
+        if connection.execute(text(f"SELECT 1 FROM {self.table_name} LIMIT 1")).first() is not None:
+            return True
+        return connection.execute(sa.select(Listing.id).limit(1)).first() is None
+
+    def rebuild(self, connection):
+        self.ensure_schema(connection)
+        connection.execute(text(f"DELETE FROM {self.table_name}"))
+        count = 0
+        for row in _document_rows(connection):
+            self.upsert(connection, row.id, _document(row))
+            count += 1
+        return count
+
+
+class SqliteFtsSearch(_ShadowSearch):
+    """FTS5: tabela virtuală listing_fts, rowid = listing.id, rang bm25."""
+
+    name = "sqlite-fts5"
+    table_name = "listing_fts"
+
+    def ensure_schema(self, connection):
+        connection.execute(text(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS listing_fts "
+            "USING fts5(document, tokenize='unicode61 remove_diacritics 2')"
+        ))
+
+    def apply(self, query, q: str):
+        terms = query_terms(q)
+        if not terms:
+            return query, None
+        match = " ".join(f'"{t}"*' for t in terms)
+        hits = (
+            text("SELECT rowid AS listing_id, bm25(listing_fts) AS score FROM listing_fts WHERE listing_fts MATCH :match")
+            .bindparams(match=match)
+            .columns(listing_id=sa.Integer, score=sa.Float)
+            .subquery("fts")
+        )
+        query = query.join(hits, hits.c.listing_id == Listing.id)
+        # bm25: mai mic = mai relevant
+        return query, -hits.c.score
+
+    def upsert(self, connection, listing_id: int, document: str):
+        connection.execute(text("DELETE FROM listing_fts WHERE rowid = :id"), {"id": listing_id})
+        connection.execute(
+            text("INSERT INTO listing_fts (rowid, document) VALUES (:id, :doc)"),
+            {"id": listing_id, "doc": document},
+        )
+
+    def delete(self, connection, listing_id: int):
+        connection.execute(text("DELETE FROM listing_fts WHERE rowid = :id"), {"id": listing_id})
+
+
+_pg_meta = sa.MetaData()
+listing_search = sa.Table(
+    "listing_search", _pg_meta,
+    sa.Column("listing_id", sa.Integer, sa.ForeignKey("listing.id", ondelete="CASCADE"), primary_key=True),
+    sa.Column("document", sa.Text, nullable=False),
+    sa.Column("tsv", postgresql.TSVECTOR, nullable=False),
+    sa.Index("ix_listing_search_tsv", "tsv", postgresql_using="gin"),
+)
+
+
+class PostgresSearch(_ShadowSearch):
+    """tsvector ('simple' – textul e deja împăturit) + index GIN, rang ts_rank."""
+
+    name = "postgres-tsvector"
+    table_name = "listing_search"
+
+    def ensure_schema(self, connection):
+        _pg_meta.create_all(connection, checkfirst=True)
+
+    def apply(self, query, q: str):
+        terms = query_terms(q)
+        if not terms:
+            return query, None
+        tsq = sa.func.to_tsquery("simple", " & ".join(f"{t}:*" for t in terms))
+        query = (
+            query
+            .join(listing_search, listing_search.c.listing_id == Listing.id)
+            .filter(listing_search.c.tsv.op("@@")(tsq))
+        )
+        return query, sa.func.ts_rank(listing_search.c.tsv, tsq)
+
+    def upsert(self, connection, listing_id: int, document: str):
+        stmt = postgresql.insert(listing_search).values(
+            listing_id=listing_id,
+            document=document,
+            tsv=sa.func.to_tsvector("simple", document),
+        )
+        connection.execute(stmt.on_conflict_do_update(
+            index_elements=[listing_search.c.listing_id],
+            set_={"document": stmt.excluded.document, "tsv": stmt.excluded.tsv},
+        ))
+
+    def delete(self, connection, listing_id: int):
+        connection.execute(listing_search.delete().where(listing_search.c.listing_id == listing_id))
+
+
+_BACKENDS = {
+    "like": LikeSearch,
+    "sqlite": SqliteFtsSearch,
+    "postgresql": PostgresSearch,
+}
+_ready = {}
+
+
+def configured_backend():
+    """Backend-ul din SEARCH_BACKEND (auto = după dialect), fără verificări."""
+    choice = current_app.config.get("SEARCH_BACKEND", "auto")
+    if choice == "auto":
+        choice = db.engine.dialect.name
+    return _BACKENDS.get(choice, LikeSearch)()
+
+
+def get_backend(connection=None):
+    """
+    Backend-ul activ: cel configurat dacă tabela lui de index există și nu e
+    goală, altfel `like` (ex. DB local fără migrare / fără `flask search-reindex`).
+    """
+    backend = configured_backend()
+    key = (db.engine.url.render_as_string(), backend.name)
+    if key not in _ready:
+        if connection is not None:
+            _ready[key] = backend.ready(connection)
+        else:
+            with db.engine.connect() as conn:
+                _ready[key] = backend.ready(conn)
+    return backend if _ready[key] else LikeSearch()
+
+
+def reset_backend_cache():
+    _ready.clear()
+
+
+# --------------------
+# ORM EVENTS: index sincron cu scrierile pe Listing
+# --------------------
+@event.listens_for(Listing, "after_insert")
+@event.listens_for(Listing, "after_update")
+def _index_listing(mapper, connection, target):
+    # citim rândul din DB (în aceeași tranzacție) – nu atingem atribute
+    # amânate (defer) pe obiect în timpul flush-ului
+    backend = get_backend(connection)
+    for row in _document_rows(connection, Listing.id == target.id):
+        backend.upsert(connection, row.id, _document(row))
+
+
+@event.listens_for(Listing, "after_delete")
+def _unindex_listing(mapper, connection, target):
+    get_backend(connection).delete(connection, target.id)
@@ -0,0 +1,150 @@
+import math
+import zlib
+from datetime import datetime
+from itertools import islice
+from xml.sax.saxutils import escape
+
+from flask import current_app, url_for
+from sqlalchemy import func, select
+
+from .cache import nav_cache
+from .extensions import db
+from .models import Category, City, Listing
+
+# limita din protocolul sitemaps.org: 50.000 URL-uri / fișier
+MAX_URLS = 50_000
+
+URLSET_OPEN = '<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+URLSET_CLOSE = "</urlset>\n"
+
+
+def chunk_size() -> int:
+    return min(current_app.config.get("SITEMAP_CHUNK_SIZE", MAX_URLS), MAX_URLS)
+
+
+def _https(url: str) -> str:
+    return url.replace("http://", "https://", 1)
+
+
+def _url_template(endpoint: str, **placeholders) -> str:
+    # un singur url_for per tip de pagină, apoi doar înlocuiri de string
+    return _https(url_for(endpoint, _external=True, **placeholders))
+
+
+# --------------------
+# PAGINI (home, categorii, orașe, categorie × oraș)
+# --------------------
+def _page_urls():
+    categories, cities = nav_cache.get()
+    yield _https(url_for("public.home", _external=True))
+
+    category_tpl = _url_template("public.category_page", slug="__C__")
+    city_tpl = _url_template("public.city_page", slug="__Y__")
+    landing_tpl = _url_template("public.seo_landing", category_slug="__C__", city_slug="__Y__")
+
+    for c in categories:
+        yield category_tpl.replace("__C__", c.slug)
+    for y in cities:
+        yield city_tpl.replace("__Y__", y.slug)
+    for c in categories:
+        prefix = landing_tpl.replace("__C__", c.slug)
+        for y in cities:
+            yield prefix.replace("__Y__", y.slug)
+
+
+def page_chunk_count() -> int:
+    categories, cities = nav_cache.get()
+    total = 1 + len(categories) + len(cities) + len(categories) * len(cities)
+    return math.ceil(total / chunk_size())
+
+
+def pages_lastmod() -> datetime | None:
+    # paginile de listă se schimbă când se schimbă o listare; o categorie / un oraș
+    # nou adaugă pagini (landing-uri) -> tot lastmod nou, un singur query
+    values = db.session.execute(select(
+        select(func.max(Listing.updated_at)).scalar_subquery(),
+        select(func.max(Category.created_at)).scalar_subquery(),
+        select(func.max(City.created_at)).scalar_subquery(),
+    )).one()
+    return max((v for v in values if v is not None), default=None)
+
+
+def iter_page_chunk(n: int, lastmod: datetime | None):
+    size = chunk_size()
+    lastmod_tag = f"    <lastmod>{lastmod.date().isoformat()}</lastmod>\n" if lastmod else ""
+    yield URLSET_OPEN
+    for loc in islice(_page_urls(), n * size, (n + 1) * size):
+        yield f"  <url>\n    <loc>{escape(loc)}</loc>\n{lastmod_tag}  </url>\n"
+    yield URLSET_CLOSE
+
+
+# --------------------
+# LISTĂRI: chunk N = id în (N*size, (N+1)*size] – interval pe cheia primară
+# --------------------
+def _listing_range(n: int):
+    size = chunk_size()
+    return Listing.id > n * size, Listing.id <= (n + 1) * size
+
+
+def listing_chunks() -> list[tuple[int, datetime | None]]:
+    """[(N, max updated_at)] pentru chunk-urile care au cel puțin o listare."""
+    size = chunk_size()
+    bucket = ((Listing.id - 1) // size).label("bucket")
+    rows = db.session.execute(
+        select(bucket, func.max(Listing.updated_at)).group_by(bucket).order_by(bucket)
+    )
+    return [(int(b), lastmod) for b, lastmod in rows]
+
+
+def listing_chunk_lastmod(n: int) -> datetime | None:
+    return db.session.execute(
+        select(func.max(Listing.updated_at)).where(*_listing_range(n))
+    ).scalar()
+
+
+def iter_listing_chunk(n: int, batch: int = 1000):
+    tpl = _url_template("public.listing_page", slug="__S__")
+    stmt = (
+        select(Listing.slug, Listing.updated_at)
+        .where(*_listing_range(n))
+        .order_by(Listing.id)
+        .execution_options(yield_per=batch)  # server-side cursor pe Postgres
+    )
+    yield URLSET_OPEN
+    for slug, updated_at in db.session.execute(stmt):
+        lastmod = f"    <lastmod>{updated_at.date().isoformat()}</lastmod>\n" if updated_at else ""
+        yield f"  <url>\n    <loc>{escape(tpl.replace('__S__', slug))}</loc>\n{lastmod}  </url>\n"
+    yield URLSET_CLOSE
+
+
+# --------------------
+# INDEX + GZIP
+# --------------------
+def iter_index(base_lastmod: datetime | None):
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+    for n in range(page_chunk_count()):
+        yield _index_entry(_https(url_for("public.sitemap_pages", n=n, _external=True)), base_lastmod)
+    for n, lastmod in listing_chunks():
+        yield _index_entry(_https(url_for("public.sitemap_listings", n=n, _external=True)), lastmod)
+    yield "</sitemapindex>\n"
+
+
+def _index_entry(loc: str, lastmod: datetime | None) -> str:
+    tag = f"    <lastmod>{lastmod.replace(microsecond=0).isoformat()}+00:00</lastmod>\n" if lastmod else ""
+    return f"  <sitemap>\n    <loc>{escape(loc)}</loc>\n{tag}  </sitemap>\n"
+
+
+def gzip_stream(chunks, flush_every: int = 256):
+    """Comprimă gzip din mers: nu ține tot XML-ul în memorie."""
+    gz = zlib.compressobj(6, zlib.DEFLATED, 31)
+    pending = []
+    for piece in chunks:
+        pending.append(piece)
+        if len(pending) >= flush_every:
+            out = gz.compress("".join(pending).encode("utf-8"))
+            pending.clear()
+            if out:
+                yield out
+    out = gz.compress("".join(pending).encode("utf-8")) + gz.flush()
+    if out:
+        yield out
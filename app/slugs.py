@@ -0,0 +1,110 @@
+"""
+Alocare slug-uri unice pentru listări.
+
+- `allocate_slug(base)`: o singură interogare pe prefix (base, base-2, base-3, …)
+  în loc de câte un SELECT pentru fiecare coliziune
+- `add_with_unique_slug(item, base)`: flush într-un SAVEPOINT; dacă alt request
+  a luat între timp același slug (constrângerea UNIQUE), realocăm și reîncercăm
+- `taken_slugs_many(bases)`: aprobări în lot – toate prefixele în câteva SELECT-uri
+- `SlugAllocator.prefetch()`: importuri în masă – toate slug-urile existente
+  într-un singur SELECT, apoi alocare în memorie
+"""
+import re
+
+from sqlalchemy import or_, select
+from sqlalchemy.exc import IntegrityError
+
+from .extensions import db
+from .models import Listing
+from .utils import slugify
+
+FALLBACK_BASE = "firma"
+
+
+def base_slug(name: str) -> str:
+    return slugify(name or "") or FALLBACK_BASE
+
+
+def _prefix_filter(base: str):
+    # slugify produce doar [a-z0-9-], deci nu avem caractere speciale de scăpat.
+    # SQLite: GLOB e case-sensitive și folosește indexul UNIQUE pe slug;
+    # Postgres: LIKE 'x-%' folosește ix_listing_slug_pattern (text_pattern_ops).
+    if db.engine.dialect.name == "sqlite":
+        return Listing.slug.op("GLOB")(f"{base}-[0-9]*")
+    return Listing.slug.like(f"{base}-%")
+
+
+class SlugAllocator:
+    """Alocare în memorie peste un set de slug-uri deja ocupate."""
+
+    def __init__(self, taken=()):
+        self.taken = set(taken)
+        self._next = {}  # base -> primul sufix încă neverificat
+
+    @classmethod
+    def prefetch(cls):
+        return cls(db.session.execute(select(Listing.slug)).scalars())
+
+    def allocate(self, base: str) -> str:
+        if base not in self.taken:
+            self.taken.add(base)
+            return base
+        # cel mai mic sufix liber >= 2; setul doar crește, deci continuăm de unde am rămas
+        i = self._next.get(base, 2)
+        while f"{base}-{i}" in self.taken:
+            i += 1
+        slug = f"{base}-{i}"
+        self._next[base] = i + 1
+        self.taken.add(slug)
+        return slug
+
+
+_SUFFIX = re.compile(r"-(\d+)$")
+
+
+def taken_slugs_many(bases, chunk: int = 200) -> set[str]:
+    """Slug-urile ocupate pentru mai multe baze: un SELECT la fiecare `chunk` baze."""
+    bases = sorted(set(bases))
+    wanted = set(bases)
+    taken = set()
+    for i in range(0, len(bases), chunk):
+        part = bases[i:i + chunk]
+        taken.update(db.session.execute(
+            select(Listing.slug).where(or_(Listing.slug.in_(part), *[_prefix_filter(b) for b in part]))
+        ).scalars())
+    # păstrăm doar base și base-<număr> (nu și „base-nou”, care e alt prefix)
+    return {s for s in taken if s in wanted or (_SUFFIX.search(s) and s.rsplit("-", 1)[0] in wanted)}
+
+
+def taken_slugs(base: str) -> set[str]:
+    return taken_slugs_many([base])
+
+
+def allocate_slug(base: str) -> str:
+    return SlugAllocator(taken_slugs(base)).allocate(base)
+
+
+def add_with_unique_slug(item: Listing, name: str, attempts: int = 5) -> Listing:
+    """
+    Setează item.slug și face flush într-un SAVEPOINT. La coliziune pe slug
+    (request concurent) reîncearcă; alte erori de integritate se propagă.
+    """
+    base = base_slug(name)
+    lost = set()
+    # restul modificărilor pendinte intră înainte de SAVEPOINT, ca un rollback
+    # al lui să nu le anuleze
+    db.session.flush()
+    for _ in range(attempts):
+        allocator = SlugAllocator(taken_slugs(base) | lost)
+        item.slug = allocator.allocate(base)
+        try:
+            with db.session.begin_nested():
+                db.session.add(item)
+                db.session.flush()
+            return item
+        except IntegrityError:
+            exists = db.session.execute(select(Listing.id).where(Listing.slug == item.slug)).first()
+            if not exists:
+                raise  # altă constrângere (ex. phone_key), nu slug-ul
+            lost.add(item.slug)
+    raise RuntimeError(f"nu am putut aloca un slug unic pentru {base!r}")
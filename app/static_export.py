@@ -0,0 +1,218 @@
+"""
+Export static al paginilor publice (pentru CDN / object storage).
+
+- randare în paralel: fiecare proces din pool își face propriul app + test_client
+- fiecare pagină -> <path>/index.html + .gz (+ .br dacă e instalat `brotli`)
+- incremental: re-randăm doar paginile atinse de listările cu updated_at mai
+  nou decât ultimul export (plus cele mutate / șterse, detectate din manifest)
+
+Doar prima pagină din listele paginate (fără ?after=) – restul rămân dinamice.
+"""
+import gzip
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+from sqlalchemy import select
+
+from .cache import nav_cache
+from .extensions import db
+from .models import Listing
+
+try:  # opțional – fără el scriem doar .gz
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+MANIFEST = ".export-manifest.json"
+STATIC_PATHS = ("/", "/impressum", "/datenschutz")
+
+
+# --------------------
+# CE PAGINI EXISTĂ
+# --------------------
+def category_path(slug: str) -> str:
+    return f"/category/{slug}"
+
+
+def city_path(slug: str) -> str:
+    return f"/city/{slug}"
+
+
+def landing_path(category_slug: str, city_slug: str) -> str:
+    return f"/servicii/{category_slug}/{city_slug}"
+
+
+def listing_path(slug: str) -> str:
+    return f"/listing/{slug}"
+
+
+def listing_rows() -> dict[int, tuple]:
+    """{id: (slug, category_id, city_id, updated_at)} – o singură interogare pe coloane."""
+    stmt = select(Listing.id, Listing.slug, Listing.category_id, Listing.city_id, Listing.updated_at)
+    return {row.id: tuple(row[1:]) for row in db.session.execute(stmt)}
+
+
+def all_paths(listings: dict[int, tuple]) -> list[str]:
+    categories, cities = nav_cache.get()
+    paths = list(STATIC_PATHS)
+    paths += [category_path(c.slug) for c in categories]
+    paths += [city_path(y.slug) for y in cities]
+    paths += [landing_path(c.slug, y.slug) for c in categories for y in cities]
+    paths += [listing_path(slug) for slug, *_ in listings.values()]
+    return paths
+
+
+def changed_paths(listings: dict[int, tuple], manifest: dict) -> tuple[list[str], list[str]]:
+    """
+    (de randat, de șters) față de exportul anterior. Listă goală de randat
+    nu înseamnă nimic de făcut: home se randează mereu (are „cele mai noi”).
+    """
+    categories, cities = nav_cache.get()
+    category_slugs = {c.id: c.slug for c in categories}
+    city_slugs = {y.id: y.slug for y in cities}
+
+    since = datetime.fromisoformat(manifest["watermark"]) if manifest.get("watermark") else None
+    previous = {int(k): v for k, v in manifest.get("listings", {}).items()}
+
+    render, remove = {"/"}, set()
+    touched = set()  # (category_id, city_id)
+
+    for listing_id, (slug, category_id, city_id, updated_at) in listings.items():
+        old = previous.get(listing_id)
+        if old is None or (since and updated_at > since) or old[:3] != [slug, category_id, city_id]:
+            render.add(listing_path(slug))
+            touched.add((category_id, city_id))
+            if old is not None:
+                touched.add((old[1], old[2]))
+                if old[0] != slug:
+                    remove.add(listing_path(old[0]))
+
+    for listing_id, (slug, category_id, city_id) in previous.items():
+        if listing_id not in listings:
+            remove.add(listing_path(slug))
+            touched.add((category_id, city_id))
+
+    for category_id, city_id in touched:
+        if category_id in category_slugs:
+            render.add(category_path(category_slugs[category_id]))
+        if city_id in city_slugs:
+            render.add(city_path(city_slugs[city_id]))
+        if category_id in category_slugs and city_id in city_slugs:
+            render.add(landing_path(category_slugs[category_id], city_slugs[city_id]))
+
+    return sorted(render), sorted(remove - render)
+
+
+# --------------------
+# FIȘIERE
+# --------------------
+def output_file(out_dir: str, path: str) -> str:
+    rel = path.strip("/")
+    return os.path.join(out_dir, rel, "index.html") if rel else os.path.join(out_dir, "index.html")
+
+
+def _write_if_changed(filename: str, data: bytes) -> bool:
+    try:
+        with open(filename, "rb") as f:
+            if f.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
+    tmp = f"{filename}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, filename)  # atomic: CDN-ul nu vede fișiere pe jumătate scrise
+    return True
+
+
+def write_page(out_dir: str, path: str, html: bytes) -> bool:
+    filename = output_file(out_dir, path)
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    if not _write_if_changed(filename, html):
+        return False
+    _write_if_changed(filename + ".gz", gzip.compress(html, compresslevel=9, mtime=0))
+    if brotli is not None:
+        _write_if_changed(filename + ".br", brotli.compress(html, quality=11))
+    return True
+
+
+def remove_page(out_dir: str, path: str):
+    filename = output_file(out_dir, path)
+    for name in (filename, filename + ".gz", filename + ".br"):
+        if os.path.exists(name):
+            os.remove(name)
+    try:
+        os.rmdir(os.path.dirname(filename))  # doar dacă a rămas gol
+    except OSError:
+        pass
+
+
+def load_manifest(out_dir: str) -> dict:
+    try:
+        with open(os.path.join(out_dir, MANIFEST), encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_manifest(out_dir: str, listings: dict[int, tuple]):
+    watermark = max((row[3] for row in listings.values()), default=None)
+    data = {
+        "nav": nav_cache.fingerprint(),
+        "watermark": watermark.isoformat() if watermark else None,
+        "listings": {str(i): [slug, cat, city] for i, (slug, cat, city, _) in listings.items()},
+    }
+    tmp = os.path.join(out_dir, MANIFEST + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, separators=(",", ":"))
+    os.replace(tmp, os.path.join(out_dir, MANIFEST))
+
+
+# --------------------
+# RANDARE ÎN PROCESE
+# --------------------
+_worker = {}
+
+
+def _init_worker(base_url: str, out_dir: str):
+    from . import create_app
+
+    app = create_app()
+    app.config["PAGE_CACHE_ENABLED"] = False  # fiecare pagină e randată o singură dată
+    _worker.update(client=app.test_client(), base_url=base_url, out_dir=out_dir)
+
+
+def _render_batch(paths: list[str]) -> tuple[int, int, list[str]]:
+    client, base_url, out_dir = _worker["client"], _worker["base_url"], _worker["out_dir"]
+    written = unchanged = 0
+    failed = []
+    for path in paths:
+        resp = client.get(path, base_url=base_url)
+        if resp.status_code != 200:
+            failed.append(f"{path} ({resp.status_code})")
+            continue
+        if write_page(out_dir, path, resp.get_data()):
+            written += 1
+        else:
+            unchanged += 1
+    return written, unchanged, failed
+
+
+def render_pages(paths: list[str], out_dir: str, base_url: str, workers: int, batch: int = 200):
+    """Randează `paths` în `workers` procese; întoarce (scrise, neschimbate, eșuate)."""
+    written = unchanged = 0
+    failed = []
+    batches = [paths[i:i + batch] for i in range(0, len(paths), batch)]
+
+    # conexiunile deschise nu au voie să treacă prin fork în procesele copil
+    db.engine.dispose()
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(base_url, out_dir)) as pool:
+        for future in as_completed([pool.submit(_render_batch, b) for b in batches]):
+            w, u, f = future.result()
+            written += w
+            unchanged += u
+            failed += f
+    return written, unchanged, failed
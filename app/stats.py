@@ -0,0 +1,234 @@
+"""
+Contoare pentru dashboard (tabela stat_counter), ținute la zi incremental.
+
+- evenimentele ORM pe Listing / Submission adună delte în session.info
+- after_flush le aplică în aceeași tranzacție (value = value + delta), deci un
+  rollback le anulează odată cu scrierea care le-a produs
+- scrierile care ocolesc ORM-ul (importul prin Core, query.update) sunt
+  corectate de `reconcile()` – `flask stats-reconcile`, rulat periodic (cron)
+"""
+from collections import Counter
+
+from sqlalchemy import case, event, func, inspect, select, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, object_session
+
+from .extensions import db
+from .models import Listing, StatCounter, Submission
+
+LISTINGS = "listings"
+FEATURED = "listings:featured"
+VERIFIED = "listings:verified"
+SUBMISSION_STATUSES = ("PENDING", "APPROVED", "REJECTED")
+
+
+def category_key(category_id) -> str:
+    return f"category:{category_id}"
+
+
+def city_key(city_id) -> str:
+    return f"city:{city_id}"
+
+
+def submission_key(status) -> str:
+    return f"submissions:{status or 'PENDING'}"
+
+
+def _prefix_range(prefix: str):
+    # "category:" <= name < "category;" – interval pe cheia primară
+    return (StatCounter.name >= prefix) & (StatCounter.name < prefix[:-1] + chr(ord(prefix[-1]) + 1))
+
+
+# --------------------
+# CITIRE (dashboard)
+# --------------------
+def counts() -> dict:
+    """Totalurile + toate categoriile, într-un singur SELECT pe cheia primară."""
+    totals = [LISTINGS, FEATURED, VERIFIED, *[submission_key(s) for s in SUBMISSION_STATUSES]]
+    rows = db.session.execute(
+        select(StatCounter.name, StatCounter.value)
+        .where(StatCounter.name.in_(totals) | _prefix_range("category:"))
+    )
+    out = dict.fromkeys(totals, 0)
+    out.update(rows.all())
+    return out
+
+
+def breakdown(counts_: dict, prefix: str) -> dict[int, int]:
+    """{id: număr} din rezultatul lui counts(), ex. prefix "category:"."""
+    return {int(name[len(prefix):]): value for name, value in counts_.items() if name.startswith(prefix) and value}
+
+
+def prefix_counts(prefix: str) -> dict[int, int]:
+    """{id: număr} pentru un prefix ("city:"), un SELECT pe intervalul cheii primare."""
+    rows = db.session.execute(
+        select(StatCounter.name, StatCounter.value).where(_prefix_range(prefix), StatCounter.value > 0)
+    )
+    return {int(name[len(prefix):]): value for name, value in rows}
+
+
+def top_cities(limit: int = 10) -> list[tuple[int, int]]:
+    rows = db.session.execute(
+        select(StatCounter.name, StatCounter.value)
+        .where(_prefix_range("city:"), StatCounter.value > 0)
+        .order_by(StatCounter.value.desc())
+        .limit(limit)
+    )
+    return [(int(name[len("city:"):]), value) for name, value in rows]
+
+
+# --------------------
+# SCRIERE
+# --------------------
+def _apply(connection, deltas: dict):
+    """UPSERT value = value + delta; în ordine fixă, ca lock-urile să nu se încrucișeze."""
+    rows = [{"name": name, "value": delta} for name, delta in sorted(deltas.items()) if delta]
+    if not rows:
+        return
+    insert = postgresql.insert if connection.dialect.name == "postgresql" else sqlite.insert
+    stmt = insert(StatCounter.__table__)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[StatCounter.__table__.c.name],
+        set_={"value": StatCounter.__table__.c.value + stmt.excluded.value},
+    )
+    connection.execute(stmt, rows)
+
+
+def _listing_keys(featured, verified, category_id, city_id) -> list[str]:
+    keys = [LISTINGS, category_key(category_id), city_key(city_id)]
+    if featured:
+        keys.append(FEATURED)
+    if verified:
+        keys.append(VERIFIED)
+    return keys
+
+
+def _old_value(state, attr: str):
+    history = state.attrs[attr].history
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(state.object, attr)
+
+
+def _pending(target) -> Counter | None:
+    session = object_session(target)
+    if session is None:
+        return None
+    return session.info.setdefault("stat_deltas", Counter())
+
+
+def listings_inserted(session, rows):
+    """Pentru inserări prin Core (fără evenimente ORM): deltele intră la următorul flush."""
+    deltas = session.info.setdefault("stat_deltas", Counter())
+    for r in rows:
+        deltas.update(_listing_keys(r.get("featured"), r.get("verified"), r["category_id"], r["city_id"]))
+
+
+# --------------------
+# ORM EVENTS
+# --------------------
+@event.listens_for(Listing, "after_insert")
+def _listing_inserted(mapper, connection, target):
+    deltas = _pending(target)
+    if deltas is not None:
+        deltas.update(_listing_keys(target.featured, target.verified, target.category_id, target.city_id))
+
+
+@event.listens_for(Listing, "after_delete")
+def _listing_deleted(mapper, connection, target):
+    deltas = _pending(target)
+    if deltas is not None:
+        deltas.subtract(_listing_keys(target.featured, target.verified, target.category_id, target.city_id))
+
+
+@event.listens_for(Listing, "after_update")
+def _listing_updated(mapper, connection, target):
+    deltas = _pending(target)
+    if deltas is None:
+        return
+    state = inspect(target)
+    attrs = ("featured", "verified", "category_id", "city_id")
+    if not any(state.attrs[a].history.has_changes() for a in attrs):
+        return
+    deltas.subtract(_listing_keys(*[_old_value(state, a) for a in attrs]))
+    deltas.update(_listing_keys(*[getattr(target, a) for a in attrs]))
+
+
+@event.listens_for(Submission, "after_insert")
+def _submission_inserted(mapper, connection, target):
+    deltas = _pending(target)
+    if deltas is not None:
+        deltas[submission_key(target.status)] += 1
+
+
+@event.listens_for(Submission, "after_delete")
+def _submission_deleted(mapper, connection, target):
+    deltas = _pending(target)
+    if deltas is not None:
+        deltas[submission_key(target.status)] -= 1
+
+
+@event.listens_for(Submission, "after_update")
+def _submission_updated(mapper, connection, target):
+    deltas = _pending(target)
+    history = inspect(target).attrs.status.history
+    if deltas is not None and history.has_changes():
+        deltas[submission_key(history.deleted[0] if history.deleted else None)] -= 1
+        deltas[submission_key(target.status)] += 1
+
+
+@event.listens_for(Session, "after_flush")
+def _flush_deltas(session, flush_context):
+    deltas = session.info.pop("stat_deltas", None)
+    if deltas:
+        _apply(session.connection(), deltas)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_deltas(session):
+    session.info.pop("stat_deltas", None)
+
+
+# --------------------
+# RECONCILIERE
+# --------------------
+def actual_counts(connection) -> dict:
+    """Valorile adevărate, din GROUP BY pe tabelele sursă."""
+    out = Counter()
+    total, featured, verified = connection.execute(select(
+        func.count(),
+        func.coalesce(func.sum(case((Listing.featured, 1), else_=0)), 0),
+        func.coalesce(func.sum(case((Listing.verified, 1), else_=0)), 0),
+    )).one()
+    out.update({LISTINGS: total, FEATURED: featured, VERIFIED: verified})
+    for category_id, n in connection.execute(select(Listing.category_id, func.count()).group_by(Listing.category_id)):
+        out[category_key(category_id)] = n
+    for city_id, n in connection.execute(select(Listing.city_id, func.count()).group_by(Listing.city_id)):
+        out[city_key(city_id)] = n
+    status = func.coalesce(Submission.status, "PENDING")
+    for status_, n in connection.execute(select(status, func.count()).group_by(status)):
+        out[submission_key(status_)] = n
+    return out
+
+
+def reconcile() -> dict[str, tuple[int, int]]:
+    """
+    Corectează contoarele față de GROUP BY; întoarce {nume: (stocat, real)}
+    pentru cele care difereau. Commit-ul rămâne la apelant.
+    """
+    conn = db.session.connection()
+    if conn.dialect.name == "postgresql":
+        # așteaptă tranzacțiile care au incrementat deja (și le vede după commit),
+        # iar incrementele noi așteaptă reconcilierea
+        conn.execute(text("LOCK TABLE stat_counter IN EXCLUSIVE MODE"))
+    actual = actual_counts(conn)
+    stored = dict(conn.execute(select(StatCounter.name, StatCounter.value)).all())
+
+    drift = {}
+    for name in stored.keys() | actual.keys():
+        old, new = stored.get(name, 0), actual.get(name, 0)
+        if old != new:
+            drift[name] = (old, new)
+    _apply(conn, {name: new - old for name, (old, new) in drift.items()})
+    conn.execute(StatCounter.__table__.delete().where(StatCounter.value == 0))
+    return drift
@@ -1,31 +1,9 @@
 from slugify import slugify as _slugify
-import requests
-import smtplib
-from email.message import EmailMessage
-import os
+from urllib.parse import urlsplit
 import re
 
-def send_contact_email(name: str, sender_email: str, message: str):
-    msg = EmailMessage()
-    msg["Subject"] = f"Mesaj nou – Contact Servicii RO"
-    msg["From"] = os.getenv("MAIL_USERNAME")
-    msg["To"] = os.getenv("MAIL_USERNAME")
-    msg["Reply-To"] = sender_email
-
-    msg.set_content(f"""
-Nume: {name}
-Email: {sender_email}
-
-Mesaj:
-{message}
-""")
-
-    with smtplib.SMTP_SSL("smtp.gmail.com", 465) as smtp:
-        smtp.login(
-            os.getenv("MAIL_USERNAME"),
-            os.getenv("MAIL_PASSWORD")
-        )
-        smtp.send_message(msg)
+# domenii comune multor firme: nu identifică o firmă (dedup)
+GENERIC_DOMAINS = {"facebook.com", "instagram.com", "google.com", "goo.gl", "linktr.ee", "jameda.de", "doctolib.de"}
 
 def slugify(text: str) -> str:
     return _slugify(text)
@@ -40,30 +18,26 @@ def languages_from_str(s: str | None) -> list[str]:
 
 def geocode_location(query: str):
     """
-    Transformă text (oraș / PLZ / adresă) în lat/lng folosind Nominatim
+    Transformă text (oraș / PLZ / adresă) în lat/lng:
+    - oraș / PLZ -> gazetteer local (app/gazetteer.py), fără rețea
+    - adresă cu stradă (sau localitate necunoscută) -> Nominatim, cu cache (app/geocode.py)
     """
     if not query:
         return None, None
 
-    url = "https://nominatim.openstreetmap.org/search"
-    params = {
-        "q": query,
-        "format": "json",
-        "limit": 1
-    }
-    headers = {
-        "User-Agent": "servicii-ro-germania"
-    }
+    from .gazetteer import gazetteer, looks_like_address
+    from .geocode import geocoder
 
-    try:
-        r = requests.get(url, params=params, headers=headers, timeout=5)
-        data = r.json()
-        if data:
-            return float(data[0]["lat"]), float(data[0]["lon"])
-    except Exception:
-        pass
+    if not looks_like_address(query):
+        lat, lng = gazetteer.resolve(query)
+        if lat is not None:
+            return lat, lng
 
-    return None, None
+    lat, lng = geocoder.lookup(query)
+    if lat is None:
+        # adresă negăsită: măcar centrul PLZ-ului / orașului
+        lat, lng = gazetteer.resolve(query)
+    return lat, lng
 
 def phone_key(raw: str) -> str | None:
     """
@@ -80,4 +54,19 @@ def phone_key(raw: str) -> str | None:
     if len(digits) < 6:
         return None
 
-    return digits
\ No newline at end of file
+    return digits
+
+def website_domain(url: str | None) -> str | None:
+    """
+    "https://www.praxis-pop.de/kontakt" -> "praxis-pop.de"; None pentru
+    domeniile generice (facebook.com, ...). Salvat în Listing.website_domain
+    (indexat) pentru căutarea duplicatelor prin egalitate.
+    """
+    if not url:
+        return None
+    try:
+        host = urlsplit(url if "//" in url else f"//{url}").hostname or ""
+    except ValueError:
+        return None
+    host = host.removeprefix("www.")
+    return host[:255] if host and host not in GENERIC_DOMAINS else None
@@ -0,0 +1,49 @@
+"""
+Configurația gunicorn (citită automat din directorul curent):
+
+    gunicorn manage:app
+
+Pool-ul DB din fiecare worker e dimensionat după aceleași GUNICORN_THREADS
+(app/config.py -> app/dbpool.py, profilul "web"), deci conexiunile totale la
+Postgres sunt cel mult WEB_CONCURRENCY × (GUNICORN_THREADS + max_overflow).
+"""
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+
+# Heroku setează WEB_CONCURRENCY după dyno; local: nucleele, plafonat
+workers = int(os.getenv("WEB_CONCURRENCY", str(min(multiprocessing.cpu_count() * 2 + 1, 8))))
+threads = int(os.getenv("GUNICORN_THREADS", "4"))
+worker_class = "gthread"
+
+# aplicația (importuri, gazetteer, rute) se încarcă o dată în master și e
+# partajată copy-on-write; conexiunile DB NU se moștenesc – vezi post_fork
+preload_app = os.getenv("GUNICORN_PRELOAD", "1") == "1"
+
+# peste statement_timeout (5 s în profilul web), ca DB-ul să renunțe primul
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = 20
+keepalive = 5
+
+# reciclăm workerii periodic (fragmentare memorie), decalat ca să nu repornească toți odată
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "2000"))
+max_requests_jitter = 200
+
+# heartbeat-ul workerilor în RAM, nu pe disc (container / dyno)
+worker_tmp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+accesslog = "-"
+errorlog = "-"
+loglevel = os.getenv("GUNICORN_LOG_LEVEL", "info")
+
+
+def post_fork(server, worker):
+    # cu preload_app, un engine deschis în master ar împărți socket-urile între
+    # workeri; fiecare worker pornește cu pool-uri goale (primary + replică)
+    from app.extensions import db
+
+    app = worker.app.wsgi()
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
@@ -51,6 +51,17 @@ def get_metadata():
     return target_db.metadata
 
 
+def include_name(name, type_, parent_names):
+    # indexul full-text (app/search.py) e gestionat de mână, nu prin modele:
+    # listing_search (Postgres), listing_fts + tabelele interne FTS5 (SQLite)
+    if type_ == "table" and name and name.startswith(("listing_fts", "listing_search")):
+        return False
+    # index doar pe Postgres (text_pattern_ops), vezi app/slugs.py
+    if type_ == "index" and name == "ix_listing_slug_pattern":
+        return False
+    return True
+
+
 def run_migrations_offline():
     """Run migrations in 'offline' mode.
 
@@ -65,7 +76,8 @@ def run_migrations_offline():
     """
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
-        url=url, target_metadata=get_metadata(), literal_binds=True
+        url=url, target_metadata=get_metadata(), literal_binds=True,
+        include_name=include_name
     )
 
     with context.begin_transaction():
@@ -100,6 +112,7 @@ def run_migrations_online():
         context.configure(
             connection=connection,
             target_metadata=get_metadata(),
+            include_name=include_name,
             **conf_args
         )
 
@@ -0,0 +1,31 @@
+"""listing slug prefix index (postgres text_pattern_ops)
+
+Revision ID: 5f0c2a7d9b13
+Revises: 2b4370ab32e5
+Create Date: 2026-10-17 20:14:37.502118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5f0c2a7d9b13'
+down_revision = '2b4370ab32e5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Postgres cu collation non-C nu poate folosi indexul UNIQUE pe slug pentru
+    # LIKE 'prefix-%' (app/slugs.py). SQLite folosește GLOB pe indexul existent.
+    if op.get_bind().dialect.name == "postgresql":
+        op.create_index(
+            'ix_listing_slug_pattern', 'listing', ['slug'],
+            postgresql_ops={'slug': 'text_pattern_ops'},
+        )
+
+
+def downgrade():
+    if op.get_bind().dialect.name == "postgresql":
+        op.drop_index('ix_listing_slug_pattern', table_name='listing')
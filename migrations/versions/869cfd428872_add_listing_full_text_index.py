@@ -0,0 +1,91 @@
+"""add listing full-text index (postgres tsvector / sqlite fts5)
+
+Revision ID: 869cfd428872
+Revises: 699f1e0024e5
+Create Date: 2026-10-17 19:02:11.412870
+
+"""
+import re
+import unicodedata
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '869cfd428872'
+down_revision = '699f1e0024e5'
+branch_labels = None
+depends_on = None
+
+# același text ca app/search.py::fold_text / _document (copie: migrarea nu importă app)
+_GERMAN = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss"})
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _strip_marks(text_):
+    text_ = text_.lower().replace("ß", "ss")
+    return "".join(c for c in unicodedata.normalize("NFKD", text_) if not unicodedata.combining(c))
+
+
+def _fold(text_):
+    words = []
+    for word in _WORD_RE.findall((text_ or "").lower()):
+        plain = _strip_marks(word)
+        words.append(plain)
+        german = word.translate(_GERMAN)
+        if german != word:
+            german = _strip_marks(german)
+            if german != plain:
+                words.append(german)
+    return " ".join(words)
+
+
+def _fill(conn, insert_sql, batch=2000):
+    # get_backend() folosește indexul imediat ce tabela există: gol = zero rezultate la ?q=
+    last_id = 0
+    while True:
+        rows = conn.execute(sa.text(
+            "SELECT l.id, l.name, l.description, l.languages, c.name AS category, ci.name AS city "
+            "FROM listing l JOIN category c ON c.id = l.category_id JOIN city ci ON ci.id = l.city_id "
+            "WHERE l.id > :last ORDER BY l.id LIMIT :batch"
+        ), {"last": last_id, "batch": batch}).fetchall()
+        if not rows:
+            return
+        conn.execute(sa.text(insert_sql), [
+            {"id": r.id, "doc": " ".join(_fold(x) for x in (r.name, r.description, r.category, r.city, r.languages) if x)}
+            for r in rows
+        ])
+        last_id = rows[-1].id
+
+
+def upgrade():
+    # Tabelele de index nu sunt în metadata modelelor (depind de dialect),
+    # de aceea migrarea e scrisă de mână. Reconstruire ulterioară: `flask search-reindex`.
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        op.create_table('listing_search',
+        sa.Column('listing_id', sa.Integer(), nullable=False),
+        sa.Column('document', sa.Text(), nullable=False),
+        sa.Column('tsv', postgresql.TSVECTOR(), nullable=False),
+        sa.ForeignKeyConstraint(['listing_id'], ['listing.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('listing_id')
+        )
+        op.create_index('ix_listing_search_tsv', 'listing_search', ['tsv'], unique=False, postgresql_using='gin')
+        _fill(bind, "INSERT INTO listing_search (listing_id, document, tsv) VALUES (:id, :doc, to_tsvector('simple', :doc))")
+    elif bind.dialect.name == "sqlite":
+        op.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS listing_fts "
+            "USING fts5(document, tokenize='unicode61 remove_diacritics 2')"
+        )
+        _fill(bind, "INSERT INTO listing_fts (rowid, document) VALUES (:id, :doc)")
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        op.drop_index('ix_listing_search_tsv', table_name='listing_search', postgresql_using='gin')
+        op.drop_table('listing_search')
+    elif bind.dialect.name == "sqlite":
+        op.execute("DROP TABLE IF EXISTS listing_fts")
@@ -0,0 +1,80 @@
+"""
+Benchmark API JSON (/api/v1/listings) vs. paginile HTML cu aceleași filtre.
+
+    DATABASE_URL=sqlite:///app/app.db python scripts/bench_api.py
+    DATABASE_URL=sqlite:///app/app.db python scripts/bench_api.py --requests 500 --page-cache
+
+Apelează rutele cu test_client (fără rețea, fără gunicorn): măsoară doar
+lucrul făcut de aplicație – query-uri, randare / serializare. Cache-ul de
+pagini e oprit implicit, ca HTML-ul să fie randat la fiecare request; ETag-urile
+nu intră în joc (nu trimitem If-None-Match).
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app import create_app  # noqa: E402
+from app.api import routes as api_routes  # noqa: E402
+from app.models import Category, City  # noqa: E402
+from app.querycount import count_queries  # noqa: E402
+
+# (HTML, JSON) cu aceleași filtre
+PAIRS = [
+    ("/", "/api/v1/listings"),
+    ("/category/{category}", "/api/v1/listings?category={category}"),
+    ("/category/{category}?verified=1", "/api/v1/listings?category={category}&verified=1"),
+    ("/city/{city}", "/api/v1/listings?city={city}"),
+    ("/servicii/{category}/{city}", "/api/v1/listings?category={category}&city={city}"),
+]
+SPARSE = "&fields=slug,name,city,phone"
+
+
+def measure(app, client, url: str, n: int) -> tuple[float, int, float]:
+    """(request-uri / s, bytes / răspuns, query-uri / request)"""
+    with app.app_context():
+        engines = list(app.extensions["sqlalchemy"].engines.values())
+    client.get(url)  # încălzire: nav_cache, template-uri compilate
+    size = 0
+    with count_queries(engines) as statements:
+        started = time.perf_counter()
+        for _ in range(n):
+            resp = client.get(url)
+            assert resp.status_code == 200, f"GET {url} -> {resp.status_code}"
+            size = len(resp.get_data())
+        elapsed = time.perf_counter() - started
+    return n / elapsed, size, len(statements) / n
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API JSON vs. HTML: request-uri / secundă.")
+    parser.add_argument("--requests", type=int, default=200, help="Request-uri per rută.")
+    parser.add_argument("--page-cache", action="store_true", help="Lasă PAGE_CACHE activ pentru HTML.")
+    args = parser.parse_args()
+
+    app = create_app()
+    app.config["PAGE_CACHE_ENABLED"] = args.page_cache
+    with app.app_context():
+        category = Category.query.first()
+        city = City.query.first()
+        if not (category and city):
+            sys.exit("DB goală: rulează seed.py / importul înainte.")
+        params = {"category": category.slug, "city": city.slug}
+
+    client = app.test_client()
+    serializer = "orjson" if api_routes.orjson is not None else "json (stdlib)"
+    print(f"serializare: {serializer}; {args.requests} request-uri / rută; page cache: {'da' if args.page_cache else 'nu'}\n")
+    print(f"{'rută':<58} {'req/s':>8} {'KB':>7} {'SQL/req':>8}")
+    for html, api in PAIRS:
+        rows = []
+        for url in (html.format(**params), api.format(**params), api.format(**params) + (SPARSE if "?" in api else "?" + SPARSE[1:])):
+            rps, size, queries = measure(app, client, url, args.requests)
+            rows.append(rps)
+            print(f"{url[:58]:<58} {rps:>8.0f} {size / 1024:>7.1f} {queries:>8.1f}")
+        print(f"{'':<58} {'JSON / HTML: ×%.1f, câmpuri rare: ×%.1f' % (rows[1] / rows[0], rows[2] / rows[0])}\n")
+
+
+if __name__ == "__main__":
+    main()
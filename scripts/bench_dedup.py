@@ -0,0 +1,115 @@
+"""
+Benchmark detecție duplicate: blocking + scor vs. comparația naivă n².
+
+    python scripts/bench_dedup.py                        # 500k listări sintetice, 2% duplicate
+    python scripts/bench_dedup.py --listings 100000 --dup-rate 0.05
+    python scripts/bench_dedup.py --naive-sample 3000    # n² pe un eșantion, extrapolat
+
+Datele sunt generate în memorie (nu atinge DB-ul); duplicatele injectate au
+nume / adresă ușor modificate, ca să măsurăm și recall-ul.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.dedup import DEFAULT_THRESHOLD, Record, find_duplicates, score  # noqa: E402
+
+FIRST = ["Andrei", "Maria", "Ion", "Elena", "Mihai", "Ana", "Gheorghe", "Ioana", "Vasile", "Cristina",
+         "Florin", "Daniela", "Adrian", "Raluca", "Bogdan", "Simona", "Lukas", "Anna", "Jonas", "Lea"]
+LAST = ["Popescu", "Ionescu", "Popa", "Dumitru", "Stan", "Stoica", "Gheorghe", "Rusu", "Munteanu", "Matei",
+        "Constantin", "Moldovan", "Barbu", "Nistor", "Florea", "Lungu", "Ene", "Tudor", "Dinu", "Sandu",
+        "Müller", "Schmidt", "Schneider", "Fischer", "Weber", "Meyer", "Wagner", "Becker", "Hoffmann", "Koch"]
+# nume de familie compuse din silabe: destulă varietate, ca în date reale
+ROOTS = ["Pop", "Ion", "Stan", "Dum", "Mar", "Con", "Vas", "Rad", "Nic", "Bog", "Flor", "Mih", "Cos", "Dan",
+         "Tud", "Lup", "Cri", "Gav", "Ilie", "Oan", "Sav", "Tom", "Zah", "Bal", "Chir", "Mun", "Ner", "Pet"]
+SUFFIX = ["escu", "eanu", "ovici", "aru", "ache", "ea", "oiu", "ian", "ita", "uta", "oaie", "aş", "ciuc", "ariu"]
+PREFIX = ["Zahnarztpraxis", "Kanzlei", "Dr. med.", "Praxis", "Cabinet", "Traduceri", "Salon", "Bau", "Steuerbüro", ""]
+STREETS = ["Haupt", "Bahnhof", "Schul", "Garten", "Dorf", "Berliner", "Linden", "Kirch", "Wald", "Werdener",
+           "Ring", "Berg", "Mühlen", "Birken", "Rosen", "Goethe", "Schiller", "Friedrich", "Blumen", "Eichen"]
+STREET_TYPES = ["straße", "str.", "weg", "allee", "platz"]
+
+
+def _typo(text_: str, rng: random.Random) -> str:
+    if len(text_) < 4:
+        return text_
+    i = rng.randrange(1, len(text_) - 1)
+    op = rng.choice(("swap", "drop", "double"))
+    if op == "swap":
+        return text_[:i] + text_[i + 1] + text_[i] + text_[i + 2:]
+    if op == "drop":
+        return text_[:i] + text_[i + 1:]
+    return text_[:i] + text_[i] + text_[i:]
+
+
+def generate(n: int, cities: int, dup_rate: float, seed: int):
+    rng = random.Random(seed)
+    # distribuție Zipf: câteva orașe mari, multe mici
+    weights = [1 / (i + 1) for i in range(cities)]
+    city_ids = rng.choices(range(1, cities + 1), weights=weights, k=n)
+    records, truth = [], set()
+    next_id = 1
+    for city_id in city_ids:
+        last = rng.choice(LAST) if rng.random() < 0.2 else rng.choice(ROOTS) + rng.choice(SUFFIX)
+        name = f"{rng.choice(PREFIX)} {rng.choice(FIRST)} {last}".strip()
+        plz = f"{10000 + city_id * 40 + rng.randrange(40):05d}"
+        address = f"{rng.choice(STREETS)}{rng.choice(STREET_TYPES)} {rng.randrange(1, 120)}, {plz}"
+        phone = f"49{rng.randrange(10**9, 10**10)}"
+        records.append(Record.build(next_id, name, city_id, address, (phone,)))
+        if rng.random() < dup_rate:
+            # aceeași firmă, introdusă din nou cu greșeli / ordine schimbată / fără telefon
+            words = name.split()
+            if rng.random() < 0.3:
+                words = words[-1:] + words[:-1]
+            dup_name = " ".join(_typo(w, rng) if rng.random() < 0.4 else w for w in words)
+            dup_address = address.replace("straße", "str.") if rng.random() < 0.5 else address
+            dup_phone = phone if rng.random() < 0.3 else None
+            records.append(Record.build(next_id + 1, dup_name, city_id, dup_address, (dup_phone,)))
+            truth.add((next_id, next_id + 1))
+            next_id += 1
+        next_id += 1
+    return records, truth
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--listings", type=int, default=500_000)
+    parser.add_argument("--cities", type=int, default=2000)
+    parser.add_argument("--dup-rate", type=float, default=0.02)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--naive-sample", type=int, default=2000, help="n² pe primele N înregistrări (0 = deloc)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    records, truth = generate(args.listings, args.cities, args.dup_rate, args.seed)
+    print(f"{len(records)} înregistrări ({len(truth)} duplicate injectate) generate în {time.perf_counter() - started:.1f}s")
+
+    started = time.perf_counter()
+    result = find_duplicates(records, threshold=args.threshold)
+    elapsed = time.perf_counter() - started
+    found = {(a, b) for _, a, b, _ in result.pairs}
+    hits = len(found & truth)
+    print(f"blocking: {elapsed:.1f}s, {result.compared:,} comparații, {result.blocks:,} blocuri "
+          f"({result.skipped_blocks} prea mari ignorate)")
+    print(f"  {len(found)} perechi >= {args.threshold}: recall {hits / max(len(truth), 1):.1%}, "
+          f"precizie {hits / max(len(found), 1):.1%}")
+
+    if args.naive_sample:
+        sample = records[:args.naive_sample]
+        started = time.perf_counter()
+        for i, a in enumerate(sample):
+            for b in sample[i + 1:]:
+                score(a, b)
+        naive = time.perf_counter() - started
+        per_pair = naive / (len(sample) * (len(sample) - 1) / 2)
+        total_pairs = len(records) * (len(records) - 1) / 2
+        print(f"naiv n²: {per_pair * 1e6:.1f} µs/pereche -> {total_pairs:,.0f} perechi ≈ "
+              f"{per_pair * total_pairs / 3600:,.1f} h pentru tot setul")
+
+
+if __name__ == "__main__":
+    main()
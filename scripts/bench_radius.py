@@ -0,0 +1,166 @@
+"""
+Benchmark căutare pe rază: expresia veche `acos` pe fiecare rând vs.
+bounding box indexat + distanță exactă doar pe orașele rămase.
+
+    python scripts/bench_radius.py                       # 10k orașe, 1M listări, SQLite temporar
+    python scripts/bench_radius.py --cities 2000 --listings 100000
+    python scripts/bench_radius.py --database-url postgresql://localhost/bench --yes-drop
+    python scripts/bench_radius.py --database-url postgresql://localhost/bench --reuse
+
+DATABASE_URL din shell e ignorat: implicit se folosește un SQLite din
+directorul temporar. Fără --reuse baza e ȘTEARSĂ (drop_all) și populată cu
+date sintetice, deci o bază dată cu --database-url cere și --yes-drop.
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+TEMP_DB_URL = "sqlite:///" + os.path.join(tempfile.gettempdir(), "bench_radius.db")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cities", type=int, default=10_000)
+    parser.add_argument("--listings", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--reuse", action="store_true", help="nu recrea datele")
+    parser.add_argument("--database-url", help=f"altă bază decât {TEMP_DB_URL} (fără --reuse cere --yes-drop)")
+    parser.add_argument("--yes-drop", action="store_true", help="confirm: tabelele din --database-url vor fi șterse")
+    args = parser.parse_args()
+    if args.database_url and not (args.reuse or args.yes_drop):
+        parser.error(f"fără --reuse, {args.database_url} ar fi golit cu drop_all(); adaugă --yes-drop dacă asta vrei")
+    return args
+
+
+# înainte de importul app: Config citește DATABASE_URL la import. Nu moștenim
+# DATABASE_URL / DATABASE_REPLICA_URL din shell – drop_all() ar lovi baza reală.
+ARGS = parse_args()
+os.environ["DATABASE_URL"] = ARGS.database_url or TEMP_DB_URL
+os.environ.pop("DATABASE_REPLICA_URL", None)
+
+from sqlalchemy import event, insert, text  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models import Category, City, Listing  # noqa: E402
+from app.public.routes import RADIUS_ALLOWED, _apply_radius_filter  # noqa: E402
+
+# Germania, aproximativ
+LAT_RANGE = (47.3, 55.0)
+LNG_RANGE = (5.9, 15.0)
+
+
+def legacy_radius_filter(query, center_lat, center_lng, radius_km):
+    # filtrul vechi din public/routes.py, păstrat doar pentru comparație
+    return query.join(City, Listing.city_id == City.id).filter(
+        text("""
+        (6371 * acos(
+          cos(radians(:clat)) * cos(radians(city.lat)) * cos(radians(city.lng) - radians(:clng)) +
+          sin(radians(:clat)) * sin(radians(city.lat))
+        )) <= :rkm
+        """)
+    ).params(clat=center_lat, clng=center_lng, rkm=radius_km)
+
+
+def _register_sqlite_math(engine):
+    # SQLite compilat fără SQLITE_ENABLE_MATH_FUNCTIONS nu are acos/radians
+    @event.listens_for(engine, "connect")
+    def _connect(dbapi_conn, _):
+        def acos(x):
+            return math.acos(max(-1.0, min(1.0, x)))
+        for name, fn in (("acos", acos), ("cos", math.cos), ("sin", math.sin), ("radians", math.radians)):
+            dbapi_conn.create_function(name, 1, fn, deterministic=True)
+
+
+def populate(n_cities: int, n_listings: int, batch: int = 50_000):
+    rnd = random.Random(42)
+    db.drop_all()
+    db.create_all()
+
+    db.session.execute(insert(Category), [{"name": f"Cat {i}", "slug": f"cat-{i}"} for i in range(10)])
+    db.session.execute(insert(City), [
+        {
+            "name": f"City {i}",
+            "slug": f"city-{i}",
+            "lat": rnd.uniform(*LAT_RANGE),
+            "lng": rnd.uniform(*LNG_RANGE),
+        }
+        for i in range(n_cities)
+    ])
+    db.session.commit()
+
+    cat_ids = [c for (c,) in db.session.query(Category.id)]
+    city_ids = [c for (c,) in db.session.query(City.id)]
+    for start in range(0, n_listings, batch):
+        db.session.execute(insert(Listing), [
+            {
+                "name": f"Listing {i}",
+                "slug": f"listing-{i}",
+                "category_id": rnd.choice(cat_ids),
+                "city_id": rnd.choice(city_ids),
+                "featured": rnd.random() < 0.05,
+                "verified": rnd.random() < 0.3,
+            }
+            for i in range(start, min(start + batch, n_listings))
+        ])
+        db.session.commit()
+        print(f"  {min(start + batch, n_listings):>9} listări", end="\r")
+    print()
+
+
+def run_query(apply_filter, lat, lng, radius):
+    q = apply_filter(Listing.query, lat, lng, radius)
+    return (
+        q.order_by(Listing.featured.desc(), Listing.verified.desc(), Listing.updated_at.desc())
+        .limit(30)
+        .all()
+    )
+
+
+def bench(label, apply_filter, centers, radius):
+    db.session.expunge_all()
+    start = time.perf_counter()
+    found = 0
+    for lat, lng in centers:
+        found += len(run_query(apply_filter, lat, lng, radius))
+    elapsed = (time.perf_counter() - start) / len(centers)
+    print(f"  {label:<10} {elapsed * 1000:9.2f} ms/query   ({found} rezultate)")
+    return elapsed
+
+
+def main():
+    args = ARGS
+    app = create_app()
+    with app.app_context():
+        if db.engine.dialect.name == "sqlite":
+            _register_sqlite_math(db.engine)
+            db.engine.dispose()
+
+        if not args.reuse:
+            print(f"Populez {args.cities} orașe / {args.listings} listări ({db.engine.url.render_as_string()})")
+            populate(args.cities, args.listings)
+
+        rnd = random.Random(7)
+        centers = [(rnd.uniform(*LAT_RANGE), rnd.uniform(*LNG_RANGE)) for _ in range(args.queries)]
+
+        for radius in RADIUS_ALLOWED:
+            # rezultatele trebuie să fie identice înainte să comparăm timpii
+            for lat, lng in centers[:3]:
+                old = {i for (i,) in legacy_radius_filter(Listing.query, lat, lng, radius).with_entities(Listing.id)}
+                new = {i for (i,) in _apply_radius_filter(Listing.query, lat, lng, radius).with_entities(Listing.id)}
+                assert old == new, f"rezultate diferite la r={radius}"
+
+            print(f"radius {radius} km")
+            t_old = bench("acos", legacy_radius_filter, centers, radius)
+            t_new = bench("bbox", _apply_radius_filter, centers, radius)
+            print(f"  speedup    {t_old / t_new:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark pornire la rece: import `app`, `create_app()` și primul răspuns,
+fiecare rundă într-un proces Python nou (ca la restart de dyno / worker gunicorn).
+
+    python scripts/bench_startup.py                 # 10 runde, GET /
+    python scripts/bench_startup.py --runs 20 --url /category/dentisti
+    python scripts/bench_startup.py --imports 15    # top module după timpul de import
+
+Fără DATABASE_URL se folosește un SQLite temporar cu schema creată (gol).
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# rulat în procesul copil; scrie un JSON cu timpii pe ultima linie
+CHILD = r"""
+import json, sys, time
+t0 = time.perf_counter()
+import app
+t1 = time.perf_counter()
+flask_app = app.create_app()
+t2 = time.perf_counter()
+resp = flask_app.test_client().get(sys.argv[1])
+t3 = time.perf_counter()
+heavy = [m for m in ("flask_migrate", "alembic", "requests", "cloudinary", "smtplib") if m in sys.modules]
+print(json.dumps({
+    "import_ms": (t1 - t0) * 1000,
+    "create_ms": (t2 - t1) * 1000,
+    "first_ms": (t3 - t2) * 1000,
+    "status": resp.status_code,
+    "loaded": heavy,
+}))
+"""
+
+
+def _env() -> dict:
+    env = dict(os.environ)
+    env.pop("FLASK_RUN_FROM_CLI", None)  # ca sub gunicorn, nu ca sub `flask`
+    env["PYTHONPATH"] = ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    if "DATABASE_URL" not in env:
+        path = os.path.join(tempfile.gettempdir(), "bench_startup.db")
+        env["DATABASE_URL"] = "sqlite:///" + path
+        if not os.path.exists(path):
+            subprocess.run(
+                [sys.executable, "-c", "from app import create_app; from app.extensions import db\n"
+                 "a = create_app()\nwith a.app_context(): db.create_all()"],
+                env=env, cwd=ROOT, check=True,
+            )
+    return env
+
+
+def run_once(env: dict, url: str) -> dict:
+    out = subprocess.run([sys.executable, "-c", CHILD, url], env=env, cwd=ROOT, check=True,
+                         capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def top_imports(env: dict, limit: int) -> list[tuple[int, str]]:
+    """Module importate de `app`, sortate după timpul cumulat (python -X importtime)."""
+    err = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app"], env=env, cwd=ROOT,
+                         check=True, capture_output=True, text=True).stderr
+    rows = []
+    for line in err.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # doar pachetele de nivel 1 (fără submodule), ca să nu numărăm de două ori
+        if name.strip() == name.strip().split(".")[0] or name.strip().startswith("app."):
+            rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--url", default="/")
+    parser.add_argument("--imports", type=int, default=0, help="afișează top N module la import")
+    args = parser.parse_args()
+
+    env = _env()
+    run_once(env, args.url)  # încălzim cache-ul de bytecode (.pyc)
+    runs = [run_once(env, args.url) for _ in range(args.runs)]
+
+    print(f"{args.runs} runde, GET {args.url} -> {runs[-1]['status']}")
+    for key, label in (("import_ms", "import app"), ("create_ms", "create_app()"), ("first_ms", "primul răspuns")):
+        values = [r[key] for r in runs]
+        print(f"  {label:<16} median {statistics.median(values):7.1f} ms   max {max(values):7.1f} ms")
+    total = [r["import_ms"] + r["create_ms"] + r["first_ms"] for r in runs]
+    print(f"  {'total':<16} median {statistics.median(total):7.1f} ms")
+    print(f"  module grele încărcate: {', '.join(runs[-1]['loaded']) or '-'}")
+
+    if args.imports:
+        print("\nimport (cumulat):")
+        for micros, name in top_imports(env, args.imports):
+            print(f"  {micros / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
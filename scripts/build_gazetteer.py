@@ -0,0 +1,53 @@
+"""
+Generează app/data/gazetteer_de.tsv din exportul GeoNames de coduri poștale.
+
+    curl -O https://download.geonames.org/export/zip/DE.zip && unzip DE.zip
+    python scripts/build_gazetteer.py DE.txt
+
+Formatul GeoNames (tab): country, postal_code, place_name, admin1..admin3
+(nume + cod), lat, lng, accuracy. Păstrăm doar PLZ, nume, lat, lng cu 4
+zecimale (~10 m) – suficient pentru căutarea pe rază.
+"""
+import os
+import sys
+from collections import defaultdict
+
+OUT = os.path.join(os.path.dirname(__file__), "..", "app", "data", "gazetteer_de.tsv")
+
+
+def main(src: str, out: str = OUT):
+    places = defaultdict(list)   # nume -> [(lat, lng)] pentru centrul localității
+    plz_rows = {}
+
+    with open(src, encoding="utf-8") as f:
+        for line in f:
+            cols = line.rstrip("\n").split("\t")
+            if len(cols) < 11 or cols[0] != "DE":
+                continue
+            plz, name = cols[1], cols[2]
+            lat, lng = float(cols[9]), float(cols[10])
+            plz_rows.setdefault(plz, (name, lat, lng))
+            places[name].append((lat, lng))
+
+    lines = [
+        "# Gazetteer DE (compact): plz<TAB>name<TAB>lat<TAB>lng",
+        "# Rânduri fără PLZ = doar nume de localitate. Regenerare completă: scripts/build_gazetteer.py",
+    ]
+    for name in sorted(places):
+        pts = places[name]
+        lat = sum(p[0] for p in pts) / len(pts)
+        lng = sum(p[1] for p in pts) / len(pts)
+        lines.append(f"\t{name}\t{lat:.4f}\t{lng:.4f}")
+    for plz in sorted(plz_rows):
+        name, lat, lng = plz_rows[plz]
+        lines.append(f"{plz}\t{name}\t{lat:.4f}\t{lng:.4f}")
+
+    with open(out, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    print(f"✅ {len(places)} localități, {len(plz_rows)} PLZ -> {out}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit("usage: python scripts/build_gazetteer.py DE.txt")
+    main(sys.argv[1])
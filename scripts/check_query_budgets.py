@@ -0,0 +1,55 @@
+"""
+Verifică numărul de query-uri SQL pe rutele publice (prinde N+1 noi).
+
+    DATABASE_URL=sqlite:///app/app.db python scripts/check_query_budgets.py
+
+Ia prima categorie / primul oraș / prima listare din DB și eșuează cu
+codul 1 dacă o rută depășește bugetul din app/querycount.py:ROUTE_BUDGETS
+(aceleași bugete ca tests/test_query_budgets.py). Numără query-urile
+pe toate engine-urile (primary + replica, dacă e configurată).
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app import create_app  # noqa: E402
+from app.cache import nav_cache  # noqa: E402
+from app.models import Category, City, Listing  # noqa: E402
+from app.querycount import ROUTE_BUDGETS, QueryBudgetExceeded, assert_route_budget  # noqa: E402
+from app.search import get_backend  # noqa: E402
+
+
+def main():
+    app = create_app()
+    with app.app_context():
+        category = Category.query.first()
+        city = City.query.first()
+        listing = Listing.query.first()
+        if not (category and city and listing):
+            sys.exit("DB goală: rulează seed.py / importul înainte.")
+        params = {
+            "category": category.slug,
+            "city": city.slug,
+            "listing": listing.slug,
+            "listing_name": listing.name.split()[0],
+        }
+        # încălzire: altfel primul request plătește reîncărcarea meniurilor (2 query-uri)
+        nav_cache.get()
+        get_backend()
+
+    client = app.test_client()
+    failed = False
+    for pattern, budget in ROUTE_BUDGETS.items():
+        url = pattern.format(**params)
+        try:
+            assert_route_budget(app, client, url, budget)
+            print(f"✅ {url} (≤ {budget})")
+        except QueryBudgetExceeded as e:
+            failed = True
+            print(f"❌ {e}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
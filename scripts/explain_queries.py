@@ -0,0 +1,128 @@
+"""
+Planurile de execuție (EXPLAIN) pentru query-urile rutelor publice.
+
+    DATABASE_URL=sqlite:///app/app.db python scripts/explain_queries.py
+    DATABASE_URL=postgresql://... python scripts/explain_queries.py --analyze
+
+Apelează fiecare rută cu test_client (cache-ul de pagini oprit), prinde
+SELECT-urile pe `listing` exact cum le trimite aplicația și rulează EXPLAIN pe
+ele. Marchează sortările și scanările complete ale tabelei – cu indexurile din
+models.Listing nu ar trebui să apară decât la căutarea text / rază și la
+?verified=1 (sortare parțială, în interiorul grupului featured).
+`--strict` iese cu codul 1 dacă găsește vreuna.
+
+Pe SQLite rulează întâi `ANALYZE` pe o copie a bazei reale: fără statistici,
+planificatorul alege uneori alt index decât ar alege în producție.
+"""
+import argparse
+import os
+import re
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import event  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.models import Category, City, Listing  # noqa: E402
+
+# aceleași rute ca scripts/check_query_budgets.py + filtrele din UI
+ROUTES = [
+    "/",
+    "/?category={category}",
+    "/?q={listing_name}",
+    "/category/{category}",
+    "/category/{category}?city={city}",
+    "/category/{category}?verified=1",
+    "/category/{category}?featured=1",
+    "/city/{city}",
+    "/city/{city}?category={category}",
+    "/servicii/{category}/{city}",
+    "/listing/{listing}",
+    "/sitemap.xml",
+]
+
+# (dialect, regex pe plan, problemă)
+WARNINGS = [
+    ("sqlite", re.compile(r"USE TEMP B-TREE FOR (ORDER BY|RIGHT PART OF ORDER BY)"), "sortare"),
+    ("sqlite", re.compile(r"^SCAN listing\b(?! USING)"), "scanare completă"),
+    ("postgresql", re.compile(r"\bSort\b"), "sortare"),
+    ("postgresql", re.compile(r"Seq Scan on listing\b"), "scanare completă"),
+]
+
+
+def explain(conn, statement, parameters, analyze: bool) -> list[str]:
+    if conn.dialect.name == "sqlite":
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        # (id, parent, notused, detail): indentare după nivel
+        depth = {0: -1}
+        lines = []
+        for id_, parent, _, detail in rows:
+            depth[id_] = depth.get(parent, -1) + 1
+            lines.append("  " * depth[id_] + detail)
+        return lines
+    prefix = "EXPLAIN (ANALYZE, BUFFERS)" if analyze else "EXPLAIN"
+    return [row[0] for row in conn.exec_driver_sql(f"{prefix} {statement}", parameters)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--analyze", action="store_true", help="EXPLAIN ANALYZE (doar Postgres; execută query-ul).")
+    parser.add_argument("--strict", action="store_true", help="Cod de ieșire 1 la sortări / scanări complete.")
+    args = parser.parse_args()
+
+    app = create_app()
+    app.config["PAGE_CACHE_ENABLED"] = False
+    with app.app_context():
+        category = Category.query.first()
+        city = City.query.first()
+        listing = Listing.query.first()
+        if not (category and city and listing):
+            sys.exit("DB goală: rulează seed.py / importul înainte.")
+        params = {
+            "category": category.slug,
+            "city": city.slug,
+            "listing": listing.slug,
+            "listing_name": listing.name.split()[0],
+        }
+        engine = app.extensions["sqlalchemy"].engine
+
+    captured = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and re.search(r"\blisting\b", statement):
+            captured.append((statement, parameters))
+
+    client = app.test_client()
+    client.get("/")  # meniurile (nav_cache) încărcate înainte, ca să nu apară în fiecare rută
+    warnings = 0
+    with engine.connect() as conn:
+        for pattern in ROUTES:
+            url = pattern.format(**params)
+            captured.clear()
+            event.listen(engine, "before_cursor_execute", _capture)
+            try:
+                response = client.get(url)
+            finally:
+                event.remove(engine, "before_cursor_execute", _capture)
+            print(f"\n=== GET {url} -> {response.status_code} ({len(captured)} query-uri pe listing)")
+
+            for statement, parameters in captured:
+                plan = explain(conn, statement, parameters, args.analyze)
+                problems = sorted({
+                    label for dialect, regex, label in WARNINGS
+                    if dialect == conn.dialect.name and any(regex.search(line.strip()) for line in plan)
+                })
+                warnings += bool(problems)
+                print("\n" + " ".join(statement.split())[:300])
+                for line in plan:
+                    print(f"    {line}")
+                if problems:
+                    print(f"  ⚠️ {', '.join(problems)}")
+
+    print(f"\n{'⚠️' if warnings else '✅'} {warnings} query-uri cu sortare / scanare completă")
+    sys.exit(1 if warnings and args.strict else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Replică simulată pentru testare locală (app/replica.py): copiază periodic
+primary -> replica, deci replica e mereu în urmă cu până la `--lag` secunde.
+
+    export DATABASE_URL=sqlite:////tmp/primary.db DATABASE_REPLICA_URL=sqlite:////tmp/replica.db
+    python scripts/simulate_replica.py --lag 5          # în alt terminal: flask run
+    python scripts/simulate_replica.py --once           # o singură sincronizare
+
+SQLite: backup API (copie exactă, inclusiv listing_fts). Postgres: toate
+tabelele (reflectate din primary) golite și recopiate într-o tranzacție –
+replica trebuie să aibă deja schema (`flask db upgrade` pe ea).
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import sqlalchemy as sa  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.replica import REPLICA  # noqa: E402
+
+
+def copy_sqlite(primary, replica):
+    src = primary.raw_connection()
+    dst = replica.raw_connection()
+    try:
+        src.driver_connection.backup(dst.driver_connection)
+    finally:
+        src.close()
+        dst.close()
+
+
+def copy_tables(primary, replica, batch: int = 5000) -> int:
+    meta = sa.MetaData()
+    meta.reflect(primary)
+    rows = 0
+    with primary.connect() as src, replica.begin() as dst:
+        if dst.dialect.name == "postgresql":
+            names = ", ".join(dst.dialect.identifier_preparer.quote(t.name) for t in meta.sorted_tables)
+            dst.exec_driver_sql(f"TRUNCATE {names}")
+        else:
+            for table in reversed(meta.sorted_tables):
+                dst.execute(table.delete())
+        for table in meta.sorted_tables:
+            result = src.execution_options(yield_per=batch).execute(table.select())
+            for chunk in result.mappings().partitions():
+                dst.execute(table.insert(), [dict(r) for r in chunk])
+                rows += len(chunk)
+    return rows
+
+
+def sync(primary, replica) -> str:
+    started = time.perf_counter()
+    if primary.dialect.name == "sqlite" and replica.dialect.name == "sqlite":
+        copy_sqlite(primary, replica)
+        what = "backup sqlite"
+    else:
+        what = f"{copy_tables(primary, replica)} rânduri"
+    return f"{what} în {time.perf_counter() - started:.2f}s"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Copiază primary -> replica cu întârziere.")
+    parser.add_argument("--lag", type=float, default=5.0, help="Secunde între sincronizări.")
+    parser.add_argument("--once", action="store_true", help="O singură sincronizare, apoi ieșire.")
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        if REPLICA not in db.engines:
+            sys.exit("DATABASE_REPLICA_URL nu e setat.")
+        primary, replica = db.engines[None], db.engines[REPLICA]
+
+    while True:
+        print(f"🪞 {time.strftime('%H:%M:%S')} primary -> replica: {sync(primary, replica)}", flush=True)
+        if args.once:
+            return
+        time.sleep(args.lag)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 from app import create_app
 from app.extensions import db
+from app.cache import nav_cache
 from app.models import Category, City
 from app.utils import slugify
 
@@ -71,6 +72,7 @@ def main():
                 )
 
         db.session.commit()
+        nav_cache.invalidate()
         print("✅ Seed completed successfully.")
 
 if __name__ == "__main__":
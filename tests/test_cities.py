@@ -0,0 +1,134 @@
+"""
+Rezolvarea orașelor (app/cities.py): variante de nume -> același City, fără duplicate.
+
+    python -m unittest discover tests
+"""
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+_tmp = tempfile.mkdtemp(prefix="test-cities-")
+# Config se citește o dată per proces (primul modul de test importat): SQLite, fără replică;
+# fiecare clasă își dă propriul fișier DB la create_app()
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(_tmp, "test.db")
+os.environ.pop("DATABASE_REPLICA_URL", None)
+
+from sqlalchemy import func, select  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app import moderation  # noqa: E402
+from app.cities import city_resolver, merge_duplicates  # noqa: E402
+from app.config import Config  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.importer import DirectoryImporter  # noqa: E402
+from app.models import Category, City, CityAlias, Listing, Submission  # noqa: E402
+
+
+class CityResolverTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with mock.patch.multiple(Config, SQLALCHEMY_DATABASE_URI="sqlite:///" + os.path.join(_tmp, "test.db"),
+                                 SQLALCHEMY_BINDS={}):
+            cls.app = create_app()
+        cls.app.config.update(TESTING=True)
+        with cls.app.app_context():
+            db.create_all()
+
+    @classmethod
+    def tearDownClass(cls):
+        with cls.app.app_context():
+            db.drop_all()
+            db.engine.dispose()
+        shutil.rmtree(_tmp, ignore_errors=True)
+
+    def setUp(self):
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        city_resolver.invalidate()
+        # ca seed.py
+        self.frankfurt = City(name="Frankfurt am Main", slug="frankfurt-am-main", state="Hessen", lat=50.1109, lng=8.6821)
+        self.berlin = City(name="Berlin", slug="berlin", state="Berlin", lat=52.52, lng=13.405)
+        self.munchen = City(name="München", slug="munchen", state="Bayern", lat=48.1351, lng=11.582)
+        db.session.add_all([Category(name="Dentiști", slug="dentisti"), self.frankfurt, self.berlin, self.munchen])
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        for model in (Listing, Submission, CityAlias, City, Category):
+            db.session.query(model).delete()
+        db.session.commit()
+        city_resolver.invalidate()
+        self.ctx.pop()
+
+    def _cities(self) -> int:
+        return db.session.scalar(select(func.count()).select_from(City))
+
+    def _aliases(self) -> dict:
+        return dict(db.session.execute(select(CityAlias.alias_key, CityAlias.city_id)).all())
+
+    def test_variants_resolve_to_existing_city(self):
+        for raw, city in [
+            ("60311, Frankfurt", self.frankfurt),
+            ("Frankfurt", self.frankfurt),
+            ("Frankfurt am Main", self.frankfurt),
+            ("Berlin.", self.berlin),
+            ("10115 Berlin", self.berlin),
+            ("Muenchen", self.munchen),
+        ]:
+            self.assertEqual(city_resolver.get_or_create(raw), (city.id, False), raw)
+        db.session.commit()
+
+        self.assertEqual(self._cities(), 3)
+        self.assertEqual(self._aliases(), {"frankfurt": self.frankfurt.id, "muenchen": self.munchen.id})
+
+    def test_other_city_with_same_prefix_stays_separate(self):
+        city_id, created = city_resolver.get_or_create("Frankfurt (Oder)")
+        db.session.commit()
+
+        self.assertTrue(created)
+        self.assertNotEqual(city_id, self.frankfurt.id)
+        self.assertEqual(self._aliases(), {})
+        self.assertEqual(merge_duplicates(dry_run=True)[0], [])
+
+    def test_importer_and_moderation_use_existing_city(self):
+        csv_text = (
+            "Name,Category,City,PLZ,Phone\n"
+            "Firma A,Dentiști,\"60311, Frankfurt\",60311,\n"
+            "Firma B,Dentiști,Frankfurt,,\n"
+        )
+        report = DirectoryImporter().run(io.StringIO(csv_text))
+        db.session.add(Submission(business_name="Firma C", category_name="Dentiști", city_name="60311, Frankfurt"))
+        db.session.commit()
+        sub_id = db.session.scalar(select(Submission.id))
+        outcomes, created = moderation.moderate([sub_id], "approve")
+        db.session.commit()
+
+        self.assertEqual(report.created_cities, [])
+        self.assertEqual(created, [])
+        self.assertEqual(outcomes[0].status, "approved")
+        self.assertEqual(self._cities(), 3)
+        cities = db.session.scalars(select(Listing.city_id)).all()
+        self.assertEqual(cities, [self.frankfurt.id] * 3)
+
+    def test_merge_keeps_oldest_of_same_place(self):
+        duplicate = City(name="Frankfurt", slug="frankfurt", lat=50.1109, lng=8.6821)
+        db.session.add(duplicate)
+        db.session.flush()
+        category_id = db.session.scalar(select(Category.id))
+        db.session.add(Listing(name="Firma", slug="firma", category_id=category_id, city_id=duplicate.id))
+        db.session.commit()
+
+        merged, pending = merge_duplicates()
+        db.session.commit()
+
+        self.assertEqual(merged, [("Frankfurt", "Frankfurt am Main", 1)])
+        self.assertEqual(pending, [])
+        self.assertEqual(db.session.scalar(select(Listing.city_id)), self.frankfurt.id)
+        self.assertEqual(city_resolver.lookup("Frankfurt"), self.frankfurt.id)
+
+
+if __name__ == "__main__":
+    unittest.main()
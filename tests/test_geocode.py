@@ -0,0 +1,133 @@
+"""
+Geocoder (app/geocode.py) contra unui server HTTP local în locul Nominatim.
+
+    python -m unittest discover tests
+"""
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from urllib.parse import parse_qs, urlsplit
+
+_tmp = tempfile.mkdtemp(prefix="test-geocode-")
+# Config se citește o dată per proces (primul modul de test importat): SQLite, fără replică;
+# fiecare clasă își dă propriul fișier DB la create_app()
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(_tmp, "test.db")
+os.environ.pop("DATABASE_REPLICA_URL", None)
+
+from app import create_app  # noqa: E402
+from app.config import Config  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.geocode import Geocoder  # noqa: E402
+from app.models import GeocodeCache  # noqa: E402
+
+
+class StubNominatim(BaseHTTPRequestHandler):
+    """/search?q=...: "nowhere" -> [], altfel un rezultat; fiecare request numărat."""
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.calls.append(parse_qs(urlsplit(self.path).query)["q"][0])
+        time.sleep(server.delay)
+        found = "nowhere" not in server.calls[-1]
+        body = json.dumps([{"lat": "51.2277", "lon": "6.7735"}] if found else []).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class GeocoderTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StubNominatim)
+        cls.server.lock = threading.Lock()
+        cls.server.calls = []
+        cls.server.delay = 0
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+        with mock.patch.multiple(Config, SQLALCHEMY_DATABASE_URI="sqlite:///" + os.path.join(_tmp, "test.db"),
+                                 SQLALCHEMY_BINDS={}):
+            cls.app = create_app()
+        cls.app.config.update(
+            TESTING=True,
+            NOMINATIM_URL=f"http://127.0.0.1:{cls.server.server_port}/search",
+            GEOCODE_TIMEOUT=5,
+            GEOCODE_NEGATIVE_TTL=86400,
+        )
+        with cls.app.app_context():
+            db.create_all()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        with cls.app.app_context():
+            db.drop_all()
+            db.engine.dispose()
+        shutil.rmtree(_tmp, ignore_errors=True)
+
+    def setUp(self):
+        self.server.calls.clear()
+        self.server.delay = 0
+        self.geocoder = Geocoder()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+
+    def tearDown(self):
+        self.app.config["GEOCODE_NEGATIVE_TTL"] = 86400
+        db.session.remove()
+        db.session.query(GeocodeCache).delete()
+        db.session.commit()
+        self.ctx.pop()
+
+    def _lookup_in_thread(self, query: str):
+        with self.app.app_context():
+            return self.geocoder.lookup(query)
+
+    def test_concurrent_lookups_share_one_request(self):
+        self.server.delay = 0.3  # toate thread-urile ratează cache-ul cât durează request-ul
+        with ThreadPoolExecutor(max_workers=9) as pool:
+            results = list(pool.map(self._lookup_in_thread, ["Werdener Str. 6, 40227 Düsseldorf"] * 9))
+
+        self.assertEqual(results, [(51.2277, 6.7735)] * 9)
+        self.assertEqual(len(self.server.calls), 1)
+        self.assertEqual(self.geocoder.stats["network"], 1)
+        self.assertEqual(self.geocoder.stats["coalesced"], 8)
+
+    def test_negative_result_cached_until_ttl(self):
+        self.app.config["GEOCODE_NEGATIVE_TTL"] = 0.2
+
+        self.assertEqual(self.geocoder.lookup("Strada nowhere 1"), (None, None))
+        self.assertEqual(self.geocoder.lookup("Strada nowhere 1"), (None, None))
+        self.geocoder.clear_memory()
+        self.assertEqual(self.geocoder.lookup("Strada nowhere 1"), (None, None))  # din geocode_cache
+        self.assertEqual(len(self.server.calls), 1)
+
+        time.sleep(0.3)
+        self.assertEqual(self.geocoder.lookup("Strada nowhere 1"), (None, None))
+        self.assertEqual(len(self.server.calls), 2)
+
+    def test_db_cache_hit_after_clear_memory(self):
+        self.assertEqual(self.geocoder.lookup("Königsallee 1, Düsseldorf"), (51.2277, 6.7735))
+        self.geocoder.clear_memory()  # ca un worker nou: doar tabela geocode_cache
+
+        self.assertEqual(self.geocoder.lookup("  königsallee 1,  Düsseldorf "), (51.2277, 6.7735))
+        self.assertEqual(len(self.server.calls), 1)
+        self.assertEqual(self.geocoder.stats["db"], 1)
+        self.assertEqual(self.geocoder.stats["memory"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
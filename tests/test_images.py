@@ -0,0 +1,208 @@
+"""
+Upload imagini în fundal (app/images.py) cu LocalUploader – fără rețea.
+
+    python -m unittest discover tests
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+_tmp = tempfile.mkdtemp(prefix="test-images-")
+# Config se citește o dată per proces (primul modul de test importat): SQLite, fără replică;
+# fiecare clasă își dă propriul fișier DB la create_app()
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(_tmp, "test.db")
+os.environ.pop("DATABASE_REPLICA_URL", None)
+
+from app import create_app  # noqa: E402
+from app.config import Config  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.images import LocalUploader, image_pipeline, mark_pending  # noqa: E402
+from app.models import Category, City, Listing  # noqa: E402
+
+
+class FlakyUploader:
+    """Eșuează de `failures` ori, apoi urcă prin LocalUploader."""
+
+    def __init__(self, directory: str, failures: int):
+        self.local = LocalUploader(directory)
+        self.failures = failures
+        self.calls = 0
+
+    def upload(self, path: str) -> str:
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise ConnectionError("upload întrerupt")
+        return self.local.upload(path)
+
+
+class ImagePipelineTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with mock.patch.multiple(Config, SQLALCHEMY_DATABASE_URI="sqlite:///" + os.path.join(_tmp, "test.db"),
+                                 SQLALCHEMY_BINDS={}):
+            cls.app = create_app()
+        cls.app.config.update(
+            TESTING=True,
+            IMAGE_UPLOADER="local",
+            IMAGE_UPLOAD_RETRIES=2,
+            IMAGE_UPLOAD_RETRY_DELAY=0,
+            IMAGE_RESUME_ON_START=False,
+        )
+        with cls.app.app_context():
+            db.create_all()
+
+    @classmethod
+    def tearDownClass(cls):
+        with cls.app.app_context():
+            db.drop_all()
+            db.engine.dispose()
+        shutil.rmtree(_tmp, ignore_errors=True)
+
+    def setUp(self):
+        self.spool = tempfile.mkdtemp(dir=_tmp)
+        self.uploads = tempfile.mkdtemp(dir=_tmp)
+        self.app.config.update(IMAGE_SPOOL_DIR=self.spool, IMAGE_LOCAL_DIR=self.uploads)
+        image_pipeline.uploader = LocalUploader(self.uploads)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        category = Category(name="Dentiști", slug="dentisti")
+        city = City(name="Berlin", slug="berlin")
+        db.session.add_all([category, city])
+        db.session.flush()
+        self.listing = Listing(name="Firma", slug="firma", category_id=category.id, city_id=city.id)
+        db.session.add(self.listing)
+        db.session.commit()
+
+    def tearDown(self):
+        image_pipeline.shutdown()
+        image_pipeline.uploader = None
+        db.session.remove()
+        for model in (Listing, City, Category):
+            db.session.query(model).delete()
+        db.session.commit()
+        self.ctx.pop()
+
+    def _spool_file(self, name: str = None) -> str:
+        path = os.path.join(self.spool, name or f"{os.urandom(16).hex()}.jpg")
+        with open(path, "wb") as f:
+            f.write(b"\xff\xd8\xff fake jpeg")
+        return path
+
+    def _pending(self, path: str) -> str:
+        token = mark_pending(self.listing, path)
+        db.session.commit()
+        return token
+
+    def _reload(self) -> Listing:
+        db.session.expire_all()
+        return db.session.get(Listing, self.listing.id)
+
+    def test_upload_sets_url_and_clears_spool(self):
+        path = self._spool_file()
+        token = self._pending(path)
+        self.assertEqual(token, os.path.splitext(os.path.basename(path))[0])
+
+        result = image_pipeline.submit(self.listing.id, token, path).result()
+
+        item = self._reload()
+        self.assertEqual(result, "ok")
+        self.assertTrue(item.image_url.startswith("/static/uploads/"))
+        self.assertTrue(os.path.exists(os.path.join(self.uploads, os.path.basename(item.image_url))))
+        self.assertIsNone(item.image_status)
+        self.assertIsNone(item.image_token)
+        self.assertFalse(os.path.exists(path))
+
+    def test_retries_transient_errors(self):
+        image_pipeline.uploader = FlakyUploader(self.uploads, failures=2)
+        path = self._spool_file()
+        token = self._pending(path)
+
+        result = image_pipeline.submit(self.listing.id, token, path).result()
+
+        self.assertEqual(result, "ok")
+        self.assertEqual(image_pipeline.uploader.calls, 3)
+        self.assertIsNotNone(self._reload().image_url)
+
+    def test_failed_after_retries(self):
+        image_pipeline.uploader = FlakyUploader(self.uploads, failures=99)
+        path = self._spool_file()
+        token = self._pending(path)
+
+        result = image_pipeline.submit(self.listing.id, token, path).result()
+
+        item = self._reload()
+        self.assertEqual(result, "failed")
+        self.assertEqual(image_pipeline.uploader.calls, 3)  # 1 + IMAGE_UPLOAD_RETRIES
+        self.assertEqual(item.image_status, "FAILED")
+        self.assertIsNone(item.image_token)
+        self.assertIsNone(item.image_url)
+        self.assertFalse(os.path.exists(path))
+
+    def test_stale_token_does_not_overwrite_newer_image(self):
+        old_path = self._spool_file()
+        old_token = self._pending(old_path)
+        new_token = self._pending(self._spool_file())  # altă imagine încărcată între timp
+
+        result = image_pipeline.submit(self.listing.id, old_token, old_path).result()
+
+        item = self._reload()
+        self.assertEqual(result, "stale")
+        self.assertIsNone(item.image_url)
+        self.assertEqual(item.image_status, "PENDING")
+        self.assertEqual(item.image_token, new_token)
+
+    def _age(self, seconds: int):
+        db.session.execute(
+            Listing.__table__.update()
+            .where(Listing.id == self.listing.id)
+            .values(updated_at=datetime.utcnow() - timedelta(seconds=seconds))
+        )
+        db.session.commit()
+
+    def test_resume_requeues_pending_with_spool_file(self):
+        path = self._spool_file()
+        self._pending(path)  # worker oprit înainte de upload
+        self._age(3600)
+
+        counts = image_pipeline.resume(self.app, older_than=60)
+        image_pipeline.shutdown()
+
+        item = self._reload()
+        self.assertEqual(counts, {"requeued": 1, "failed": 0, "orphans": 0})
+        self.assertIsNotNone(item.image_url)
+        self.assertIsNone(item.image_status)
+        self.assertEqual(os.listdir(self.spool), [])
+
+    def test_resume_marks_failed_without_spool_file(self):
+        path = self._spool_file()
+        self._pending(path)
+        os.remove(path)
+        self._age(3600)
+
+        counts = image_pipeline.resume(self.app, older_than=60)
+
+        item = self._reload()
+        self.assertEqual(counts["failed"], 1)
+        self.assertEqual(item.image_status, "FAILED")
+        self.assertIsNone(item.image_token)
+
+    def test_resume_skips_recent_pending_and_removes_old_orphans(self):
+        path = self._spool_file()
+        token = self._pending(path)  # încă în lucru, nu-l atingem
+        orphan = self._spool_file()
+        past = (datetime.now() - timedelta(hours=1)).timestamp()
+        os.utime(orphan, (past, past))
+
+        counts = image_pipeline.resume(self.app, older_than=60)
+
+        self.assertEqual(counts, {"requeued": 0, "failed": 0, "orphans": 1})
+        self.assertEqual(self._reload().image_token, token)
+        self.assertTrue(os.path.exists(path))
+        self.assertFalse(os.path.exists(orphan))
+
+
+if __name__ == "__main__":
+    unittest.main()
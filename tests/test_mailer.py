@@ -0,0 +1,169 @@
+"""
+Outbox-ul de email (app/mailer.py) trimis către un server SMTP local (aiosmtpd).
+
+    python -m unittest discover tests
+"""
+import os
+import shutil
+import socket
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+_tmp = tempfile.mkdtemp(prefix="test-mailer-")
+# Config se citește o dată per proces (primul modul de test importat): SQLite, fără replică;
+# fiecare clasă își dă propriul fișier DB la create_app()
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(_tmp, "test.db")
+os.environ.pop("DATABASE_REPLICA_URL", None)
+
+from app import create_app  # noqa: E402
+from app.config import Config  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.mailer import SmtpSender, drain_outbox, queue_contact_email  # noqa: E402
+from app.models import EmailOutbox  # noqa: E402
+
+try:
+    from aiosmtpd.controller import Controller
+except ImportError:  # doar pentru teste, nu e în requirements.txt
+    Controller = None
+
+
+class Sink:
+    """Handler aiosmtpd: păstrează mesajele; cu `reply` setat le refuză temporar (4xx)."""
+
+    def __init__(self):
+        self.messages = []
+        self.reply = None
+
+    async def handle_DATA(self, server, session, envelope):
+        if self.reply:
+            return self.reply
+        self.messages.append(envelope)
+        return "250 OK"
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@unittest.skipIf(Controller is None, "aiosmtpd nu e instalat")
+class OutboxTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.sink = Sink()
+        cls.smtpd = Controller(cls.sink, hostname="127.0.0.1", port=_free_port())
+        cls.smtpd.start()
+        with mock.patch.multiple(Config, SQLALCHEMY_DATABASE_URI="sqlite:///" + os.path.join(_tmp, "test.db"),
+                                 SQLALCHEMY_BINDS={}):
+            cls.app = create_app()
+        cls.app.config.update(
+            TESTING=True,
+            MAIL_SERVER="127.0.0.1",
+            MAIL_PORT=cls.smtpd.port,
+            MAIL_USE_SSL=False,
+            MAIL_USE_TLS=False,
+            MAIL_USERNAME="",
+            MAIL_FROM="site@servicii-ro.test",
+            MAIL_TO="admin@servicii-ro.test",
+            MAIL_MAX_ATTEMPTS=3,
+            MAIL_RETRY_BASE=30,
+            MAIL_RETRY_MAX=3600,
+        )
+        with cls.app.app_context():
+            db.create_all()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.smtpd.stop()
+        with cls.app.app_context():
+            db.drop_all()
+            db.engine.dispose()
+        shutil.rmtree(_tmp, ignore_errors=True)
+
+    def setUp(self):
+        self.sink.messages.clear()
+        self.sink.reply = None
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        self.smtp = SmtpSender.from_config(self.app.config)
+
+    def tearDown(self):
+        self.smtp.close()
+        db.session.remove()
+        db.session.query(EmailOutbox).delete()
+        db.session.commit()
+        self.ctx.pop()
+
+    def _queue(self, n: int = 1) -> list[int]:
+        items = [queue_contact_email(f"Ion {i}", f"ion{i}@example.com", "Bună ziua") for i in range(n)]
+        db.session.commit()
+        return [item.id for item in items]
+
+    def _item(self, item_id: int) -> EmailOutbox:
+        db.session.expire_all()
+        return db.session.get(EmailOutbox, item_id)
+
+    def _make_due(self, item_id: int):
+        db.session.query(EmailOutbox).filter_by(id=item_id).update(
+            {"next_attempt_at": datetime.utcnow() - timedelta(seconds=1)}
+        )
+        db.session.commit()
+
+    def test_sends_batch_on_one_connection(self):
+        ids = self._queue(3)
+
+        counts = drain_outbox(self.smtp)
+
+        self.assertEqual(counts, {"sent": 3, "retry": 0, "failed": 0})
+        self.assertEqual(self.smtp.connects, 1)
+        self.assertEqual(len(self.sink.messages), 3)
+        self.assertEqual({m.rcpt_tos[0] for m in self.sink.messages}, {"admin@servicii-ro.test"})
+        self.assertTrue(all(self._item(i).status == "SENT" for i in ids))
+
+    def test_temporary_error_retries_with_backoff(self):
+        (item_id,) = self._queue()
+        self.sink.reply = "451 Try again later"
+
+        before = datetime.utcnow()
+        counts = drain_outbox(self.smtp)
+
+        item = self._item(item_id)
+        self.assertEqual(counts, {"sent": 0, "retry": 1, "failed": 0})
+        self.assertEqual((item.status, item.attempts), ("PENDING", 1))
+        self.assertIn("451", item.last_error)
+        # prima reîncercare: MAIL_RETRY_BASE ± 20% jitter
+        delay = (item.next_attempt_at - before).total_seconds()
+        self.assertGreaterEqual(delay, 30 * 0.8 - 1)
+        self.assertLessEqual(delay, 30 * 1.2 + 1)
+        self.assertEqual(drain_outbox(self.smtp), {"sent": 0, "retry": 0, "failed": 0})  # încă nescadent
+
+        self.sink.reply = None
+        self._make_due(item_id)
+        self.assertEqual(drain_outbox(self.smtp)["sent"], 1)
+        item = self._item(item_id)
+        self.assertEqual(item.status, "SENT")
+        self.assertIsNone(item.last_error)
+        self.assertEqual(len(self.sink.messages), 1)
+
+    def test_failed_after_max_attempts(self):
+        (item_id,) = self._queue()
+        self.sink.reply = "451 Try again later"
+
+        results = []
+        for _ in range(self.app.config["MAIL_MAX_ATTEMPTS"]):
+            results.append(drain_outbox(self.smtp))
+            self._make_due(item_id)
+
+        item = self._item(item_id)
+        self.assertEqual([r["retry"] for r in results], [1, 1, 0])
+        self.assertEqual(results[-1]["failed"], 1)
+        self.assertEqual((item.status, item.attempts), ("FAILED", 3))
+        self.assertEqual(drain_outbox(self.smtp), {"sent": 0, "retry": 0, "failed": 0})
+        self.assertEqual(self.sink.messages, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+"""
+Număr fix de query-uri pe rutele publice (app/querycount.py:ROUTE_BUDGETS):
+un N+1 nou pică testul, nu doar scripts/check_query_budgets.py rulat de mână.
+
+    python -m unittest discover tests
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+_tmp = tempfile.mkdtemp(prefix="test-query-budgets-")
+# Config se citește o dată per proces (primul modul de test importat): SQLite, fără replică;
+# fiecare clasă își dă propriul fișier DB la create_app()
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(_tmp, "test.db")
+os.environ.pop("DATABASE_REPLICA_URL", None)
+
+from app import create_app  # noqa: E402
+from app.cache import nav_cache  # noqa: E402
+from app.config import Config  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models import Category, City, Listing  # noqa: E402
+from app.page_cache import page_cache  # noqa: E402
+from app.querycount import ROUTE_BUDGETS, QueryBudgetExceeded, assert_route_budget  # noqa: E402
+from app.search import get_backend, reset_backend_cache  # noqa: E402
+
+
+class RouteBudgetTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with mock.patch.multiple(Config, SQLALCHEMY_DATABASE_URI="sqlite:///" + os.path.join(_tmp, "test.db"),
+                                 SQLALCHEMY_BINDS={}):
+            cls.app = create_app()
+        cls.app.config.update(TESTING=True)
+        with cls.app.app_context():
+            db.create_all()
+            categories = [Category(name="Dentiști", slug="dentisti"), Category(name="Avocați", slug="avocati")]
+            cities = [
+                City(name="Berlin", slug="berlin", lat=52.52, lng=13.405),
+                City(name="München", slug="munchen", lat=48.1351, lng=11.582),
+            ]
+            db.session.add_all(categories + cities)
+            db.session.flush()
+            # destule carduri pe fiecare pagină ca un query per card să depășească bugetul
+            for i in range(40):
+                db.session.add(Listing(
+                    name=f"Firma {i}", slug=f"firma-{i}", category_id=categories[i % 2].id,
+                    city_id=cities[(i // 2) % 2].id, description="Servicii în limba română",
+                    featured=i % 5 == 0, verified=i % 3 == 0, languages="ro,de", phone=f"+49 170 {i:07d}",
+                ))
+            db.session.commit()
+
+    @classmethod
+    def tearDownClass(cls):
+        with cls.app.app_context():
+            db.drop_all()
+            db.engine.dispose()
+        shutil.rmtree(_tmp, ignore_errors=True)
+
+    def setUp(self):
+        # ca scripts/check_query_budgets.py: cache-urile per proces calde, paginile randate din nou
+        page_cache.clear()
+        reset_backend_cache()
+        with self.app.app_context():
+            nav_cache.invalidate()
+            nav_cache.get()
+            get_backend()
+
+    def test_public_routes_within_budget(self):
+        params = {"category": "dentisti", "city": "berlin", "listing": "firma-0", "listing_name": "Firma"}
+        client = self.app.test_client()
+        for pattern, budget in ROUTE_BUDGETS.items():
+            url = pattern.format(**params)
+            with self.subTest(url=url):
+                response = assert_route_budget(self.app, client, url, budget)
+                self.assertEqual(response.status_code, 200)
+
+    def test_over_budget_fails(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            assert_route_budget(self.app, self.app.test_client(), "/listing/firma-0", 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
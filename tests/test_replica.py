@@ -0,0 +1,112 @@
+"""
+Citiri din replică (app/replica.py) cu două fișiere SQLite: replica e o copie
+mai veche a primary-ului (lag simulat).
+
+    python -m unittest discover tests
+"""
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+_tmp = tempfile.mkdtemp(prefix="test-replica-")
+# Config se citește o dată per proces (primul modul de test importat): SQLite, fără replică;
+# fiecare clasă își dă propriile fișiere DB (aici primary + replică) la create_app()
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(_tmp, "primary.db")
+os.environ.pop("DATABASE_REPLICA_URL", None)
+
+from sqlalchemy import event  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.cache import nav_cache  # noqa: E402
+from app.config import Config  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models import Category, City, Listing  # noqa: E402
+from app.replica import REPLICA  # noqa: E402
+
+PRIMARY_PATH = os.path.join(_tmp, "primary.db")
+REPLICA_PATH = os.path.join(_tmp, "replica.db")
+
+
+class ReplicaRoutingTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with mock.patch.multiple(Config, SQLALCHEMY_DATABASE_URI="sqlite:///" + PRIMARY_PATH,
+                                 SQLALCHEMY_BINDS={REPLICA: "sqlite:///" + REPLICA_PATH}):
+            cls.app = create_app()
+        cls.app.config.update(TESTING=True)
+        with cls.app.app_context():
+            db.create_all(bind_key=None)
+            category = Category(name="Dentiști", slug="dentisti")
+            city = City(name="Berlin", slug="berlin", lat=52.52, lng=13.405)
+            db.session.add_all([category, city])
+            db.session.flush()
+            db.session.add(Listing(name="Firma Veche", slug="firma", category_id=category.id, city_id=city.id))
+            db.session.commit()
+            cls.primary, cls.replica = db.engines[None], db.engines[REPLICA]
+        cls._sync()
+
+        # replica rămâne în urmă: scrierea ajunge doar în primary
+        with cls.app.app_context():
+            db.session.query(Listing).filter_by(slug="firma").update({"name": "Firma Nouă"})
+            db.session.commit()
+            # meniurile se încarcă mereu din primary (app/cache.py); încălzite, nu intră în numărătoare
+            nav_cache.invalidate()
+            nav_cache.get()
+
+        cls.reads = {}
+        for name, engine in (("primary", cls.primary), ("replica", cls.replica)):
+            event.listen(engine, "before_cursor_execute", cls._counter(name))
+
+    @classmethod
+    def tearDownClass(cls):
+        with cls.app.app_context():
+            for engine in db.engines.values():
+                engine.dispose()
+        shutil.rmtree(_tmp, ignore_errors=True)
+
+    @classmethod
+    def _sync(cls):
+        src, dst = sqlite3.connect(PRIMARY_PATH), sqlite3.connect(REPLICA_PATH)
+        try:
+            src.backup(dst)
+        finally:
+            src.close()
+            dst.close()
+
+    @classmethod
+    def _counter(cls, name):
+        def count(*args):
+            cls.reads[name] = cls.reads.get(name, 0) + 1
+        return count
+
+    def _get(self, client, url):
+        self.reads.clear()
+        response = client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.get_data(as_text=True), dict(self.reads)
+
+    def test_anonymous_get_reads_stale_replica(self):
+        body, reads = self._get(self.app.test_client(), "/listing/firma")
+
+        self.assertIn("Firma Veche", body)
+        self.assertNotIn("primary", reads)
+        self.assertGreater(reads.get("replica", 0), 0)
+
+    def test_visitor_reads_primary_after_own_write(self):
+        client = self.app.test_client()
+        response = client.post(
+            "/recommend", data={"business_name": "Firma X", "category_name": "Dentiști", "city_name": "Berlin"},
+        )
+        self.assertEqual(response.status_code, 200)
+
+        body, reads = self._get(client, "/listing/firma")
+
+        self.assertIn("Firma Nouă", body)
+        self.assertNotIn("replica", reads)
+
+
+if __name__ == "__main__":
+    unittest.main()